@@ -0,0 +1,106 @@
+"""
+Throughput of the sync (threadpool + psycopg2) and async (AsyncSession + asyncpg) DB paths.
+
+Each mode runs in its own interpreter, because the engine flavour is chosen from settings at
+import time. Requests go through the ASGI app in-process (httpx ASGITransport), so the numbers
+compare the server-side stacks without network noise.
+
+    OPERANT_DATABASE_URL=postgresql+psycopg2://... python benchmarks/bench_async_vs_sync.py \
+        --concurrency 200 --requests 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+async def _run_child(args: argparse.Namespace) -> dict:
+    import httpx
+
+    from operant.app.main import create_app
+
+    transport = httpx.ASGITransport(app=create_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        suffix = uuid4().hex[:8]
+        email = f"bench-{suffix}@example.com"
+        await client.post("/api/v1/auth/register", json={"email": email, "password": "Secret123!"})
+        r = await client.post("/api/v1/auth/login", json={"email": email, "password": "Secret123!"})
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        r = await client.post("/api/v1/organizations", headers=headers, json={"name": "Bench", "slug": f"b-{suffix}"})
+        headers["X-Organization-Id"] = r.json()["id"]
+        r = await client.post("/api/v1/projects", headers=headers, json={"name": "Bench"})
+        project_id = r.json()["id"]
+        for i in range(args.seed_tasks):
+            await client.post("/api/v1/tasks", params={"project_id": project_id}, headers=headers, json={"title": f"T{i}"})
+
+        semaphore = asyncio.Semaphore(args.concurrency)
+        latencies: list[float] = []
+        errors = 0
+
+        async def one() -> None:
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                r = await client.get("/api/v1/tasks", params={"project_id": project_id}, headers=headers)
+                latencies.append(time.perf_counter() - started)
+                if r.status_code != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(args.requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "mode": args.mode,
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "errors": errors,
+        "rps": round(args.requests / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--seed-tasks", type=int, default=50)
+    parser.add_argument("--mode", choices=["sync", "async"], default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode is not None:
+        print(json.dumps(asyncio.run(_run_child(args))))
+        return
+
+    results = []
+    for mode in ("sync", "async"):
+        env = {**os.environ, "OPERANT_DATABASE_ASYNC": "true" if mode == "async" else "false"}
+        out = subprocess.run(
+            [sys.executable, __file__, "--mode", mode, *sys.argv[1:]],
+            env=env,
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(f"{'mode':<6} {'rps':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for r in results:
+        print(f"{r['mode']:<6} {r['rps']:>8} {r['p50_ms']:>8} {r['p99_ms']:>8} {r['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
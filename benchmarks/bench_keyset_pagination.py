@@ -0,0 +1,103 @@
+"""
+Latency of page 1 vs a deep page for LIMIT/OFFSET and keyset (cursor) pagination.
+
+Seeds one project with `--rows` tasks inside a transaction that is rolled back at the end, then
+times `TaskRepository.list_for_project` (the code behind GET /tasks) at page 1 and `--page`.
+
+    OPERANT_DATABASE_URL=postgresql+psycopg2://... python benchmarks/bench_keyset_pagination.py \
+        --rows 200000 --page 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+
+def _seed(db, rows: int):
+    from sqlalchemy import text
+
+    org_id = db.execute(
+        text(
+            """INSERT INTO organizations (id, created_at, updated_at, name, slug)
+               VALUES (gen_random_uuid(), now(), now(), 'Bench', 'bench-' || gen_random_uuid())
+               RETURNING id"""
+        )
+    ).scalar_one()
+    project_id = db.execute(
+        text(
+            """INSERT INTO projects (id, created_at, updated_at, organization_id, name)
+               VALUES (gen_random_uuid(), now(), now(), :o, 'Bench') RETURNING id"""
+        ),
+        {"o": org_id},
+    ).scalar_one()
+    db.execute(
+        text(
+            """INSERT INTO tasks (id, created_at, updated_at, project_id, title, status)
+               SELECT gen_random_uuid(), now() - g * interval '1 second', now(), :p, 'Tarefa ' || g, 'TODO'
+               FROM generate_series(1, :n) g"""
+        ),
+        {"p": project_id, "n": rows},
+    )
+    db.execute(text("ANALYZE tasks"))
+    return project_id
+
+
+def _time(fn, repeat: int) -> float:
+    fn()  # warm-up
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--page", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    if args.page * args.limit > args.rows:
+        parser.error("--page * --limit must not exceed --rows")
+
+    from operant.app.db.session import SessionLocal
+    from operant.app.repositories.task_repository import TaskRepository
+
+    db = SessionLocal()
+    try:
+        project_id = _seed(db, args.rows)
+        repo = TaskRepository(db)
+
+        def page(offset: int = 0, after=None):
+            return repo.list_for_project(
+                project_id,
+                status=None,
+                sort="created_at",
+                order="desc",
+                limit=args.limit,
+                offset=offset,
+                after=after,
+            )
+
+        deep_offset = (args.page - 1) * args.limit
+        deep_key = page(offset=deep_offset - args.limit).next_key
+
+        print(f"{args.rows} tasks, limit {args.limit}, median of {args.repeat} (ms)")
+        print(f"{'mode':<8} {'page 1':>10} {'page ' + str(args.page):>12}")
+        for mode, deep in [("offset", lambda: page(offset=deep_offset)), ("keyset", lambda: page(after=deep_key))]:
+            print(f"{mode:<8} {_time(page, args.repeat):>10.2f} {_time(deep, args.repeat):>12.2f}")
+    finally:
+        db.rollback()
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import UTC, datetime, timedelta
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+from uuid import UUID
+
+from fastapi import Request, Response, status
+
+from operant.app.core.response_cache import CachedResponse
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def resource_etag(resource_id: UUID, version: int) -> str:
+    # Strong: one version has exactly one representation, so it can be used with If-Match.
+    return f'"{resource_id.hex}.{version}"'
+
+
+def list_etag(request: Request, scope: Any, version: tuple[datetime | None, int]) -> str:
+    """
+    ETag of a list page: the (max(updated_at), count) of the filtered set, plus what picks the
+    page out of it (path, query string, `scope` such as the org). An edit moves the max, a delete
+    the count.
+    """
+    latest, count = version
+    parts = (
+        request.url.path,
+        sorted(request.query_params.multi_items()),
+        str(scope),
+        _micros(latest) if latest is not None else None,
+        count,
+    )
+    return f'W/"{hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()}"'
+
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None = None) -> bool:
+    """
+    Whether the client's copy is current. If-None-Match wins when both are sent (RFC 9110) and is
+    compared weakly; If-Modified-Since only counts for resources with a Last-Modified.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        return _opaque(etag) in {_opaque(tag) for tag in if_none_match.split(",")}
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    # HTTP dates have whole seconds.
+    return last_modified.replace(microsecond=0) <= since
+
+
+def if_match_versions(request: Request, resource_id: UUID) -> frozenset[int] | None:
+    """
+    The versions of `resource_id` an If-Match accepts: None without a condition (no header, or
+    `*` on a resource that exists), empty when no tag can match. Comparison is strong (RFC 9110),
+    so weak tags never match.
+    """
+    if_match = request.headers.get("if-match")
+    if if_match is None or if_match.strip() == "*":
+        return None
+    versions = set()
+    for tag in if_match.split(","):
+        tag = tag.strip()
+        if not (tag.startswith('"') and tag.endswith('"')):
+            continue
+        resource, _, version = tag[1:-1].partition(".")
+        if resource == resource_id.hex and version.isdigit():
+            versions.add(int(version))
+    return frozenset(versions)
+
+
+def not_modified(etag: str, last_modified: datetime | None = None) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_validators(response, etag, last_modified)
+    return response
+
+
+def rendered_response(request: Request, rendered: CachedResponse) -> Response:
+    """A pre-rendered JSON body as the response: 304 instead when the client's copy matches."""
+    if rendered.etag is not None and is_not_modified(request, rendered.etag):
+        return not_modified(rendered.etag)
+    response = Response(rendered.body, media_type="application/json")
+    if rendered.etag is not None:
+        set_validators(response, rendered.etag)
+    return response
+
+
+def set_validators(response: Response, etag: str, last_modified: datetime | None = None) -> None:
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = format_datetime(last_modified.astimezone(UTC), usegmt=True)
+
+
+def _opaque(tag: str) -> str:
+    return tag.strip().removeprefix("W/")
+
+
+def _micros(value: datetime) -> int:
+    return (value - _EPOCH) // timedelta(microseconds=1)
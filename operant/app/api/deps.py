@@ -1,44 +1,132 @@
 from __future__ import annotations
 
-from collections.abc import Generator
+from collections.abc import AsyncGenerator
 from uuid import UUID
 
-from fastapi import Depends, Header
+from anyio import CapacityLimiter, to_thread
+from fastapi import Depends, Header, Request, Response
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from operant.app.core.config import settings
 from operant.app.core.errors import ForbiddenError, UnauthorizedError
+from operant.app.core.memberships import MembershipSnapshot, membership_cache
 from operant.app.core.permissions import OrgRole, has_min_role
+from operant.app.core.principals import Principal, principal_cache
 from operant.app.core.security import InvalidTokenError, decode_access_token
-from operant.app.db.session import get_db
+from operant.app.db.replica import STICKY_COOKIE, replica_router
+from operant.app.db.session import DbSession, SessionLocal, get_async_sessionmaker, run_db
 from operant.app.repositories.membership_repository import MembershipRepository
 from operant.app.repositories.user_repository import UserRepository
+from operant.app.services.unit_of_work import UnitOfWork
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
+_READ_ONLY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
 
-def db_session() -> Generator[Session, None, None]:
-    yield from get_db()
 
+async def _close(db: DbSession) -> None:
+    if isinstance(db, AsyncSession):
+        await db.close()
+        return
+    # close() may roll back over the network, so keep it off the event loop. Like FastAPI's
+    # sync-dependency teardown it gets a private limiter: returning a connection must never
+    # queue behind requests that are themselves blocked waiting for one.
+    await to_thread.run_sync(db.close, limiter=CapacityLimiter(1))
 
-def get_current_user(
-    db: Session = Depends(db_session),
+
+async def db_session() -> AsyncGenerator[DbSession, None]:
+    if settings.database_async:
+        async with get_async_sessionmaker()() as db:
+            yield db
+        return
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        await _close(db)
+
+
+async def unit_of_work(db: DbSession = Depends(db_session)) -> UnitOfWork:
+    return UnitOfWork(db)
+
+
+def _stick_to_primary_after_commit(
+    request: Request, response: Response, db: DbSession, user_id: UUID
+) -> None:
+    # Read-your-writes: once this request commits, the user's reads skip the replica for a while,
+    # on this worker and, through the cookie, on any other.
+    if not replica_router.enabled or request.method in _READ_ONLY_METHODS:
+        return
+
+    def _mark(_session) -> None:
+        cookie = replica_router.mark_write(user_id)
+        max_age = max(1, round(settings.replica_sticky_seconds))
+        response.set_cookie(STICKY_COOKIE, cookie, max_age=max_age, httponly=True, samesite="lax")
+
+    session = db.sync_session if isinstance(db, AsyncSession) else db
+    event.listen(session, "after_commit", _mark)
+
+
+async def get_current_user(
+    request: Request,
+    response: Response,
+    db: DbSession = Depends(db_session),
     creds: HTTPAuthorizationCredentials | None = Depends(bearer_scheme),
-):
+) -> Principal:
     if creds is None or not creds.credentials:
         raise UnauthorizedError("Não autenticado")
+    token = creds.credentials
+    principal = principal_cache.get(token)
+    if principal is not None:
+        _stick_to_primary_after_commit(request, response, db, principal.id)
+        return principal
+
     try:
-        user_id, _jti = decode_access_token(creds.credentials)
+        user_id, jti, expires_at = decode_access_token(token)
     except InvalidTokenError as e:
         raise UnauthorizedError(str(e)) from e
 
-    user = UserRepository(db).get_by_id(user_id)
+    user = await run_db(db, lambda s: UserRepository(s).get_by_id(user_id))
+    if user is None or not user.is_active:
+        raise UnauthorizedError("Usuário inválido ou inativo")
+    principal = Principal(id=user.id, is_active=user.is_active, token_id=jti, expires_at=expires_at)
+    principal_cache.put(token, principal)
+    _stick_to_primary_after_commit(request, response, db, principal.id)
+    return principal
+
+
+async def read_db_session(
+    request: Request,
+    db: DbSession = Depends(db_session),
+    principal: Principal = Depends(get_current_user),
+) -> AsyncGenerator[DbSession, None]:
+    """Session for read-only handlers: the replica when it is safe to use, the primary otherwise."""
+    sticky_cookie = request.cookies.get(STICKY_COOKIE)
+    if not replica_router.enabled or replica_router.is_sticky(principal.id, sticky_cookie):
+        replica_router.record_route(replica=False, sticky=replica_router.enabled)
+        yield db
+        return
+    replica = replica_router.open_session()
+    try:
+        usable = await replica_router.is_usable(replica)
+        replica_router.record_route(replica=usable)
+        yield replica if usable else db
+    finally:
+        await _close(replica)
+
+
+async def get_current_user_record(
+    db: DbSession = Depends(db_session), principal: Principal = Depends(get_current_user)
+):
+    user = await run_db(db, lambda s: UserRepository(s).get_by_id(principal.id))
     if user is None or not user.is_active:
         raise UnauthorizedError("Usuário inválido ou inativo")
     return user
 
 
-def get_org_id(x_organization_id: str | None = Header(default=None, alias="X-Organization-Id")) -> UUID:
+async def get_org_id(x_organization_id: str | None = Header(default=None, alias="X-Organization-Id")) -> UUID:
     if not x_organization_id:
         raise ForbiddenError("Cabeçalho X-Organization-Id é obrigatório para este endpoint")
     try:
@@ -47,24 +135,29 @@ def get_org_id(x_organization_id: str | None = Header(default=None, alias="X-Org
         raise ForbiddenError("X-Organization-Id inválido") from e
 
 
-def get_current_membership(
+async def get_current_membership(
     org_id: UUID = Depends(get_org_id),
-    db: Session = Depends(db_session),
-    user=Depends(get_current_user),
-):
-    membership = MembershipRepository(db).get_by_user_org(user.id, org_id)
+    db: DbSession = Depends(db_session),
+    user: Principal = Depends(get_current_user),
+) -> MembershipSnapshot:
+    key = (user.id, org_id)
+    snapshot = membership_cache.get(key)
+    if snapshot is not None:
+        return snapshot
+
+    membership = await run_db(db, lambda s: MembershipRepository(s).get_by_user_org(user.id, org_id))
     if membership is None:
         raise ForbiddenError("Sem acesso à organização")
-    return membership
+    snapshot = MembershipSnapshot(user_id=user.id, organization_id=org_id, role=membership.role)
+    membership_cache.set(key, snapshot)
+    return snapshot
 
 
 def require_min_org_role(min_role: OrgRole):
-    def _dep(membership=Depends(get_current_membership)):
+    async def _dep(membership: MembershipSnapshot = Depends(get_current_membership)) -> MembershipSnapshot:
         actual = OrgRole(membership.role)
         if not has_min_role(actual, min_role):
             raise ForbiddenError("Permissão insuficiente")
         return membership
 
     return _dep
-
-
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import zlib
+from collections.abc import AsyncIterator, Iterator, Sequence
+from datetime import datetime
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from operant.app.core.config import settings
+from operant.app.db.session import DbSession
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+def _plain(value: Any) -> Any:
+    if value is None or isinstance(value, str | int | float | bool):
+        return value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class _Encoder:
+    """Turns batches of row tuples into NDJSON/CSV bytes, optionally through one gzip stream."""
+
+    def __init__(self, columns: Sequence[str], fmt: str, *, gzip: bool):
+        self.columns = columns
+        self.fmt = fmt
+        self._compressor = zlib.compressobj(wbits=31) if gzip else None  # wbits=31: gzip container
+        self._pending = self._csv([columns]) if fmt == "csv" else b""
+
+    def _csv(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows([[_plain(value) for value in row] for row in rows])
+        return buffer.getvalue().encode("utf-8")
+
+    def _out(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) if self._compressor else data
+
+    def rows(self, rows: Sequence[Sequence[Any]]) -> bytes:
+        if self.fmt == "csv":
+            data = self._csv(rows)
+        else:
+            data = "".join(
+                json.dumps(dict(zip(self.columns, map(_plain, row), strict=True)), ensure_ascii=False) + "\n"
+                for row in rows
+            ).encode("utf-8")
+        data, self._pending = self._pending + data, b""
+        return self._out(data)
+
+    def finish(self) -> bytes:
+        data = self._out(self._pending)
+        return data + self._compressor.flush() if self._compressor else data
+
+
+def _sync_body(db: Session, stmt: Select[Any], encoder: _Encoder) -> Iterator[bytes]:
+    # stream_results: a server-side (named) cursor, read `yield_per` rows at a time.
+    options = {"stream_results": True, "yield_per": settings.export_chunk_rows}
+    for rows in db.execute(stmt, execution_options=options).partitions():
+        yield encoder.rows(rows)
+    yield encoder.finish()
+
+
+async def _async_body(db: AsyncSession, stmt: Select[Any], encoder: _Encoder) -> AsyncIterator[bytes]:
+    result = await db.stream(stmt, execution_options={"yield_per": settings.export_chunk_rows})
+    async for rows in result.partitions():
+        yield encoder.rows(rows)
+    yield encoder.finish()
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """True when `gzip` is listed with a non-zero q (`gzip;q=0` means "never gzip")."""
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        if coding.strip().lower() != "gzip":
+            continue
+        name, _, q = params.partition("=")
+        if name.strip().lower() != "q":
+            return True
+        try:
+            return float(q) > 0
+        except ValueError:
+            return False
+    return False
+
+
+def export_response(
+    request: Request, db: DbSession, stmt: Select[Any], *, fmt: str, filename: str
+) -> StreamingResponse:
+    """
+    Stream `stmt`'s rows as NDJSON or CSV, `export_chunk_rows` at a time, from a server-side cursor.
+
+    Rows stay plain tuples (no ORM objects) and each chunk is encoded and sent before the next one
+    is fetched, so memory is flat whatever the row count. Gzipped when the client accepts it.
+    """
+    gzip = _accepts_gzip(request.headers.get("accept-encoding", ""))
+    encoder = _Encoder([column.name for column in stmt.selected_columns], fmt, gzip=gzip)
+    if isinstance(db, AsyncSession):
+        body: Any = _async_body(db, stmt, encoder)
+    else:
+        # A sync generator: Starlette iterates it in the threadpool, off the event loop.
+        body = _sync_body(db, stmt, encoder)
+    headers = {"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(body, media_type=MEDIA_TYPES[fmt], headers=headers)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from operant.app.core.config import settings
+from operant.app.db.instrumentation import QueryStats, track_queries
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """
+    Counts the SQL statements and DB time of each request.
+
+    Adds `Server-Timing: db;dur=…` and `X-DB-Query-Count` to the response, and logs requests
+    above the configured query/time budget or repeating one statement often enough to look
+    like an N+1.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+
+            async def send_with_stats(message: Message) -> None:
+                if message["type"] == "http.response.start" and settings.query_stats_headers:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", stats.server_timing())
+                    headers["X-DB-Query-Count"] = str(stats.count)
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_stats)
+            finally:
+                _report(scope, stats)
+
+
+def _report(scope: Scope, stats: QueryStats) -> None:
+    route = f"{scope['method']} {scope['path']}"
+    if stats.count > settings.slow_request_query_count or stats.total_ms > settings.slow_request_db_ms:
+        logger.warning("%s: %d queries em %.1fms", route, stats.count, stats.total_ms)
+    for statement, times in stats.repeated(settings.n_plus_one_threshold):
+        logger.warning("%s: possível N+1, %dx %s", route, times, " ".join(statement.split())[:200])
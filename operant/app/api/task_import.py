@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import json
+from collections.abc import AsyncIterator
+from typing import Any
+
+from pydantic import ValidationError
+
+from operant.app.core.errors import BadRequestError
+from operant.app.schemas.tasks import TaskCreate
+
+# A parsed record (line number of its first line, fields) or that line's error message.
+Record = tuple[int, dict[str, Any] | str]
+
+
+def validation_message(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in error.errors())
+
+
+async def _lines(body: AsyncIterator[bytes]) -> AsyncIterator[tuple[int, str]]:
+    # Decoded as it arrives; a multi-byte character split across two chunks is carried over.
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    number = 0
+    try:
+        async for chunk in body:
+            *complete, buffer = (buffer + decoder.decode(chunk)).split("\n")
+            for line in complete:
+                number += 1
+                yield number, line
+        buffer += decoder.decode(b"", final=True)
+    except UnicodeDecodeError as e:
+        raise BadRequestError(f"Linha {number + 1}: o corpo não é UTF-8 válido") from e
+    if buffer:
+        yield number + 1, buffer
+
+
+async def _ndjson_records(lines: AsyncIterator[tuple[int, str]]) -> AsyncIterator[Record]:
+    async for number, line in lines:
+        if not line.strip():
+            continue
+        try:
+            value = json.loads(line)
+        except ValueError:
+            yield number, "JSON inválido"
+            continue
+        yield number, value if isinstance(value, dict) else "Cada linha deve ser um objeto JSON"
+
+
+async def _csv_records(lines: AsyncIterator[tuple[int, str]]) -> AsyncIterator[Record]:
+    # A header row first; empty fields count as absent. A quoted field may span lines: physical
+    # lines are joined until the quotes balance, then parsed as one record.
+    header: list[str] | None = None
+    pending: list[str] = []
+    start = 0
+    async for number, line in lines:
+        if not pending:
+            start = number
+        pending.append(line)
+        text = "\n".join(pending)
+        if text.count('"') % 2:
+            continue
+        pending = []
+        text = text.removesuffix("\r")
+        if not text.strip():
+            continue
+        try:
+            values = next(csv.reader([text]))
+        except csv.Error as e:
+            yield start, f"CSV inválido: {e}"
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            header[0] = header[0].removeprefix("\ufeff")  # BOM written by spreadsheet exports
+            if "title" not in header:
+                raise BadRequestError("O cabeçalho CSV tem de incluir a coluna title")
+            continue
+        if len(values) != len(header):
+            yield start, f"Esperadas {len(header)} colunas, obtidas {len(values)}"
+            continue
+        fields = zip(header, values, strict=True)
+        yield start, {name: value for name, value in fields if value != ""}
+    if pending:
+        yield start, "Aspas por fechar"
+
+
+async def task_import_rows(body: AsyncIterator[bytes], fmt: str) -> AsyncIterator[Record]:
+    """Records of an NDJSON or CSV body, each validated against TaskCreate as it is read."""
+    records = _csv_records(_lines(body)) if fmt == "csv" else _ndjson_records(_lines(body))
+    async for number, raw in records:
+        if isinstance(raw, str):
+            yield number, raw
+            continue
+        try:
+            yield number, TaskCreate.model_validate(raw).model_dump()
+        except ValidationError as e:
+            yield number, validation_message(e)
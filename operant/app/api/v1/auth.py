@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
 
-from operant.app.api.deps import db_session
+from operant.app.api.deps import db_session, unit_of_work
+from operant.app.db.session import DbSession
 from operant.app.schemas.auth import (
     LoginRequest,
     LogoutRequest,
@@ -12,32 +12,31 @@ from operant.app.schemas.auth import (
     TokenResponse,
 )
 from operant.app.schemas.users import UserOut
-from operant.app.services.auth_service import AuthService
+from operant.app.services.auth_service import login_async, register_async
+from operant.app.services.unit_of_work import UnitOfWork
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/register", response_model=UserOut, status_code=status.HTTP_201_CREATED)
-def register(payload: RegisterRequest, db: Session = Depends(db_session)):
-    user = AuthService(db).register(email=str(payload.email), password=payload.password, full_name=payload.full_name)
+async def register(payload: RegisterRequest, db: DbSession = Depends(db_session)):
+    user = await register_async(db, email=str(payload.email), password=payload.password, full_name=payload.full_name)
     return user
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(payload: LoginRequest, db: Session = Depends(db_session)):
-    pair = AuthService(db).login(email=str(payload.email), password=payload.password)
+async def login(payload: LoginRequest, db: DbSession = Depends(db_session)):
+    pair = await login_async(db, email=str(payload.email), password=payload.password)
     return TokenResponse(access_token=pair.access_token, refresh_token=pair.refresh_token)
 
 
 @router.post("/refresh", response_model=TokenResponse)
-def refresh(payload: RefreshRequest, db: Session = Depends(db_session)):
-    pair = AuthService(db).refresh(refresh_token=payload.refresh_token)
+async def refresh(payload: RefreshRequest, uow: UnitOfWork = Depends(unit_of_work)):
+    pair = await uow.run(lambda u: u.auth.refresh(refresh_token=payload.refresh_token))
     return TokenResponse(access_token=pair.access_token, refresh_token=pair.refresh_token)
 
 
 @router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
-def logout(payload: LogoutRequest, db: Session = Depends(db_session)):
-    AuthService(db).logout(refresh_token=payload.refresh_token)
+async def logout(payload: LogoutRequest, uow: UnitOfWork = Depends(unit_of_work)):
+    await uow.run(lambda u: u.auth.logout(refresh_token=payload.refresh_token))
     return None
-
-
@@ -2,16 +2,29 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Request, status
 
+from operant.app.api.conditional import rendered_response
 from operant.app.api.deps import (
     db_session,
     get_current_user,
     get_org_id,
+    read_db_session,
     require_min_org_role,
+    unit_of_work,
 )
+from operant.app.api.v1.purges import DELETION_RESPONSES, deletion_response
+from operant.app.core.cursors import decode_cursor
 from operant.app.core.permissions import OrgRole
+from operant.app.core.response_cache import (
+    CachedResponse,
+    get_or_render,
+    members_tag,
+    org_tag,
+    user_tag,
+)
+from operant.app.db.session import DbSession, run_db
+from operant.app.repositories.pagination import TotalMode
 from operant.app.schemas.common import Page
 from operant.app.schemas.organizations import (
     AddMemberRequest,
@@ -21,79 +34,163 @@ from operant.app.schemas.organizations import (
     OrganizationOut,
     SubscriptionOut,
 )
+from operant.app.schemas.tasks import OrgTaskSummaryOut
 from operant.app.services.organization_service import OrganizationService
+from operant.app.services.task_service import TaskService
+from operant.app.services.unit_of_work import UnitOfWork
 
 router = APIRouter(prefix="/organizations", tags=["organizations"])
 
 
 @router.post("", response_model=OrganizationOut, status_code=status.HTTP_201_CREATED)
-def create_org(payload: OrganizationCreate, db: Session = Depends(db_session), user=Depends(get_current_user)):
-    org = OrganizationService(db).create_org(
-        creator_user_id=user.id,
-        name=payload.name,
-        slug=payload.slug,
+async def create_org(
+    payload: OrganizationCreate, uow: UnitOfWork = Depends(unit_of_work), user=Depends(get_current_user)
+):
+    org = await uow.run(
+        lambda u: u.organizations.create_org(
+            creator_user_id=user.id,
+            name=payload.name,
+            slug=payload.slug,
+        )
     )
     return org
 
 
 @router.get("", response_model=Page[OrganizationOut])
-def list_orgs(
-    db: Session = Depends(db_session),
+async def list_orgs(
+    request: Request,
+    db: DbSession = Depends(read_db_session),
     user=Depends(get_current_user),
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None, description="next_cursor de uma página anterior (ignora offset)"),
+    include_total: TotalMode = Query(default=TotalMode.EXACT),
 ):
-    items, total = OrganizationService(db).list_orgs_for_user(user_id=user.id, limit=limit, offset=offset)
-    return Page(items=items, total=total, limit=limit, offset=offset)
+    after = decode_cursor(cursor, sort="created_at", order="desc")
+    offset = 0 if after else offset
+
+    async def _render() -> CachedResponse:
+        result = await run_db(
+            db,
+            lambda s: OrganizationService(s).list_orgs_for_user(
+                user_id=user.id,
+                limit=limit,
+                offset=offset,
+                after=after,
+                include_total=include_total,
+            ),
+        )
+        page = Page[OrganizationOut].from_result(
+            result, limit=limit, offset=offset, sort="created_at", order="desc"
+        )
+        return CachedResponse(page.model_dump_json().encode())
+
+    rendered = await get_or_render(
+        "orgs",
+        (user.id,),
+        tags=(user_tag(user.id),),
+        render=_render,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        include_total=include_total,
+    )
+    return rendered_response(request, rendered)
 
 
 @router.get("/current", response_model=OrganizationOut)
-def get_current_org(
+async def get_current_org(
     org_id: UUID = Depends(get_org_id),
-    db: Session = Depends(db_session),
+    db: DbSession = Depends(db_session),
     _user=Depends(get_current_user),
 ):
-    org = OrganizationService(db).get_org(org_id=org_id)
+    org = await run_db(db, lambda s: OrganizationService(s).get_org(org_id=org_id))
     return org
 
 
+@router.get("/current/summary", response_model=OrgTaskSummaryOut)
+async def get_current_org_summary(
+    org_id: UUID = Depends(get_org_id),
+    db: DbSession = Depends(read_db_session),
+    _membership=Depends(require_min_org_role(OrgRole.MEMBER)),
+):
+    return await run_db(db, lambda s: TaskService(s).org_summary(organization_id=org_id))
+
+
 @router.get("/members", response_model=Page[MemberOut])
-def list_members(
+async def list_members(
+    request: Request,
     org_id: UUID = Depends(get_org_id),
-    db: Session = Depends(db_session),
-    _membership=Depends(require_min_org_role(OrgRole.ADMIN)),
+    db: DbSession = Depends(read_db_session),
+    membership=Depends(require_min_org_role(OrgRole.ADMIN)),
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None, description="next_cursor de uma página anterior (ignora offset)"),
+    include_total: TotalMode = Query(default=TotalMode.EXACT),
 ):
-    items, total = OrganizationService(db).list_members(
-        organization_id=org_id,
+    after = decode_cursor(cursor, sort="created_at", order="desc")
+    offset = 0 if after else offset
+
+    async def _render() -> CachedResponse:
+        result = await run_db(
+            db,
+            lambda s: OrganizationService(s).list_members(
+                organization_id=org_id,
+                limit=limit,
+                offset=offset,
+                after=after,
+                include_total=include_total,
+            ),
+        )
+        page = Page[MemberOut].from_result(
+            result, limit=limit, offset=offset, sort="created_at", order="desc"
+        )
+        return CachedResponse(page.model_dump_json().encode())
+
+    rendered = await get_or_render(
+        "members",
+        (org_id, membership.role),
+        tags=(members_tag(org_id), org_tag(org_id)),
+        render=_render,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        include_total=include_total,
     )
-    return Page(items=items, total=total, limit=limit, offset=offset)
+    return rendered_response(request, rendered)
 
 
 @router.post("/members", response_model=MemberOut, status_code=status.HTTP_201_CREATED)
-def add_member(
+async def add_member(
     payload: AddMemberRequest,
     org_id: UUID = Depends(get_org_id),
-    db: Session = Depends(db_session),
+    uow: UnitOfWork = Depends(unit_of_work),
     _membership=Depends(require_min_org_role(OrgRole.ADMIN)),
 ):
-    membership = OrganizationService(db).add_member(
-        organization_id=org_id, email=payload.email, role=payload.role
+    membership = await uow.run(
+        lambda u: u.organizations.add_member(organization_id=org_id, email=payload.email, role=payload.role)
     )
     return membership
 
 
 @router.patch("/subscription", response_model=SubscriptionOut)
-def change_plan(
+async def change_plan(
     payload: ChangePlanRequest,
     org_id: UUID = Depends(get_org_id),
-    db: Session = Depends(db_session),
+    uow: UnitOfWork = Depends(unit_of_work),
     _membership=Depends(require_min_org_role(OrgRole.OWNER)),
 ):
-    sub = OrganizationService(db).change_plan(organization_id=org_id, plan=payload.plan)
+    sub = await uow.run(lambda u: u.organizations.change_plan(organization_id=org_id, plan=payload.plan))
     return SubscriptionOut(organization_id=sub.organization_id, plan=sub.plan)
 
 
+@router.delete("/current", status_code=status.HTTP_204_NO_CONTENT, responses=DELETION_RESPONSES)
+async def offboard_org(
+    org_id: UUID = Depends(get_org_id),
+    uow: UnitOfWork = Depends(unit_of_work),
+    membership=Depends(require_min_org_role(OrgRole.OWNER)),
+):
+    def _offboard(u: UnitOfWork):
+        return u.organizations.offboard_org(organization_id=org_id, requested_by=membership.user_id)
+
+    return deletion_response(await uow.run(_offboard))
@@ -1,83 +1,277 @@
 from __future__ import annotations
 
+import time
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from operant.app.api.deps import db_session, get_org_id, require_min_org_role
+from operant.app.api.conditional import (
+    if_match_versions,
+    is_conditional,
+    is_not_modified,
+    list_etag,
+    not_modified,
+    rendered_response,
+    resource_etag,
+    set_validators,
+)
+from operant.app.api.deps import get_org_id, read_db_session, require_min_org_role, unit_of_work
+from operant.app.api.export import export_response
+from operant.app.api.task_import import task_import_rows
+from operant.app.api.v1.purges import DELETION_RESPONSES, deletion_response
+from operant.app.core.cursors import decode_cursor
 from operant.app.core.permissions import OrgRole
+from operant.app.core.response_cache import (
+    CachedResponse,
+    get_or_render,
+    get_response_cache,
+    org_tag,
+    projects_tag,
+)
+from operant.app.db.session import DbSession, iterate_blocking, run_db
+from operant.app.repositories.pagination import TotalMode
+from operant.app.repositories.project_repository import ProjectRepository
+from operant.app.repositories.task_repository import TaskRepository
 from operant.app.schemas.common import Page
 from operant.app.schemas.projects import ProjectCreate, ProjectOut, ProjectUpdate
+from operant.app.schemas.tasks import TaskImportErrorOut, TaskImportOut, TaskSummaryOut
 from operant.app.services.project_service import ProjectService
+from operant.app.services.task_service import TaskService
+from operant.app.services.unit_of_work import UnitOfWork
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 
 @router.get("", response_model=Page[ProjectOut])
-def list_projects(
+async def list_projects(
+    request: Request,
     org_id: UUID = Depends(get_org_id),
-    db: Session = Depends(db_session),
-    _membership=Depends(require_min_org_role(OrgRole.MEMBER)),
+    db: DbSession = Depends(read_db_session),
+    membership=Depends(require_min_org_role(OrgRole.MEMBER)),
     q: str | None = Query(default=None),
     sort: str = Query(default="created_at", pattern=r"^(created_at|name)$"),
     order: str = Query(default="desc", pattern=r"^(asc|desc)$"),
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None, description="next_cursor de uma página anterior (ignora offset)"),
+    include_total: TotalMode = Query(default=TotalMode.EXACT),
 ):
-    items, total = ProjectService(db).list_projects(
-        organization_id=org_id, q=q, sort=sort, order=order, limit=limit, offset=offset
+    after = decode_cursor(cursor, sort=sort, order=order)
+    offset = 0 if after else offset
+
+    if get_response_cache() is None and is_conditional(request):
+        # max(updated_at) + count(*) of the filtered set: no rows fetched, no models built.
+        version = await run_db(
+            db, lambda s: ProjectService(s).list_version(organization_id=org_id, q=q)
+        )
+        etag = list_etag(request, org_id, version)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+
+    def _list(s: Session):
+        service = ProjectService(s)
+        result = service.list_projects(
+            organization_id=org_id,
+            q=q,
+            sort=sort,
+            order=order,
+            limit=limit,
+            offset=offset,
+            after=after,
+            include_total=include_total,
+        )
+        # Offset pages with exact totals get the version from the page query's window functions.
+        return result, result.version or service.list_version(organization_id=org_id, q=q)
+
+    async def _render() -> CachedResponse:
+        result, version = await run_db(db, _list)
+        page = Page[ProjectOut].from_result(
+            result, limit=limit, offset=offset, sort=sort, order=order
+        )
+        return CachedResponse(page.model_dump_json().encode(), list_etag(request, org_id, version))
+
+    rendered = await get_or_render(
+        "projects",
+        (org_id, membership.role),
+        tags=(projects_tag(org_id), org_tag(org_id)),
+        render=_render,
+        q=q,
+        sort=sort,
+        order=order,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
+        include_total=include_total,
     )
-    return Page(items=items, total=total, limit=limit, offset=offset)
+    return rendered_response(request, rendered)
+
+
+@router.get(":export", response_class=StreamingResponse)
+async def export_projects(
+    request: Request,
+    org_id: UUID = Depends(get_org_id),
+    db: DbSession = Depends(read_db_session),
+    _membership=Depends(require_min_org_role(OrgRole.MEMBER)),
+    fmt: str = Query(default="ndjson", alias="format", pattern=r"^(ndjson|csv)$"),
+):
+    stmt = await run_db(db, lambda s: ProjectRepository(s).export_query(org_id))
+    return export_response(request, db, stmt, fmt=fmt, filename=f"projects-{org_id}")
 
 
 @router.post("", response_model=ProjectOut, status_code=status.HTTP_201_CREATED)
-def create_project(
+async def create_project(
     payload: ProjectCreate,
+    response: Response,
     org_id: UUID = Depends(get_org_id),
-    db: Session = Depends(db_session),
+    uow: UnitOfWork = Depends(unit_of_work),
     _membership=Depends(require_min_org_role(OrgRole.ADMIN)),
 ):
-    project = ProjectService(db).create_project(
-        organization_id=org_id, name=payload.name, description=payload.description
+    project = await uow.run(
+        lambda u: u.projects.create_project(
+            organization_id=org_id, name=payload.name, description=payload.description
+        )
     )
+    set_validators(response, resource_etag(project.id, project.version), project.updated_at)
     return project
 
 
 @router.get("/{project_id}", response_model=ProjectOut)
-def get_project(
+async def get_project(
+    project_id: UUID,
+    request: Request,
+    response: Response,
+    org_id: UUID = Depends(get_org_id),
+    db: DbSession = Depends(read_db_session),
+    _membership=Depends(require_min_org_role(OrgRole.MEMBER)),
+):
+    def _get(s: Session):
+        service = ProjectService(s)
+        if is_conditional(request):
+            # A few columns instead of the row; a match answers 304 without building ProjectOut.
+            version, updated_at = service.get_project_version_for_org(
+                project_id=project_id, organization_id=org_id
+            )
+            if is_not_modified(request, resource_etag(project_id, version), updated_at):
+                return None, version, updated_at
+        project = service.get_project_for_org(project_id=project_id, organization_id=org_id)
+        return project, project.version, project.updated_at
+
+    project, version, updated_at = await run_db(db, _get)
+    etag = resource_etag(project_id, version)
+    if project is None:
+        return not_modified(etag, updated_at)
+    set_validators(response, etag, updated_at)
+    return project
+
+
+@router.get("/{project_id}/summary", response_model=TaskSummaryOut)
+async def get_project_summary(
+    project_id: UUID,
+    org_id: UUID = Depends(get_org_id),
+    db: DbSession = Depends(read_db_session),
+    _membership=Depends(require_min_org_role(OrgRole.MEMBER)),
+):
+    def _summary(s: Session):
+        ProjectService(s).get_project_for_org(project_id=project_id, organization_id=org_id)
+        return TaskService(s).project_summary(project_id=project_id)
+
+    return await run_db(db, _summary)
+
+
+@router.get("/{project_id}/tasks:export", response_class=StreamingResponse)
+async def export_project_tasks(
+    project_id: UUID,
+    request: Request,
+    org_id: UUID = Depends(get_org_id),
+    db: DbSession = Depends(read_db_session),
+    _membership=Depends(require_min_org_role(OrgRole.MEMBER)),
+    fmt: str = Query(default="ndjson", alias="format", pattern=r"^(ndjson|csv)$"),
+):
+    def _query(s: Session):
+        ProjectService(s).get_project_for_org(project_id=project_id, organization_id=org_id)
+        return TaskRepository(s).export_query(project_id)
+
+    stmt = await run_db(db, _query)
+    return export_response(request, db, stmt, fmt=fmt, filename=f"tasks-{project_id}")
+
+
+@router.post(
+    "/{project_id}/tasks:import", response_model=TaskImportOut, status_code=status.HTTP_201_CREATED
+)
+async def import_project_tasks(
     project_id: UUID,
+    request: Request,
+    response: Response,
     org_id: UUID = Depends(get_org_id),
-    db: Session = Depends(db_session),
+    uow: UnitOfWork = Depends(unit_of_work),
     _membership=Depends(require_min_org_role(OrgRole.MEMBER)),
+    fmt: str = Query(default="ndjson", alias="format", pattern=r"^(ndjson|csv)$"),
 ):
-    return ProjectService(db).get_project_for_org(project_id=project_id, organization_id=org_id)
+    started = time.perf_counter()
+    rows = task_import_rows(request.stream(), fmt)
+
+    def _import(u: UnitOfWork):
+        # The project is checked before the first byte of the body is read.
+        u.projects.get_project_for_org(project_id=project_id, organization_id=org_id)
+        return u.tasks.import_tasks(
+            project_id=project_id, organization_id=org_id, rows=iterate_blocking(uow.db, rows)
+        )
+
+    result = await uow.run(_import)
+    elapsed = time.perf_counter() - started
+    if result.failed:
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    return TaskImportOut(
+        imported=result.imported,
+        failed=result.failed,
+        errors=[TaskImportErrorOut(line=line, error=error) for line, error in result.errors],
+        errors_truncated=result.failed > len(result.errors),
+        limit_reached=result.limit_reached,
+        elapsed_seconds=round(elapsed, 3),
+        rows_per_second=round(result.imported / elapsed, 1) if elapsed > 0 else 0.0,
+    )
 
 
 @router.patch("/{project_id}", response_model=ProjectOut)
-def update_project(
+async def update_project(
     project_id: UUID,
     payload: ProjectUpdate,
+    request: Request,
+    response: Response,
     org_id: UUID = Depends(get_org_id),
-    db: Session = Depends(db_session),
+    uow: UnitOfWork = Depends(unit_of_work),
     _membership=Depends(require_min_org_role(OrgRole.ADMIN)),
 ):
-    ProjectService(db).get_project_for_org(project_id=project_id, organization_id=org_id)
-    updated = ProjectService(db).update_project(
-        project_id=project_id, name=payload.name, description=payload.description
-    )
+    # With If-Match, the update only applies to the version the client has (else 412).
+    versions = if_match_versions(request, project_id)
+
+    def _update(u: UnitOfWork):
+        u.projects.get_project_for_org(project_id=project_id, organization_id=org_id)
+        return u.projects.update_project(
+            project_id=project_id,
+            name=payload.name,
+            description=payload.description,
+            versions=versions,
+        )
+
+    updated = await uow.run(_update)
+    set_validators(response, resource_etag(updated.id, updated.version), updated.updated_at)
     return updated
 
 
-@router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_project(
+@router.delete(
+    "/{project_id}", status_code=status.HTTP_204_NO_CONTENT, responses=DELETION_RESPONSES
+)
+async def delete_project(
     project_id: UUID,
     org_id: UUID = Depends(get_org_id),
-    db: Session = Depends(db_session),
-    _membership=Depends(require_min_org_role(OrgRole.ADMIN)),
+    uow: UnitOfWork = Depends(unit_of_work),
+    membership=Depends(require_min_org_role(OrgRole.ADMIN)),
 ):
-    ProjectService(db).get_project_for_org(project_id=project_id, organization_id=org_id)
-    ProjectService(db).delete_project(project_id=project_id)
-    return None
-
+    def _delete(u: UnitOfWork):
+        u.projects.get_project_for_org(project_id=project_id, organization_id=org_id)
+        return u.projects.delete_project(project_id=project_id, requested_by=membership.user_id)
 
+    return deletion_response(await uow.run(_delete))
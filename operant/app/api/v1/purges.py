@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Response, status
+from fastapi.responses import JSONResponse
+
+from operant.app.api.deps import db_session, get_current_user
+from operant.app.db.session import DbSession, run_db
+from operant.app.models.purge_job import PurgeJob
+from operant.app.schemas.purges import PurgeJobOut
+from operant.app.services.purge_service import PurgeService
+
+router = APIRouter(prefix="/purges", tags=["purges"])
+
+# For the DELETE routes that may hand their work to a purge job.
+DELETION_RESPONSES: dict[int | str, dict] = {
+    status.HTTP_202_ACCEPTED: {"model": PurgeJobOut, "description": "Remoção em curso (Location)"},
+}
+
+
+def deletion_response(job: PurgeJob | None) -> Response:
+    """204 when the delete is done; 202 pointing at the purge job when it was queued."""
+    if job is None:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=PurgeJobOut.model_validate(job).model_dump(mode="json"),
+        headers={"Location": f"/api/v1/purges/{job.id}"},
+    )
+
+
+@router.get("/{job_id}", response_model=PurgeJobOut)
+async def get_purge(
+    job_id: UUID,
+    db: DbSession = Depends(db_session),
+    user=Depends(get_current_user),
+):
+    return await run_db(db, lambda s: PurgeService(s).get_job(job_id=job_id, user_id=user.id))
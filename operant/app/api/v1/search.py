@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+
+from operant.app.api.deps import get_org_id, read_db_session, require_min_org_role
+from operant.app.core.cursors import decode_cursor
+from operant.app.core.permissions import OrgRole
+from operant.app.db.search import prefix_query
+from operant.app.db.session import DbSession, run_db
+from operant.app.schemas.common import Page
+from operant.app.schemas.search import SearchHitOut
+from operant.app.services.search_service import SearchService
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("", response_model=Page[SearchHitOut])
+async def search(
+    q: str = Query(min_length=1, max_length=200),
+    org_id: UUID = Depends(get_org_id),
+    db: DbSession = Depends(read_db_session),
+    _membership=Depends(require_min_org_role(OrgRole.MEMBER)),
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = Query(default=None, description="next_cursor de uma página anterior"),
+):
+    # Ranks only compare within one query, so the cursor is bound to it.
+    sort = f"rank:{prefix_query(q)}"
+    after = decode_cursor(cursor, sort=sort, order="desc")
+    result = await run_db(
+        db, lambda s: SearchService(s).search(organization_id=org_id, q=q, limit=limit, after=after)
+    )
+    return Page.from_result(result, limit=limit, offset=0, sort=sort, order="desc")
@@ -2,15 +2,47 @@ from __future__ import annotations
 
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
-from operant.app.api.deps import db_session, get_org_id, require_min_org_role
+from operant.app.api.conditional import (
+    if_match_versions,
+    is_conditional,
+    is_not_modified,
+    list_etag,
+    not_modified,
+    rendered_response,
+    resource_etag,
+    set_validators,
+)
+from operant.app.api.deps import get_org_id, read_db_session, require_min_org_role, unit_of_work
+from operant.app.api.task_import import validation_message
+from operant.app.core.cursors import decode_cursor
 from operant.app.core.permissions import OrgRole
+from operant.app.core.response_cache import (
+    CachedResponse,
+    get_or_render,
+    get_response_cache,
+    org_tag,
+    project_tag,
+)
+from operant.app.db.session import DbSession, run_db
+from operant.app.repositories.pagination import TotalMode
 from operant.app.schemas.common import Page
-from operant.app.schemas.tasks import TaskCreate, TaskOut, TaskUpdate
+from operant.app.schemas.tasks import (
+    TaskBatchCreate,
+    TaskBatchItemOut,
+    TaskBatchOut,
+    TaskBatchUpdate,
+    TaskBatchUpdateOut,
+    TaskCreate,
+    TaskOut,
+    TaskUpdate,
+)
 from operant.app.services.project_service import ProjectService
 from operant.app.services.task_service import TaskService
+from operant.app.services.unit_of_work import UnitOfWork
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
@@ -20,85 +52,231 @@ def _ensure_project_in_org(db: Session, *, project_id: UUID, org_id: UUID):
 
 
 @router.get("", response_model=Page[TaskOut])
-def list_tasks(
+async def list_tasks(
+    request: Request,
     project_id: UUID = Query(...),
     org_id: UUID = Depends(get_org_id),
-    db: Session = Depends(db_session),
-    _membership=Depends(require_min_org_role(OrgRole.MEMBER)),
+    db: DbSession = Depends(read_db_session),
+    membership=Depends(require_min_org_role(OrgRole.MEMBER)),
     status_filter: str | None = Query(default=None, alias="status", pattern=r"^(TODO|IN_PROGRESS|DONE)$"),
     sort: str = Query(default="created_at", pattern=r"^(created_at|title)$"),
     order: str = Query(default="desc", pattern=r"^(asc|desc)$"),
     limit: int = Query(default=20, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = Query(default=None, description="next_cursor de uma página anterior (ignora offset)"),
+    include_total: TotalMode = Query(default=TotalMode.EXACT),
 ):
-    _ensure_project_in_org(db, project_id=project_id, org_id=org_id)
-    items, total = TaskService(db).list_tasks(
+    after = decode_cursor(cursor, sort=sort, order=order)
+    offset = 0 if after else offset
+
+    if get_response_cache() is None and is_conditional(request):
+
+        def _version(s: Session):
+            _ensure_project_in_org(s, project_id=project_id, org_id=org_id)
+            # max(updated_at) + count(*) of the filtered set: no rows fetched, no models built.
+            return TaskService(s).list_version(project_id=project_id, status=status_filter)
+
+        etag = list_etag(request, org_id, await run_db(db, _version))
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+
+    def _list(s: Session):
+        _ensure_project_in_org(s, project_id=project_id, org_id=org_id)
+        service = TaskService(s)
+        result = service.list_tasks(
+            project_id=project_id,
+            status=status_filter,
+            sort=sort,
+            order=order,
+            limit=limit,
+            offset=offset,
+            after=after,
+            include_total=include_total,
+        )
+        # Offset pages with exact totals get the version from the page query's window functions.
+        version = result.version or service.list_version(project_id=project_id, status=status_filter)
+        return result, version
+
+    async def _render() -> CachedResponse:
+        result, version = await run_db(db, _list)
+        page = Page[TaskOut].from_result(result, limit=limit, offset=offset, sort=sort, order=order)
+        return CachedResponse(page.model_dump_json().encode(), list_etag(request, org_id, version))
+
+    # Keyed by org and role as well: a hit skips the project check that _list makes.
+    rendered = await get_or_render(
+        "tasks",
+        (org_id, membership.role),
+        tags=(project_tag(project_id), org_tag(org_id)),
+        render=_render,
         project_id=project_id,
         status=status_filter,
         sort=sort,
         order=order,
         limit=limit,
         offset=offset,
+        cursor=cursor,
+        include_total=include_total,
     )
-    return Page(items=items, total=total, limit=limit, offset=offset)
+    return rendered_response(request, rendered)
 
 
 @router.post("", response_model=TaskOut, status_code=status.HTTP_201_CREATED)
-def create_task(
+async def create_task(
     payload: TaskCreate,
+    response: Response,
     project_id: UUID = Query(...),
     org_id: UUID = Depends(get_org_id),
-    db: Session = Depends(db_session),
+    uow: UnitOfWork = Depends(unit_of_work),
     _membership=Depends(require_min_org_role(OrgRole.MEMBER)),
 ):
-    _ensure_project_in_org(db, project_id=project_id, org_id=org_id)
-    task = TaskService(db).create_task(
-        project_id=project_id,
-        title=payload.title,
-        description=payload.description,
-        status=payload.status,
-    )
+    def _create(u: UnitOfWork):
+        u.projects.get_project_for_org(project_id=project_id, organization_id=org_id)
+        return u.tasks.create_task(
+            project_id=project_id,
+            title=payload.title,
+            description=payload.description,
+            status=payload.status,
+        )
+
+    task = await uow.run(_create)
+    set_validators(response, resource_etag(task.id, task.version), task.updated_at)
     return task
 
 
+@router.post(":batch", response_model=TaskBatchOut, status_code=status.HTTP_201_CREATED)
+async def create_tasks_batch(
+    payload: TaskBatchCreate,
+    response: Response,
+    project_id: UUID = Query(...),
+    org_id: UUID = Depends(get_org_id),
+    uow: UnitOfWork = Depends(unit_of_work),
+    _membership=Depends(require_min_org_role(OrgRole.MEMBER)),
+):
+    # The project is checked first: a foreign project_id is a 403/404 whatever the items hold.
+    await run_db(uow.db, lambda s: _ensure_project_in_org(s, project_id=project_id, org_id=org_id))
+
+    results = [TaskBatchItemOut(index=i) for i in range(len(payload.items))]
+    valid: list[tuple[int, TaskCreate]] = []
+    for i, raw in enumerate(payload.items):
+        try:
+            valid.append((i, TaskCreate.model_validate(raw)))
+        except ValidationError as e:
+            results[i].error = validation_message(e)
+
+    if payload.mode == "atomic" and len(valid) < len(results):
+        response.status_code = status.HTTP_422_UNPROCESSABLE_CONTENT
+        return TaskBatchOut(created=0, failed=len(results) - len(valid), items=results)
+
+    def _create(u: UnitOfWork):
+        rows = [item.model_dump() for _, item in valid]
+        return u.tasks.create_tasks(project_id=project_id, rows=rows, partial=payload.mode == "partial")
+
+    outcomes = await uow.run(_create) if valid else []
+    for (i, _), outcome in zip(valid, outcomes, strict=True):
+        if isinstance(outcome, str):
+            results[i].error = outcome
+        elif outcome is not None:
+            results[i].task = TaskOut.model_validate(outcome)
+    created = sum(r.task is not None for r in results)
+    if payload.mode == "atomic" and created < len(results):
+        response.status_code = status.HTTP_422_UNPROCESSABLE_CONTENT
+    elif created < len(results):
+        response.status_code = status.HTTP_207_MULTI_STATUS
+    return TaskBatchOut(created=created, failed=len(results) - created, items=results)
+
+
+@router.patch(":batch", response_model=TaskBatchUpdateOut)
+async def update_tasks_batch(
+    payload: TaskBatchUpdate,
+    return_rows: bool = Query(default=False),
+    org_id: UUID = Depends(get_org_id),
+    uow: UnitOfWork = Depends(unit_of_work),
+    _membership=Depends(require_min_org_role(OrgRole.MEMBER)),
+):
+    # Tasks outside the org are simply not matched (no per-task project check).
+    selector = payload.filter
+    updated, tasks = await uow.run(
+        lambda u: u.tasks.update_tasks(
+            organization_id=org_id,
+            ids=payload.ids,
+            project_id=selector.project_id if selector else None,
+            status_filter=selector.status if selector else None,
+            changes=payload.patch.model_dump(exclude_none=True),
+            versions=payload.versions,
+            return_rows=return_rows,
+        )
+    )
+    return TaskBatchUpdateOut(updated=updated, items=tasks)
+
+
 @router.get("/{task_id}", response_model=TaskOut)
-def get_task(
+async def get_task(
     task_id: UUID,
+    request: Request,
+    response: Response,
     org_id: UUID = Depends(get_org_id),
-    db: Session = Depends(db_session),
+    db: DbSession = Depends(read_db_session),
     _membership=Depends(require_min_org_role(OrgRole.MEMBER)),
 ):
-    task = TaskService(db).get_task(task_id=task_id)
-    _ensure_project_in_org(db, project_id=task.project_id, org_id=org_id)
+    def _get(s: Session):
+        service = TaskService(s)
+        if is_conditional(request):
+            project_id, version, updated_at = service.get_task_version(task_id=task_id)
+            _ensure_project_in_org(s, project_id=project_id, org_id=org_id)
+            if is_not_modified(request, resource_etag(task_id, version), updated_at):
+                return None, version, updated_at
+        task = service.get_task(task_id=task_id)
+        _ensure_project_in_org(s, project_id=task.project_id, org_id=org_id)
+        return task, task.version, task.updated_at
+
+    task, version, updated_at = await run_db(db, _get)
+    etag = resource_etag(task_id, version)
+    if task is None:
+        return not_modified(etag, updated_at)
+    set_validators(response, etag, updated_at)
     return task
 
 
 @router.patch("/{task_id}", response_model=TaskOut)
-def update_task(
+async def update_task(
     task_id: UUID,
     payload: TaskUpdate,
+    request: Request,
+    response: Response,
     org_id: UUID = Depends(get_org_id),
-    db: Session = Depends(db_session),
+    uow: UnitOfWork = Depends(unit_of_work),
     _membership=Depends(require_min_org_role(OrgRole.MEMBER)),
 ):
-    task = TaskService(db).get_task(task_id=task_id)
-    _ensure_project_in_org(db, project_id=task.project_id, org_id=org_id)
-    updated = TaskService(db).update_task(
-        task_id=task_id, title=payload.title, description=payload.description, status=payload.status
-    )
+    # With If-Match, the update only applies to the version the client has (else 412).
+    versions = if_match_versions(request, task_id)
+
+    def _update(u: UnitOfWork):
+        task = u.tasks.get_task(task_id=task_id)
+        u.projects.get_project_for_org(project_id=task.project_id, organization_id=org_id)
+        return u.tasks.update_task(
+            task_id=task_id,
+            title=payload.title,
+            description=payload.description,
+            status=payload.status,
+            versions=versions,
+        )
+
+    updated = await uow.run(_update)
+    set_validators(response, resource_etag(updated.id, updated.version), updated.updated_at)
     return updated
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(
+async def delete_task(
     task_id: UUID,
     org_id: UUID = Depends(get_org_id),
-    db: Session = Depends(db_session),
+    uow: UnitOfWork = Depends(unit_of_work),
     _membership=Depends(require_min_org_role(OrgRole.ADMIN)),
 ):
-    task = TaskService(db).get_task(task_id=task_id)
-    _ensure_project_in_org(db, project_id=task.project_id, org_id=org_id)
-    TaskService(db).delete_task(task_id=task_id)
-    return None
-
+    def _delete(u: UnitOfWork):
+        task = u.tasks.get_task(task_id=task_id)
+        u.projects.get_project_for_org(project_id=task.project_id, organization_id=org_id)
+        u.tasks.delete_task(task_id=task_id)
 
+    await uow.run(_delete)
+    return None
@@ -1,15 +1,24 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, status
 
-from operant.app.api.deps import get_current_user
+from operant.app.api.deps import get_current_user, get_current_user_record, unit_of_work
+from operant.app.core.principals import Principal
 from operant.app.schemas.users import UserOut
+from operant.app.services.unit_of_work import UnitOfWork
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
 @router.get("/me", response_model=UserOut)
-def me(user=Depends(get_current_user)):
+async def me(user=Depends(get_current_user_record)):
     return user
 
 
+@router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
+async def deactivate_me(
+    principal: Principal = Depends(get_current_user),
+    uow: UnitOfWork = Depends(unit_of_work),
+):
+    # Desativa a conta: refresh tokens revogados; os access tokens deixam de ser aceites já.
+    await uow.run(lambda u: u.auth.deactivate_user(user_id=principal.id))
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from collections.abc import Sequence
+from uuid import UUID
+
+
+def _bootstrap(_args: argparse.Namespace) -> int:
+    from operant.app.db.bootstrap import create_schema
+    from operant.app.db.session import get_engine
+
+    create_schema(get_engine())
+    print("schema criado", flush=True)
+    return 0
+
+
+def _purge_refresh_tokens(args: argparse.Namespace) -> int:
+    from operant.app.db.session import SessionLocal
+    from operant.app.jobs.refresh_token_purge import PurgeProgress, purge_refresh_tokens
+
+    def report(progress: PurgeProgress) -> None:
+        print(
+            f"lote {progress.batches}: {progress.expired_deleted} expirados, "
+            f"{progress.revoked_deleted} revogados ({progress.elapsed_seconds:.1f}s)",
+            flush=True,
+        )
+
+    progress = purge_refresh_tokens(
+        SessionLocal,
+        batch_size=args.batch_size,
+        pause_ms=args.pause_ms,
+        revoked_retention_seconds=args.revoked_retention_hours * 3600
+        if args.revoked_retention_hours is not None
+        else None,
+        max_batches=args.max_batches,
+        on_progress=report,
+    )
+    if progress.skipped:
+        print("outra limpeza já está em curso", file=sys.stderr)
+    return 0
+
+
+def _run_purges(args: argparse.Namespace) -> int:
+    from operant.app.db.session import SessionLocal
+    from operant.app.jobs.purge import PurgeRunProgress, run_purges
+
+    def report(progress: PurgeRunProgress) -> None:
+        print(
+            f"lote {progress.batches}: {progress.tasks_deleted} tarefas removidas, "
+            f"{progress.jobs_finished} remoções concluídas ({progress.elapsed_seconds:.1f}s)",
+            flush=True,
+        )
+
+    run_purges(
+        SessionLocal,
+        batch_size=args.batch_size,
+        pause_ms=args.pause_ms,
+        max_batches=args.max_batches,
+        on_progress=report,
+    )
+    return 0
+
+
+def _repair_task_counts(args: argparse.Namespace) -> int:
+    from operant.app.db.session import SessionLocal
+    from operant.app.services.task_service import TaskService
+
+    with SessionLocal() as db:
+        written = TaskService(db).repair_counts(project_id=args.project_id)
+    print(f"{written} contadores recalculados", flush=True)
+    return 0
+
+
+def _reconcile_usage(args: argparse.Namespace) -> int:
+    from operant.app.db.session import SessionLocal
+    from operant.app.jobs.usage_reconcile import reconcile_usage
+
+    written = reconcile_usage(SessionLocal, organization_id=args.organization_id)
+    print(f"{written} contadores de uso recalculados", flush=True)
+    return 0
+
+
+def _reload_plan_limits(_args: argparse.Namespace) -> int:
+    from operant.app.core.cache import invalidation_bus
+    from operant.app.core.entitlements import CATALOG_KEY, PLAN_LIMITS_CHANNEL
+    from operant.app.db.notify import PgNotifyTransport
+    from operant.app.db.session import get_engine
+
+    # Straight to NOTIFY: this process has no caches of its own to drop.
+    PgNotifyTransport(invalidation_bus, get_engine())(PLAN_LIMITS_CHANNEL, CATALOG_KEY)
+    print("pedido de recarga enviado aos workers", flush=True)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="operant", description="Comandos de manutenção do Operant")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    bootstrap = sub.add_parser("bootstrap", help="Cria as tabelas em falta (desenvolvimento; em produção usar Alembic)")
+    bootstrap.set_defaults(handler=_bootstrap)
+
+    purge = sub.add_parser("purge-refresh-tokens", help="Remove refresh tokens expirados e revogados")
+    purge.add_argument("--batch-size", type=int, default=None)
+    purge.add_argument("--pause-ms", type=int, default=None, help="Pausa entre lotes")
+    purge.add_argument("--revoked-retention-hours", type=int, default=None)
+    purge.add_argument("--max-batches", type=int, default=None)
+    purge.set_defaults(handler=_purge_refresh_tokens)
+
+    purges = sub.add_parser("run-purges", help="Executa as remoções pendentes")
+    purges.add_argument("--batch-size", type=int, default=None)
+    purges.add_argument("--pause-ms", type=int, default=None, help="Pausa entre lotes")
+    purges.add_argument("--max-batches", type=int, default=None)
+    purges.set_defaults(handler=_run_purges)
+
+    repair = sub.add_parser("repair-task-counts", help="Recalcula os contadores de tarefas por projeto")
+    repair.add_argument("--project-id", type=UUID, default=None, help="Só este projeto (por omissão, todos)")
+    repair.set_defaults(handler=_repair_task_counts)
+
+    reconcile = sub.add_parser("reconcile-usage", help="Recalcula o uso dos limites do plano por organização")
+    reconcile.add_argument(
+        "--organization-id", type=UUID, default=None, help="Só esta organização (por omissão, todas)"
+    )
+    reconcile.set_defaults(handler=_reconcile_usage)
+
+    reload_limits = sub.add_parser(
+        "reload-plan-limits", help="Recarrega a tabela plan_limits nos workers (LISTEN/NOTIFY)"
+    )
+    reload_limits.set_defaults(handler=_reload_plan_limits)
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
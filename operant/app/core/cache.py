@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any, Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Thread-safe, in-process LRU cache with a per-entry expiry.
+
+    A `maxsize` of 0 disables the cache: lookups always miss and writes are dropped.
+    """
+
+    def __init__(self, maxsize: int, *, ttl_seconds: float | None = None):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: K, value: V, *, ttl_seconds: float | None = None) -> None:
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_seconds
+        if self.maxsize <= 0 or (ttl is not None and ttl <= 0):
+            return
+        expires_at = time.monotonic() + ttl if ttl is not None else float("inf")
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def pop(self, key: K) -> V | None:
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[1] if entry is not None else None
+
+    def discard_where(self, predicate: Callable[[K, V], bool]) -> int:
+        with self._lock:
+            doomed = [k for k, (_exp, v) in self._data.items() if predicate(k, v)]
+            for k in doomed:
+                del self._data[k]
+        return len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class InvalidationBus:
+    """
+    Fans cache invalidations out to the caches subscribed to a channel.
+
+    Delivery is in-process unless a `transport` is plugged in: publishers only ever send
+    `(channel, key)` pairs of plain strings, which the transport relays to the other workers,
+    calling `deliver` on receipt (see db/notify.py). A transport that may have missed messages
+    calls `reset`, and every cache registered with `on_reset` starts cold.
+    """
+
+    def __init__(self):
+        self._handlers: dict[str, list[Callable[[str], None]]] = {}
+        self._reset_handlers: list[Callable[[], None]] = []
+        self.transport: Callable[[str, str], None] | None = None
+
+    def subscribe(self, channel: str, handler: Callable[[str], None]) -> None:
+        self._handlers.setdefault(channel, []).append(handler)
+
+    def on_reset(self, handler: Callable[[], None]) -> None:
+        self._reset_handlers.append(handler)
+
+    def publish(self, channel: str, key: str) -> None:
+        self.deliver(channel, key)
+        if self.transport is not None:
+            self.transport(channel, key)
+
+    def deliver(self, channel: str, key: str) -> None:
+        for handler in self._handlers.get(channel, []):
+            handler(key)
+
+    def reset(self) -> None:
+        for handler in self._reset_handlers:
+            handler()
+
+
+invalidation_bus = InvalidationBus()
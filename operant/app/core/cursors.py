@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import base64
+import hashlib
+import hmac
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+from operant.app.core.config import settings
+from operant.app.core.errors import BadRequestError
+
+_SIGNATURE_BYTES = 16
+
+
+def _key() -> bytes:
+    # Derived from the JWT secret, under its own label so a cursor can never pass as a token.
+    return hmac.new(settings.jwt_secret.encode("utf-8"), b"operant-cursor", hashlib.sha256).digest()
+
+
+def _b64(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _unb64(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+@dataclass(frozen=True)
+class Keyset:
+    """Position after the last row of a page: its sort key plus the `id` tie-breaker."""
+
+    value: Any
+    id: UUID
+
+    def encode(self, *, sort: str, order: str) -> str:
+        """Opaque, signed token; bound to the sort it was produced for."""
+        is_datetime = isinstance(self.value, datetime)
+        payload = {
+            "s": sort,
+            "o": order,
+            "t": "dt" if is_datetime else "str",
+            "v": self.value.isoformat() if is_datetime else self.value,
+            "i": str(self.id),
+        }
+        body = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        signature = hmac.new(_key(), body, hashlib.sha256).digest()[:_SIGNATURE_BYTES]
+        return f"{_b64(body)}.{_b64(signature)}"
+
+
+def decode_cursor(token: str | None, *, sort: str, order: str) -> Keyset | None:
+    if not token:
+        return None
+    try:
+        body_part, signature_part = token.split(".", 1)
+        body, signature = _unb64(body_part), _unb64(signature_part)
+    except ValueError as e:
+        raise BadRequestError("Cursor inválido") from e
+    expected = hmac.new(_key(), body, hashlib.sha256).digest()[:_SIGNATURE_BYTES]
+    if not hmac.compare_digest(signature, expected):
+        raise BadRequestError("Cursor inválido")
+
+    payload = json.loads(body)
+    if payload["s"] != sort or payload["o"] != order:
+        raise BadRequestError("Cursor não corresponde à ordenação pedida")
+    value = datetime.fromisoformat(payload["v"]) if payload["t"] == "dt" else payload["v"]
+    return Keyset(value=value, id=UUID(payload["i"]))
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from uuid import UUID
+
+from operant.app.core import metrics
+from operant.app.core.cache import TTLCache, invalidation_bus
+from operant.app.core.config import settings
+
+PLAN_CHANNEL = "plan"
+PLAN_LIMITS_CHANNEL = "plan_limits"
+CATALOG_KEY = "plans"
+
+
+@dataclass(frozen=True)
+class PlanLimits:
+    max_users: int
+    max_projects: int
+    max_import_rows: int
+
+
+@dataclass(frozen=True)
+class Entitlements:
+    """An organization's plan and what it allows."""
+
+    plan: str
+    limits: PlanLimits
+
+
+# Plan name per organization; the limits are looked up in plan_catalog.
+org_plan_cache: TTLCache[UUID, str] = TTLCache(
+    settings.entitlement_cache_size, ttl_seconds=settings.entitlement_cache_ttl_seconds
+)
+# The whole plan_limits table under CATALOG_KEY: loaded on first use, dropped (and so reloaded)
+# after plan_limits_ttl_seconds or on a PLAN_LIMITS_CHANNEL message.
+plan_catalog: TTLCache[str, dict[str, PlanLimits]] = TTLCache(
+    1, ttl_seconds=settings.plan_limits_ttl_seconds
+)
+
+
+def publish_plan_change(organization_id: UUID) -> None:
+    invalidation_bus.publish(PLAN_CHANNEL, str(organization_id))
+
+
+def publish_plan_limits_change() -> None:
+    invalidation_bus.publish(PLAN_LIMITS_CHANNEL, CATALOG_KEY)
+
+
+def _invalidate_plan(key: str) -> None:
+    org_plan_cache.pop(UUID(key))
+
+
+invalidation_bus.subscribe(PLAN_CHANNEL, _invalidate_plan)
+invalidation_bus.subscribe(PLAN_LIMITS_CHANNEL, plan_catalog.pop)
+invalidation_bus.on_reset(org_plan_cache.clear)
+invalidation_bus.on_reset(plan_catalog.clear)
+metrics.register("entitlement_cache", org_plan_cache.stats)
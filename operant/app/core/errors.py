@@ -30,3 +30,16 @@ class ConflictError(DomainError):
     code: str = "conflict"
 
 
+class PreconditionFailedError(DomainError):
+    status_code: int = 412
+    code: str = "precondition_failed"
+
+
+class BadRequestError(DomainError):
+    status_code: int = 400
+    code: str = "bad_request"
+
+
+class ServiceUnavailableError(DomainError):
+    status_code: int = 503
+    code: str = "service_unavailable"
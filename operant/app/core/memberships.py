@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from uuid import UUID
+
+from operant.app.core import metrics
+from operant.app.core.cache import TTLCache, invalidation_bus
+from operant.app.core.config import settings
+
+MEMBERSHIP_CHANNEL = "membership"
+
+
+@dataclass(frozen=True)
+class MembershipSnapshot:
+    user_id: UUID
+    organization_id: UUID
+    role: str
+
+
+membership_cache: TTLCache[tuple[UUID, UUID], MembershipSnapshot] = TTLCache(
+    settings.membership_cache_size, ttl_seconds=settings.membership_cache_ttl_seconds
+)
+
+
+def membership_key(user_id: UUID, organization_id: UUID) -> str:
+    return f"{user_id}:{organization_id}"
+
+
+def publish_membership_change(user_id: UUID, organization_id: UUID) -> None:
+    invalidation_bus.publish(MEMBERSHIP_CHANNEL, membership_key(user_id, organization_id))
+
+
+def _invalidate(key: str) -> None:
+    user_id, organization_id = key.split(":", 1)
+    membership_cache.pop((UUID(user_id), UUID(organization_id)))
+
+
+invalidation_bus.subscribe(MEMBERSHIP_CHANNEL, _invalidate)
+invalidation_bus.on_reset(membership_cache.clear)
+metrics.register("membership_cache", membership_cache.stats)
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Callable
+from typing import Any
+
+# Registry of per-worker metric providers; each one returns a flat, JSON-friendly dict.
+_providers: dict[str, Callable[[], dict[str, Any]]] = {}
+
+
+def register(name: str, provider: Callable[[], dict[str, Any]]) -> None:
+    _providers[name] = provider
+
+
+def snapshot() -> dict[str, Any]:
+    data: dict[str, Any] = {"pid": os.getpid()}
+    for name, provider in _providers.items():
+        data[name] = provider()
+    return data
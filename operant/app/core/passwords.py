@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from operant.app.core import metrics
+from operant.app.core.config import settings
+from operant.app.core.errors import ServiceUnavailableError
+from operant.app.core.security import bcrypt_cost, hash_password, verify_password
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated, size-limited process pool.
+
+    Request threads only wait on a future, and at most `max_pending` of them can do so at
+    once; anything beyond that is rejected with a 503 instead of queueing behind a login storm.
+    """
+
+    def __init__(self, *, workers: int, max_pending: int, rounds: int, timeout_seconds: float):
+        self.rounds = rounds
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout_seconds = timeout_seconds
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._rehashed = 0
+
+    def hash(self, password: str) -> str:
+        return self._run(hash_password, password, rounds=self.rounds)
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        return self._run(verify_password, password, password_hash)
+
+    async def hash_async(self, password: str) -> str:
+        return await self._run_async(hash_password, password, rounds=self.rounds)
+
+    async def verify_async(self, password: str, password_hash: str) -> bool:
+        return await self._run_async(verify_password, password, password_hash)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        # Only upgrade: workers calibrated on different hardware must not ping-pong a hash.
+        cost = bcrypt_cost(password_hash)
+        return cost is not None and cost < self.rounds
+
+    def record_rehash(self) -> None:
+        with self._lock:
+            self._rehashed += 1
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "rounds": self.rounds,
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "queue_depth": max(0, self._pending - max(self.workers, 1)),
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "rehashed": self._rehashed,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise ServiceUnavailableError("Serviço de autenticação sobrecarregado; tente novamente")
+            self._pending += 1
+            self._submitted += 1
+
+    def _release(self, _future: Future | None = None) -> None:
+        with self._lock:
+            self._pending -= 1
+            self._completed += 1
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that already runs uvicorn/anyio threads is unsafe.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        self._acquire()
+        try:
+            future = self._get_executor().submit(fn, *args, **kwargs)
+        except BrokenProcessPool as e:
+            self._release()
+            self.shutdown()
+            raise ServiceUnavailableError("Serviço de autenticação indisponível") from e
+        future.add_done_callback(self._release)
+        return future
+
+    def _run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        if self.workers <= 0:
+            self._acquire()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._release()
+        future = self._submit(fn, *args, **kwargs)
+        try:
+            return future.result(timeout=self.timeout_seconds)
+        except FutureTimeoutError as e:
+            future.cancel()
+            raise ServiceUnavailableError("Tempo esgotado ao processar a senha") from e
+        except BrokenProcessPool as e:
+            self.shutdown()
+            raise ServiceUnavailableError("Serviço de autenticação indisponível") from e
+
+    async def _run_async(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        if self.workers <= 0:
+            return self._run(fn, *args, **kwargs)
+        future = self._submit(fn, *args, **kwargs)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout_seconds)
+        except TimeoutError as e:
+            raise ServiceUnavailableError("Tempo esgotado ao processar a senha") from e
+        except BrokenProcessPool as e:
+            self.shutdown()
+            raise ServiceUnavailableError("Serviço de autenticação indisponível") from e
+
+
+def calibrate_bcrypt_rounds(target_ms: float, *, min_rounds: int, max_rounds: int) -> int:
+    """Pick the highest bcrypt cost whose hashing time stays within `target_ms` on this host."""
+    started = time.perf_counter()
+    hash_password("calibration-probe", rounds=min_rounds)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    # Each extra round doubles the work, so extrapolate instead of timing every cost.
+    rounds = min_rounds
+    while rounds < max_rounds and elapsed_ms * 2 <= target_ms:
+        rounds += 1
+        elapsed_ms *= 2
+    return rounds
+
+
+password_hasher = PasswordHasher(
+    workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending,
+    rounds=settings.password_bcrypt_rounds,
+    timeout_seconds=settings.password_hash_timeout_seconds,
+)
+metrics.register("password_hasher", password_hasher.metrics)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from operant.app.core import metrics
+from operant.app.core.cache import TTLCache, invalidation_bus
+from operant.app.core.config import settings
+from operant.app.core.security import constant_time_equals, now_utc, peek_token_id
+
+PRINCIPAL_CHANNEL = "principal"
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Authenticated caller: decoded access-token claims plus a minimal user snapshot."""
+
+    id: UUID
+    is_active: bool
+    token_id: str
+    expires_at: datetime
+
+
+class PrincipalCache:
+    """
+    Verified principals keyed by access-token `jti`, each entry living until the token's `exp` or
+    for `ttl_seconds`, whichever comes first.
+
+    The digest of the full token is stored alongside the principal so a hit can only be served
+    for the exact token string that was verified, never for a forged token reusing a `jti`.
+    """
+
+    def __init__(self, maxsize: int, *, ttl_seconds: float | None = None):
+        self.ttl_seconds = ttl_seconds
+        self._cache: TTLCache[str, tuple[str, Principal]] = TTLCache(maxsize)
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Principal | None:
+        jti = peek_token_id(token)
+        if jti is None:
+            return None
+        entry = self._cache.get(jti)
+        if entry is None:
+            return None
+        digest, principal = entry
+        if not constant_time_equals(digest, self._digest(token)):
+            return None
+        return principal
+
+    def put(self, token: str, principal: Principal) -> None:
+        ttl = (principal.expires_at - now_utc()).total_seconds()
+        if self.ttl_seconds is not None:
+            ttl = min(ttl, self.ttl_seconds)
+        self._cache.set(principal.token_id, (self._digest(token), principal), ttl_seconds=ttl)
+
+    def invalidate_user(self, user_id: UUID) -> int:
+        return self._cache.discard_where(lambda _jti, entry: entry[1].id == user_id)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+principal_cache = PrincipalCache(
+    settings.principal_cache_size, ttl_seconds=settings.principal_cache_ttl_seconds
+)
+
+
+def publish_user_deactivated(user_id: UUID) -> None:
+    # This worker evicts at once. Other workers evict when the bus transport relays the message
+    # (OPERANT_INVALIDATION_PG_NOTIFY), or else once their entry outlives principal_cache_ttl_seconds.
+    invalidation_bus.publish(PRINCIPAL_CHANNEL, str(user_id))
+
+
+def _invalidate(key: str) -> None:
+    principal_cache.invalidate_user(UUID(key))
+
+
+invalidation_bus.subscribe(PRINCIPAL_CHANNEL, _invalidate)
+invalidation_bus.on_reset(principal_cache.clear)
+metrics.register("principal_cache", principal_cache.stats)
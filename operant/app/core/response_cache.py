@@ -0,0 +1,509 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from anyio import to_thread
+
+from operant.app.core import metrics
+from operant.app.core.cache import invalidation_bus
+from operant.app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_CHANNEL = "response_cache"
+_POLL_SECONDS = 0.02
+
+
+def org_tag(organization_id: Any) -> str:
+    """Everything cached for the organization (dropped when it is offboarded)."""
+    return f"org:{organization_id}"
+
+
+def projects_tag(organization_id: Any) -> str:
+    return f"org:{organization_id}:projects"
+
+
+def members_tag(organization_id: Any) -> str:
+    return f"org:{organization_id}:members"
+
+
+def project_tag(project_id: Any) -> str:
+    """The project's task lists."""
+    return f"project:{project_id}"
+
+
+def user_tag(user_id: Any) -> str:
+    """The user's organization list."""
+    return f"user:{user_id}"
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str | None = None
+
+    def encode(self) -> bytes:
+        return (self.etag or "").encode() + b"\n" + self.body
+
+    @classmethod
+    def decode(cls, raw: bytes) -> CachedResponse:
+        etag, body = raw.split(b"\n", 1)
+        return cls(body=body, etag=etag.decode() or None)
+
+
+class CacheBackend(Protocol):
+    # Entries and invalidations are seen by every worker without the invalidation bus.
+    shared: bool
+    # Calls do network I/O and must stay off the event loop.
+    blocking: bool
+
+    def begin(self, tags: Sequence[str]) -> Any:
+        """State of `tags` before a fill reads the database; `set` gets it back."""
+
+    def get(self, key: str, tags: Sequence[str]) -> bytes | None: ...
+
+    def set(
+        self, key: str, value: bytes, *, tags: Sequence[str], ttl_seconds: float, begun: Any
+    ) -> None:
+        """Store `value`, unless `tags` were invalidated since `begun`."""
+
+    def invalidate(self, tags: Iterable[str]) -> None: ...
+
+    def try_lock(self, key: str, ttl_seconds: float) -> bool: ...
+
+    def unlock(self, key: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def stats(self) -> dict[str, Any]: ...
+
+
+class MemoryBackend:
+    """
+    Per-worker LRU bounded by entry count and by total bytes. A tag -> keys index drops exactly the
+    entries carrying an invalidated tag; the recent invalidations are kept so a fill that read the
+    database before one of them is not stored after it.
+    """
+
+    shared = False
+    blocking = False
+
+    def __init__(self, *, max_bytes: int, max_entries: int, history: int = 1024):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float, bytes, tuple[str, ...]]] = OrderedDict()
+        self._keys_by_tag: dict[str, set[str]] = {}
+        self._bytes = 0
+        self._generation = 0
+        self._recent: deque[tuple[int, frozenset[str]]] = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def begin(self, tags: Sequence[str]) -> int:
+        with self._lock:
+            return self._generation
+
+    def get(self, key: str, tags: Sequence[str]) -> bytes | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    self._discard(key)
+                self._misses += 1
+                return None
+            self._data.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def set(
+        self, key: str, value: bytes, *, tags: Sequence[str], ttl_seconds: float, begun: int
+    ) -> None:
+        size = len(key) + len(value)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+        with self._lock:
+            if self._invalidated_since(begun, tags):
+                return
+            self._discard(key)
+            self._data[key] = (time.monotonic() + ttl_seconds, value, tuple(tags))
+            self._bytes += size
+            for tag in tags:
+                self._keys_by_tag.setdefault(tag, set()).add(key)
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                self._discard(next(iter(self._data)))
+                self._evictions += 1
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        tags = frozenset(tags)
+        with self._lock:
+            self._generation += 1
+            self._recent.append((self._generation, tags))
+            for tag in tags:
+                for key in self._keys_by_tag.pop(tag, set()):
+                    self._discard(key)
+
+    def try_lock(self, key: str, ttl_seconds: float) -> bool:
+        # Nobody else fills this worker's entries; ResponseCache coalesces its own requests.
+        return True
+
+    def unlock(self, key: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._recent.clear()
+            self._data.clear()
+            self._keys_by_tag.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "backend": "memory",
+                "size": len(self._data),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+    def _invalidated_since(self, generation: int, tags: Sequence[str]) -> bool:
+        if generation < self._generation - len(self._recent):
+            return True  # older than the history: assume the worst
+        wanted = set(tags)
+        return any(g > generation and not wanted.isdisjoint(t) for g, t in self._recent)
+
+    def _discard(self, key: str) -> None:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= len(key) + len(entry[1])
+        for tag in entry[2]:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+
+
+class SharedStoreBackend:
+    """
+    Entries in a store all workers share, through a client with the redis-py GET/SET/MGET/INCR/
+    EXPIRE/DELETE subset. Tags are version counters in the store: an entry is stamped with the
+    versions its tags had before the fill read the database and stops matching once one moves, so
+    a hit is a single MGET (entry plus tag versions). Store errors degrade to misses.
+    """
+
+    shared = True
+    blocking = True
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        prefix: str = "operant:rc:",
+        errors: tuple[type[Exception], ...] = (OSError,),
+        tag_ttl_seconds: int = 24 * 60 * 60,
+    ):
+        self.client = client
+        self.prefix = prefix
+        self.errors = errors
+        self.tag_ttl_seconds = tag_ttl_seconds
+        self._hits = 0
+        self._misses = 0
+        self._errors = 0
+
+    def begin(self, tags: Sequence[str]) -> bytes | None:
+        try:
+            return _stamp(self.client.mget(self._tag_keys(tags)))
+        except self.errors:
+            self._failed("begin")
+            return None
+
+    def get(self, key: str, tags: Sequence[str]) -> bytes | None:
+        try:
+            raw, *versions = self.client.mget([self.prefix + key, *self._tag_keys(tags)])
+        except self.errors:
+            self._failed("get")
+            return None
+        if raw is not None:
+            stamp, value = raw.split(b"\n", 1)
+            if stamp == _stamp(versions):
+                self._hits += 1
+                return value
+        self._misses += 1
+        return None
+
+    def set(
+        self,
+        key: str,
+        value: bytes,
+        *,
+        tags: Sequence[str],
+        ttl_seconds: float,
+        begun: bytes | None,
+    ) -> None:
+        if begun is None:
+            return
+        try:
+            self.client.set(self.prefix + key, begun + b"\n" + value, px=_ms(ttl_seconds))
+        except self.errors:
+            self._failed("set")
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        try:
+            for tag_key in self._tag_keys(tags):
+                self.client.incr(tag_key)
+                self.client.expire(tag_key, self.tag_ttl_seconds)
+        except self.errors:
+            # Entries carrying the tag stay visible until they expire.
+            logger.exception("Invalidação da cache de respostas falhou: %s", list(tags))
+            self._errors += 1
+
+    def try_lock(self, key: str, ttl_seconds: float) -> bool:
+        try:
+            lock_key = f"{self.prefix}lock:{key}"
+            return bool(self.client.set(lock_key, b"1", nx=True, px=_ms(ttl_seconds)))
+        except self.errors:
+            self._failed("lock")
+            return True
+
+    def unlock(self, key: str) -> None:
+        try:
+            self.client.delete(f"{self.prefix}lock:{key}")
+        except self.errors:
+            self._failed("unlock")
+
+    def clear(self) -> None:
+        # Shared entries do not depend on this worker having heard every invalidation.
+        pass
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            "backend": "shared",
+            "hits": self._hits,
+            "misses": self._misses,
+            "errors": self._errors,
+            "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def _tag_keys(self, tags: Iterable[str]) -> list[str]:
+        return [f"{self.prefix}tag:{tag}" for tag in tags]
+
+    def _failed(self, operation: str) -> None:
+        self._errors += 1
+        logger.warning("Cache de respostas indisponível (%s)", operation, exc_info=True)
+
+
+class ResponseCache:
+    """
+    Rendered list responses keyed by the caller's scope (org and role, or user) and the normalized
+    query parameters, tagged so a write drops only the lists it affects.
+
+    Concurrent misses on one key are filled once: in this worker the other requests await the first
+    one's result, and across workers sharing the store a short lock makes the others poll for the
+    entry instead of repeating its queries.
+    """
+
+    def __init__(
+        self, backend: CacheBackend, *, ttl_seconds: float, lock_timeout_seconds: float = 2.0
+    ):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.lock_timeout_seconds = lock_timeout_seconds
+        self._flights: dict[str, asyncio.Future[CachedResponse | None]] = {}
+        self._fills = 0
+        self._coalesced = 0
+
+    @staticmethod
+    def key(endpoint: str, scope: Sequence[Any], **params: Any) -> str:
+        # Effective values, so `?limit=20` and no `limit` share an entry.
+        normalized = sorted((name, str(v)) for name, v in params.items() if v is not None)
+        raw = repr((endpoint, [str(part) for part in scope], normalized))
+        return f"{endpoint}:{hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()}"
+
+    async def get_or_fill(
+        self, key: str, tags: Sequence[str], fill: Callable[[], Awaitable[CachedResponse]]
+    ) -> CachedResponse:
+        raw = await self._call(self.backend.get, key, tags)
+        if raw is not None:
+            return CachedResponse.decode(raw)
+
+        flight = self._flights.get(key)
+        if flight is not None:
+            self._coalesced += 1
+            value = await asyncio.shield(flight)
+            # None: the first request failed; this one tries on its own.
+            return value if value is not None else await fill()
+
+        future: asyncio.Future[CachedResponse | None] = asyncio.get_running_loop().create_future()
+        self._flights[key] = future
+        value = None
+        try:
+            value = await self._fill(key, tags, fill)
+            return value
+        finally:
+            del self._flights[key]
+            future.set_result(value)
+
+    def invalidate(self, tags: Iterable[str]) -> None:
+        self.backend.invalidate(tags)
+
+    def stats(self) -> dict[str, Any]:
+        return {**self.backend.stats(), "fills": self._fills, "coalesced": self._coalesced}
+
+    async def _fill(
+        self, key: str, tags: Sequence[str], fill: Callable[[], Awaitable[CachedResponse]]
+    ) -> CachedResponse:
+        begun = await self._call(self.backend.begin, tags)
+        locked = await self._call(self.backend.try_lock, key, self.lock_timeout_seconds)
+        try:
+            if not locked:
+                raw = await self._wait_for(key, tags)
+                if raw is not None:
+                    return CachedResponse.decode(raw)
+            value = await fill()
+            self._fills += 1
+            await self._call(
+                self.backend.set,
+                key,
+                value.encode(),
+                tags=tags,
+                ttl_seconds=self.ttl_seconds,
+                begun=begun,
+            )
+            return value
+        finally:
+            if locked:
+                await self._call(self.backend.unlock, key)
+
+    async def _wait_for(self, key: str, tags: Sequence[str]) -> bytes | None:
+        # Another worker holds the fill lock: its entry usually lands within a query's time.
+        deadline = time.monotonic() + self.lock_timeout_seconds
+        while time.monotonic() < deadline:
+            await asyncio.sleep(_POLL_SECONDS)
+            raw = await self._call(self.backend.get, key, tags)
+            if raw is not None:
+                return raw
+        return None
+
+    async def _call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        if self.backend.blocking:
+            return await to_thread.run_sync(functools.partial(fn, *args, **kwargs))
+        return fn(*args, **kwargs)
+
+
+_cache: ResponseCache | None = None
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache | None:
+    """The cache selected by OPERANT_RESPONSE_CACHE_BACKEND, built on first use; None when off."""
+    global _cache, _configured
+    if not _configured:
+        with _configure_lock:
+            if not _configured:
+                _cache = _build(settings.response_cache_backend)
+                _configured = True
+    return _cache
+
+
+def set_response_cache(cache: ResponseCache | None) -> None:
+    global _cache, _configured
+    with _configure_lock:
+        _cache, _configured = cache, True
+
+
+async def get_or_render(
+    endpoint: str,
+    scope: Sequence[Any],
+    *,
+    tags: Sequence[str],
+    render: Callable[[], Awaitable[CachedResponse]],
+    **params: Any,
+) -> CachedResponse:
+    """`render()`'s response, through the cache when one is configured."""
+    cache = get_response_cache()
+    if cache is None:
+        return await render()
+    return await cache.get_or_fill(cache.key(endpoint, scope, **params), tags, render)
+
+
+def invalidate_tags(*tags: str) -> None:
+    """Drop the cached lists carrying any of `tags`; call once the write has committed."""
+    cache = get_response_cache()
+    if cache is None or not tags:
+        return
+    if cache.backend.shared:
+        cache.invalidate(tags)
+    else:
+        # Delivered here at once, and to the other workers when the bus has a transport.
+        invalidation_bus.publish(RESPONSE_CACHE_CHANNEL, " ".join(tags))
+
+
+def _build(backend: str) -> ResponseCache | None:
+    if backend == "none":
+        return None
+    if backend == "memory":
+        store: CacheBackend = MemoryBackend(
+            max_bytes=settings.response_cache_max_bytes,
+            max_entries=settings.response_cache_max_entries,
+        )
+    else:
+        import redis  # optional dependency: pip install operant[cache]
+
+        store = SharedStoreBackend(
+            redis.Redis.from_url(settings.response_cache_redis_url), errors=(redis.RedisError,)
+        )
+    return ResponseCache(
+        store,
+        ttl_seconds=settings.response_cache_ttl_seconds,
+        lock_timeout_seconds=settings.response_cache_lock_timeout_ms / 1000,
+    )
+
+
+def _deliver(key: str) -> None:
+    cache = get_response_cache()
+    if cache is not None and not cache.backend.shared:
+        cache.invalidate(key.split())
+
+
+def _reset() -> None:
+    cache = get_response_cache()
+    if cache is not None:
+        cache.backend.clear()
+
+
+def _stats() -> dict[str, Any]:
+    cache = get_response_cache()
+    return cache.stats() if cache is not None else {"backend": "none"}
+
+
+def _stamp(versions: Iterable[bytes | None]) -> bytes:
+    return b",".join(version if version is not None else b"0" for version in versions)
+
+
+def _ms(seconds: float) -> int:
+    return max(1, int(seconds * 1000))
+
+
+invalidation_bus.subscribe(RESPONSE_CACHE_CHANNEL, _deliver)
+invalidation_bus.on_reset(_reset)
+metrics.register("response_cache", _stats)
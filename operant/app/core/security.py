@@ -8,27 +8,39 @@ from datetime import UTC, datetime, timedelta
 from typing import Any
 from uuid import UUID, uuid4
 
-import bcrypt as bcrypt_lib
-from jose import JWTError, jwt
-
 from operant.app.core.config import settings
 
+# bcrypt e jose (que carrega cryptography) são importados só quando usados: mantêm o import da
+# aplicação rápido e ficam fora dos processos que nunca tocam em passwords ou tokens.
+
+
+def hash_password(password: str, *, rounds: int | None = None) -> str:
+    import bcrypt as bcrypt_lib
 
-def hash_password(password: str) -> str:
     # Bcrypt has a 72-byte limit. Truncate the password if it exceeds this.
     password_bytes = password.encode('utf-8')[:72]
-    salt = bcrypt_lib.gensalt(rounds=12)
+    salt = bcrypt_lib.gensalt(rounds=rounds or settings.password_bcrypt_rounds)
     password_hash = bcrypt_lib.hashpw(password_bytes, salt)
     return password_hash.decode('utf-8')
 
 
 def verify_password(password: str, password_hash: str) -> bool:
+    import bcrypt as bcrypt_lib
+
     # Apply the same truncation as in hash_password for consistency
     password_bytes = password.encode('utf-8')[:72]
     password_hash_bytes = password_hash.encode('utf-8')
     return bcrypt_lib.checkpw(password_bytes, password_hash_bytes)
 
 
+def bcrypt_cost(password_hash: str) -> int | None:
+    # Modular crypt format: $2b$<cost>$<salt+hash>
+    parts = password_hash.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
 def now_utc() -> datetime:
     return datetime.now(tz=UTC)
 
@@ -54,11 +66,18 @@ class TokenPair:
 
 
 def _encode(payload: dict[str, Any]) -> str:
+    from jose import jwt
+
     return jwt.encode(payload, settings.jwt_secret, algorithm=settings.jwt_algorithm)
 
 
 def _decode(token: str) -> dict[str, Any]:
-    return jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
+    from jose import JWTError, jwt
+
+    try:
+        return jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
+    except JWTError as e:
+        raise InvalidTokenError("Token inválido") from e
 
 
 def create_access_token(*, user_id: UUID) -> str:
@@ -90,21 +109,27 @@ class InvalidTokenError(Exception):
     pass
 
 
-def decode_access_token(token: str) -> tuple[UUID, str]:
-    try:
-        payload = _decode(token)
-    except JWTError as e:
-        raise InvalidTokenError("Token inválido") from e
+def decode_access_token(token: str) -> tuple[UUID, str, datetime]:
+    payload = _decode(token)
     if payload.get("type") != "access":
         raise InvalidTokenError("Tipo de token inválido")
-    return UUID(payload["sub"]), str(payload["jti"])
+    expires_at = datetime.fromtimestamp(int(payload["exp"]), tz=UTC)
+    return UUID(payload["sub"]), str(payload["jti"]), expires_at
 
 
-def decode_refresh_token(token: str) -> tuple[UUID, UUID, str]:
+def peek_token_id(token: str) -> str | None:
+    """Read the `jti` claim WITHOUT verifying the signature (cache lookups only)."""
+    from jose import JWTError, jwt
+
     try:
-        payload = _decode(token)
-    except JWTError as e:
-        raise InvalidTokenError("Token inválido") from e
+        jti = jwt.get_unverified_claims(token).get("jti")
+    except JWTError:
+        return None
+    return str(jti) if jti else None
+
+
+def decode_refresh_token(token: str) -> tuple[UUID, UUID, str]:
+    payload = _decode(token)
     if payload.get("type") != "refresh":
         raise InvalidTokenError("Tipo de token inválido")
     return UUID(payload["sub"]), UUID(payload["jti"]), str(payload["fp"])
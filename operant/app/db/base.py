@@ -3,7 +3,7 @@ from __future__ import annotations
 import uuid
 from datetime import UTC, datetime
 
-from sqlalchemy import DateTime
+from sqlalchemy import DateTime, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -23,6 +23,11 @@ class TimestampMixin:
     )
 
 
+class VersionMixin:
+    # Bumped in SQL (`version + 1`) by every write; ETags carry it and If-Match compares against it.
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default="1", nullable=False)
+
+
 class UUIDPrimaryKeyMixin:
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
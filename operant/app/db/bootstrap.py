@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Engine
+
+from operant.app import models  # noqa: F401  (garante que todos os modelos sejam registados)
+from operant.app.db.base import Base
+
+SCHEMA_ADVISORY_LOCK_ID = 0x0F_5A_70_02
+
+
+def create_schema(engine: Engine) -> None:
+    """
+    Create missing tables (development / docker-compose only; production uses Alembic).
+
+    Serialised with an advisory lock so several workers starting together do not race on DDL.
+    """
+    with engine.begin() as conn:
+        conn.execute(select(func.pg_advisory_xact_lock(text(str(SCHEMA_ADVISORY_LOCK_ID)))))
+        Base.metadata.create_all(bind=conn)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+from operant.app.core import metrics
+from operant.app.core.config import settings
+
+
+class PoolStats:
+    """Checkout wait times and timeouts, shared by a pool and the pools it is recreated into."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total_ms = 0.0
+        self.wait_max_ms = 0.0
+
+    def record(self, wait_ms: float, *, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_total_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+
+    def snapshot(self, pool: Pool) -> dict[str, Any]:
+        with self._lock:
+            data: dict[str, Any] = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": round(self.wait_total_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max_ms, 3),
+            }
+        if isinstance(pool, QueuePool):
+            data.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+            )
+        return data
+
+
+def _instrumented(pool_cls: type[Pool], stats: PoolStats) -> type[Pool]:
+    # Pool.recreate() (engine.dispose()) instantiates self.__class__, so the stats carry over.
+    class InstrumentedPool(pool_cls):  # type: ignore[valid-type,misc]
+        def connect(self):
+            started = time.perf_counter()
+            try:
+                connection = super().connect()
+            except PoolTimeoutError:
+                stats.record((time.perf_counter() - started) * 1000, timed_out=True)
+                raise
+            stats.record((time.perf_counter() - started) * 1000, timed_out=False)
+            return connection
+
+    InstrumentedPool.__name__ = f"Instrumented{pool_cls.__name__}"
+    return InstrumentedPool
+
+
+def _engine_kwargs(*, is_async: bool, stats: PoolStats) -> dict[str, Any]:
+    connect_args: dict[str, Any] = {}
+    timeout_ms = settings.db_statement_timeout_ms
+    if settings.db_pgbouncer_transaction_mode:
+        # Transaction pooling: no server-side prepared statements and no session-level state.
+        if is_async:
+            connect_args.update(statement_cache_size=0, prepared_statement_cache_size=0)
+    elif timeout_ms > 0:
+        if is_async:
+            connect_args["server_settings"] = {"statement_timeout": str(timeout_ms)}
+        else:
+            connect_args["options"] = f"-c statement_timeout={timeout_ms}"
+
+    return {
+        "poolclass": _instrumented(AsyncAdaptedQueuePool if is_async else QueuePool, stats),
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+        "pool_recycle": settings.db_pool_recycle_seconds,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "connect_args": connect_args,
+    }
+
+
+def _install_transaction_timeout(engine: Engine) -> None:
+    timeout_ms = settings.db_statement_timeout_ms
+    if not settings.db_pgbouncer_transaction_mode or timeout_ms <= 0:
+        return
+
+    @event.listens_for(engine, "begin")
+    def _set_local_timeout(conn):
+        # SET LOCAL dies with the transaction, so nothing leaks to the next pgbouncer client.
+        conn.exec_driver_sql(f"SET LOCAL statement_timeout = {int(timeout_ms)}")
+
+
+def build_engine(url: str, *, name: str = "primary") -> Engine:
+    stats = PoolStats()
+    engine = create_engine(url, **_engine_kwargs(is_async=False, stats=stats))
+    _install_transaction_timeout(engine)
+    metrics.register(f"db_pool_{name}", lambda: stats.snapshot(engine.pool))
+    return engine
+
+
+def build_async_engine(url: str, *, name: str = "primary") -> AsyncEngine:
+    stats = PoolStats()
+    engine = create_async_engine(url, **_engine_kwargs(is_async=True, stats=stats))
+    _install_transaction_timeout(engine.sync_engine)
+    metrics.register(f"db_pool_{name}_async", lambda: stats.snapshot(engine.sync_engine.pool))
+    return engine
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Transaction control issued by SQLAlchemy itself (savepoints, per-transaction settings):
+# not queries the application asked for.
+_TRANSACTION_CONTROL = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT", "SET LOCAL")
+
+_START_KEY = "_operant_query_start"
+_ENGINE_START_KEY = "_operant_engine_query_start"
+
+
+class QueryStats:
+    """Statements executed and DB time spent, for one request (or one `record_queries` block)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_ms = 0.0
+        self._statements: Counter[str] = Counter()
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        if statement.lstrip().upper().startswith(_TRANSACTION_CONTROL):
+            return
+        with self._lock:
+            self.count += 1
+            self.total_ms += elapsed_ms
+            self._statements[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Identical statements run at least `threshold` times: the usual shape of an N+1."""
+        with self._lock:
+            return [(sql, n) for sql, n in self._statements.most_common() if n >= threshold]
+
+    def describe(self) -> str:
+        with self._lock:
+            lines = [f"{self.count} queries, {self.total_ms:.1f}ms"]
+            lines += [f"  {n}x {' '.join(sql.split())[:200]}" for sql, n in self._statements.most_common()]
+        return "\n".join(lines)
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_ms:.2f};desc="{self.count} queries"'
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("operant_query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Attribute every statement run in this context (and threads/greenlets it spawns)."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def record_queries(engine: Engine) -> Iterator[QueryStats]:
+    """Count every statement run on `engine`, whatever context it comes from (used by tests)."""
+    stats = QueryStats()
+
+    def _before(_conn, _cursor, _statement, _parameters, context, _executemany):
+        if context is not None:
+            setattr(context, _ENGINE_START_KEY, time.perf_counter())
+
+    def _after(_conn, _cursor, statement, _parameters, context, _executemany):
+        started = getattr(context, _ENGINE_START_KEY, None)
+        stats.record(statement, (time.perf_counter() - started) * 1000 if started else 0.0)
+
+    event.listen(engine, "before_cursor_execute", _before)
+    event.listen(engine, "after_cursor_execute", _after)
+    try:
+        yield stats
+    finally:
+        event.remove(engine, "before_cursor_execute", _before)
+        event.remove(engine, "after_cursor_execute", _after)
+
+
+# The start time lives on the execution context, so a statement that fails (and never reaches
+# after_cursor_execute) leaves nothing behind.
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(_conn, _cursor, _statement, _parameters, context, _executemany) -> None:
+    if context is not None and _current.get() is not None:
+        setattr(context, _START_KEY, time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(_conn, _cursor, statement, _parameters, context, _executemany) -> None:
+    stats = _current.get()
+    started = getattr(context, _START_KEY, None)
+    if stats is None or started is None:
+        return
+    stats.record(statement, (time.perf_counter() - started) * 1000)
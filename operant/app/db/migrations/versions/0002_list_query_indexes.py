@@ -0,0 +1,86 @@
+"""composite indexes for list queries + trigram index for project search
+
+Revision ID: 0002_list_query_indexes
+Revises: 0001_initial
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import logging
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0002_list_query_indexes"
+down_revision = "0001_initial"
+branch_labels = None
+depends_on = None
+
+# (name, table, columns) — each matches one list query's filter + sort, `id` last as tiebreaker.
+COMPOSITE_INDEXES = [
+    ("ix_tasks_project_created", "tasks", ["project_id", "created_at", "id"]),
+    ("ix_tasks_project_title", "tasks", ["project_id", "title", "id"]),
+    ("ix_tasks_project_status_created", "tasks", ["project_id", "status", "created_at", "id"]),
+    ("ix_tasks_project_status_title", "tasks", ["project_id", "status", "title", "id"]),
+    ("ix_projects_org_created", "projects", ["organization_id", "created_at", "id"]),
+    ("ix_projects_org_name", "projects", ["organization_id", "name", "id"]),
+    ("ix_memberships_org_created", "memberships", ["organization_id", "created_at", "id"]),
+]
+
+# Leading-column prefixes of the composites above.
+REDUNDANT_INDEXES = [
+    ("ix_tasks_project_id", "tasks", ["project_id"]),
+    ("ix_projects_organization_id", "projects", ["organization_id"]),
+]
+
+TRIGRAM_INDEX = "ix_projects_name_trgm"
+
+log = logging.getLogger("alembic.runtime.migration")
+
+
+def _trgm_available() -> bool:
+    bind = op.get_bind()
+    return bool(
+        bind.execute(sa.text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")).scalar()
+    )
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction block; each statement commits on its own and
+    # IF NOT EXISTS makes a re-run after a failed build safe.
+    with op.get_context().autocommit_block():
+        for name, table, columns in COMPOSITE_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+
+        if _trgm_available():
+            op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            op.create_index(
+                TRIGRAM_INDEX,
+                "projects",
+                ["name"],
+                postgresql_using="gin",
+                postgresql_ops={"name": "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        else:
+            # Without it project search (ILIKE '%q%') falls back to scanning the org's projects.
+            log.warning(
+                "pg_trgm indisponível (instale postgresql-contrib): %s não foi criado. Depois de instalar: "
+                "CREATE EXTENSION pg_trgm; CREATE INDEX CONCURRENTLY %s ON projects USING gin (name gin_trgm_ops)",
+                TRIGRAM_INDEX,
+                TRIGRAM_INDEX,
+            )
+
+        for name, table, _columns in REDUNDANT_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns in REDUNDANT_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True, if_not_exists=True)
+        op.drop_index(TRIGRAM_INDEX, table_name="projects", postgresql_concurrently=True, if_exists=True)
+        for name, table, _columns in reversed(COMPOSITE_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
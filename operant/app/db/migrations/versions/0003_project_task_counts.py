@@ -0,0 +1,38 @@
+"""per-project task counters by status
+
+Revision ID: 0003_project_task_counts
+Revises: 0002_list_query_indexes
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "0003_project_task_counts"
+down_revision = "0002_list_query_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "project_task_counts",
+        sa.Column("project_id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("status", sa.String(length=30), primary_key=True, nullable=False),
+        sa.Column("count", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["project_id"], ["projects.id"], ondelete="CASCADE"),
+    )
+    # Backfill in the same transaction; `operant repair-task-counts` redoes this at any time.
+    op.execute(
+        """
+        INSERT INTO project_task_counts (project_id, status, count)
+        SELECT project_id, status, count(*) FROM tasks GROUP BY project_id, status
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("project_task_counts")
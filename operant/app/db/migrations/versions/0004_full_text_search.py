@@ -0,0 +1,67 @@
+"""generated tsvector columns + GIN indexes for full-text search
+
+Revision ID: 0004_full_text_search
+Revises: 0003_project_task_counts
+Create Date: 2026-10-18
+
+Adding a STORED generated column rewrites the table under an ACCESS EXCLUSIVE lock: on a large
+`tasks` table run this in a maintenance window. The GIN indexes are then built CONCURRENTLY.
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "0004_full_text_search"
+down_revision = "0003_project_task_counts"
+branch_labels = None
+depends_on = None
+
+# Must match operant.app.db.search.weighted_tsvector (inlined: migrations do not import app code).
+SEARCH_COLUMNS = [
+    (
+        "projects",
+        "ix_projects_search",
+        (
+            "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+        ),
+    ),
+    (
+        "tasks",
+        "ix_tasks_search",
+        (
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+        ),
+    ),
+]
+
+
+def upgrade() -> None:
+    for table, _index, expression in SEARCH_COLUMNS:
+        op.add_column(
+            table,
+            sa.Column("search_vector", postgresql.TSVECTOR(), sa.Computed(expression, persisted=True)),
+        )
+    # autocommit_block commits the column changes first; CONCURRENTLY cannot run in a transaction.
+    with op.get_context().autocommit_block():
+        for table, index, _expression in SEARCH_COLUMNS:
+            op.create_index(
+                index,
+                table,
+                ["search_vector"],
+                postgresql_using="gin",
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, index, _expression in SEARCH_COLUMNS:
+            op.drop_index(index, table_name=table, postgresql_concurrently=True, if_exists=True)
+    for table, _index, _expression in SEARCH_COLUMNS:
+        op.drop_column(table, "search_vector")
@@ -0,0 +1,53 @@
+"""tombstones and chunked purge jobs for large project/organization deletes
+
+Revision ID: 0005_purge_jobs
+Revises: 0004_full_text_search
+Create Date: 2026-10-18
+
+Adding a nullable column without a default is a catalog-only change; no table rewrite.
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "0005_purge_jobs"
+down_revision = "0004_full_text_search"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("projects", sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column(
+        "organizations", sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.create_table(
+        "purge_jobs",
+        sa.Column("id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("kind", sa.String(length=20), nullable=False),
+        sa.Column("target_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("requested_by", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("total_tasks", sa.BigInteger(), nullable=False),
+        sa.Column("deleted_tasks", sa.BigInteger(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["requested_by"], ["users.id"], ondelete="SET NULL"),
+    )
+    op.create_index(
+        "ix_purge_jobs_open",
+        "purge_jobs",
+        ["created_at"],
+        postgresql_where=sa.text("status <> 'done'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_purge_jobs_open", table_name="purge_jobs")
+    op.drop_table("purge_jobs")
+    op.drop_column("organizations", "deleted_at")
+    op.drop_column("projects", "deleted_at")
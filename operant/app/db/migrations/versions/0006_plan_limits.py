@@ -0,0 +1,42 @@
+"""plan limits as data: the plan_limits table, seeded with the former hardcoded values
+
+Revision ID: 0006_plan_limits
+Revises: 0005_purge_jobs
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0006_plan_limits"
+down_revision = "0005_purge_jobs"
+branch_labels = None
+depends_on = None
+
+# Must match operant.app.models.plan_limit.DEFAULT_PLAN_LIMITS (inlined: migrations do not import app code).
+SEED = [
+    {"plan": "FREE", "max_users": 3, "max_projects": 5, "max_import_rows": 10_000},
+    {"plan": "PRO", "max_users": 50, "max_projects": 100, "max_import_rows": 1_000_000},
+]
+
+
+def upgrade() -> None:
+    plan_limits = op.create_table(
+        "plan_limits",
+        sa.Column("plan", sa.String(length=20), primary_key=True, nullable=False),
+        sa.Column("max_users", sa.Integer(), nullable=False),
+        sa.Column("max_projects", sa.Integer(), nullable=False),
+        sa.Column("max_import_rows", sa.BigInteger(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    now = datetime.now(tz=UTC)
+    op.bulk_insert(plan_limits, [{**row, "created_at": now, "updated_at": now} for row in SEED])
+
+
+def downgrade() -> None:
+    op.drop_table("plan_limits")
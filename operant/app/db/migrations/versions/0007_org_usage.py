@@ -0,0 +1,41 @@
+"""plan quota usage per organization, claimed with conditional increments
+
+Revision ID: 0007_org_usage
+Revises: 0006_plan_limits
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision = "0007_org_usage"
+down_revision = "0006_plan_limits"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "org_usage",
+        sa.Column("organization_id", postgresql.UUID(as_uuid=True), primary_key=True, nullable=False),
+        sa.Column("resource", sa.String(length=30), primary_key=True, nullable=False),
+        sa.Column("used", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["organization_id"], ["organizations.id"], ondelete="CASCADE"),
+    )
+    # Backfill in the same transaction; `operant reconcile-usage` redoes this at any time.
+    op.execute(
+        """
+        INSERT INTO org_usage (organization_id, resource, used)
+        SELECT organization_id, 'projects', count(*) FROM projects
+        WHERE deleted_at IS NULL GROUP BY organization_id
+        UNION ALL
+        SELECT organization_id, 'users', count(*) FROM memberships GROUP BY organization_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("org_usage")
@@ -0,0 +1,27 @@
+"""row versions on tasks and projects, for ETags and If-Match
+
+Revision ID: 0008_row_versions
+Revises: 0007_org_usage
+Create Date: 2026-10-18
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "0008_row_versions"
+down_revision = "0007_org_usage"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A constant default: Postgres adds the column without rewriting the table.
+    op.add_column("tasks", sa.Column("version", sa.Integer(), server_default="1", nullable=False))
+    op.add_column("projects", sa.Column("version", sa.Integer(), server_default="1", nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column("projects", "version")
+    op.drop_column("tasks", "version")
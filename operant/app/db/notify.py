@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import json
+import logging
+import select
+import threading
+from uuid import uuid4
+
+import psycopg2
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from operant.app.core.cache import InvalidationBus
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "operant_invalidation"
+_NOTIFY_SQL = text("SELECT pg_notify(:channel, :payload)")
+
+
+class PgNotifyTransport:
+    """
+    Relays invalidation-bus messages between workers through Postgres LISTEN/NOTIFY.
+
+    Calling the transport (the bus does it after delivering locally) sends a NOTIFY on a pooled
+    connection. A daemon thread per worker LISTENs on a dedicated connection and hands messages from
+    other workers to `bus.deliver`; its own messages are recognised by `origin` and skipped.
+    NOTIFY is not queued for absent listeners, so each (re)connect calls `bus.reset()` and the
+    subscribed caches start cold instead of missing an invalidation sent during the gap.
+    """
+
+    def __init__(self, bus: InvalidationBus, engine: Engine, *, poll_seconds: float = 1.0):
+        self.bus = bus
+        self.engine = engine
+        self.poll_seconds = poll_seconds
+        self.origin = uuid4().hex
+        self._stop = threading.Event()
+        self._connected = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __call__(self, channel: str, key: str) -> None:
+        payload = json.dumps([self.origin, channel, key])
+        with self.engine.connect() as conn:
+            conn.execute(_NOTIFY_SQL, {"channel": NOTIFY_CHANNEL, "payload": payload})
+            conn.commit()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._listen_forever, name="invalidation-listener", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        self._connected.clear()
+
+    def wait_connected(self, timeout: float) -> bool:
+        return self._connected.wait(timeout)
+
+    def _listen_forever(self) -> None:
+        dsn = self.engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+        while not self._stop.is_set():
+            try:
+                conn = psycopg2.connect(dsn)
+            except psycopg2.Error:
+                logger.warning("Sem ligação para LISTEN %s; nova tentativa em breve", NOTIFY_CHANNEL)
+                self._stop.wait(self.poll_seconds)
+                continue
+            try:
+                conn.autocommit = True
+                conn.cursor().execute(f"LISTEN {NOTIFY_CHANNEL}")
+                self.bus.reset()
+                self._connected.set()
+                self._drain(conn)
+            except (psycopg2.Error, OSError):
+                logger.warning("Ligação LISTEN %s perdida; a reconectar", NOTIFY_CHANNEL, exc_info=True)
+            finally:
+                self._connected.clear()
+                conn.close()
+
+    def _drain(self, conn) -> None:
+        while not self._stop.is_set():
+            if not select.select([conn], [], [], self.poll_seconds)[0]:
+                continue
+            conn.poll()
+            while conn.notifies:
+                origin, channel, key = json.loads(conn.notifies.pop(0).payload)
+                if origin == self.origin:
+                    continue
+                try:
+                    self.bus.deliver(channel, key)
+                except Exception:
+                    logger.exception("Invalidação %s:%s falhou", channel, key)
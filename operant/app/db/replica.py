@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import hashlib
+import hmac
+import threading
+import time
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from operant.app.core import metrics
+from operant.app.core.cache import TTLCache
+from operant.app.core.config import settings
+from operant.app.db.engine import build_async_engine, build_engine
+from operant.app.db.session import DbSession, run_db
+
+# Carries read-your-writes to whichever worker serves the next read: "<user>:<until ms>.<hmac>".
+STICKY_COOKIE = "operant_primary_until"
+
+# Zero when the replica has replayed everything it received (an idle primary is not "lag");
+# otherwise the age of the last replayed transaction.
+_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+def _sign(body: str) -> str:
+    # Keyed off the JWT secret under its own label, like cursors: a client cannot pin itself forever.
+    secret = settings.jwt_secret.encode("utf-8")
+    key = hmac.new(secret, b"operant-primary-sticky", hashlib.sha256).digest()
+    return hmac.new(key, body.encode("utf-8"), hashlib.sha256).hexdigest()[:32]
+
+
+class ReplicaRouter:
+    """
+    Decides whether a read-only request may use the replica.
+
+    Reads go to the primary when no replica is configured, when the user wrote within the last
+    `sticky_seconds` (read-your-writes: remembered by this worker and, for the others, in the
+    signed STICKY_COOKIE the client sends back), or when the last health check found the replica
+    unreachable or lagging by more than `max_lag_seconds`. Health checks run at most once per
+    `check_interval_seconds`; concurrent requests reuse the previous verdict meanwhile.
+    """
+
+    def __init__(
+        self,
+        url: str | None,
+        *,
+        async_url: str | None = None,
+        sticky_seconds: float,
+        max_lag_seconds: float,
+        check_interval_seconds: float,
+        sticky_maxsize: int = 100_000,
+    ):
+        self.url = url
+        self.async_url = async_url
+        self.sticky_seconds = sticky_seconds
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self._recent_writers: TTLCache[UUID, bool] = TTLCache(sticky_maxsize, ttl_seconds=sticky_seconds)
+        self._sessionmaker: sessionmaker[Session] | None = None
+        self._async_sessionmaker: async_sessionmaker[AsyncSession] | None = None
+        self._lock = threading.Lock()
+        self._checking = False
+        self._checked_at = float("-inf")
+        self._healthy = False
+        self._lag_seconds: float | None = None
+        self._replica_reads = 0
+        self._primary_reads = 0
+        self._sticky_reads = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.url is not None
+
+    def open_session(self) -> DbSession:
+        if settings.database_async:
+            if self._async_sessionmaker is None:
+                self._async_sessionmaker = async_sessionmaker(
+                    bind=build_async_engine(self.async_url or self.url, name="replica"),
+                    autoflush=False,
+                    expire_on_commit=False,
+                )
+            return self._async_sessionmaker()
+        if self._sessionmaker is None:
+            self._sessionmaker = sessionmaker(
+                bind=build_engine(self.url, name="replica"), autoflush=False, expire_on_commit=False
+            )
+        return self._sessionmaker()
+
+    # --- read-your-writes ---------------------------------------------------------------
+
+    def mark_write(self, user_id: UUID) -> str:
+        """Pin `user_id` to the primary; returns the STICKY_COOKIE value for the response."""
+        self._recent_writers.set(user_id, True)
+        until_ms = int((time.time() + self.sticky_seconds) * 1000)
+        body = f"{user_id}:{until_ms}"
+        return f"{body}.{_sign(body)}"
+
+    def is_sticky(self, user_id: UUID, cookie: str | None = None) -> bool:
+        if self._recent_writers.get(user_id) is not None:
+            return True
+        if not cookie:
+            return False
+        body, _, signature = cookie.rpartition(".")
+        cookie_user, _, until_ms = body.partition(":")
+        valid = hmac.compare_digest(signature.encode("utf-8"), _sign(body).encode("utf-8"))
+        if not valid or cookie_user != str(user_id):
+            return False
+        return time.time() * 1000 < int(until_ms)
+
+    # --- health -------------------------------------------------------------------------
+
+    def _record_check(self, lag_seconds: float | None) -> None:
+        with self._lock:
+            self._lag_seconds = lag_seconds
+            self._healthy = lag_seconds is not None and lag_seconds <= self.max_lag_seconds
+            self._checked_at = time.monotonic()
+            self._checking = False
+
+    async def is_usable(self, replica: DbSession) -> bool:
+        with self._lock:
+            due = time.monotonic() - self._checked_at >= self.check_interval_seconds
+            if not due or self._checking:
+                return self._healthy
+            self._checking = True
+        try:
+            lag = await run_db(replica, lambda s: float(s.execute(_LAG_SQL).scalar_one()))
+        except (DBAPIError, OSError):
+            lag = None
+        self._record_check(lag)
+        return self._healthy
+
+    def record_route(self, *, replica: bool, sticky: bool = False) -> None:
+        with self._lock:
+            if replica:
+                self._replica_reads += 1
+            else:
+                self._primary_reads += 1
+                if sticky:
+                    self._sticky_reads += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "healthy": self._healthy,
+                "lag_seconds": self._lag_seconds,
+                "replica_reads": self._replica_reads,
+                "primary_reads": self._primary_reads,
+                "sticky_reads": self._sticky_reads,
+            }
+
+
+replica_router = ReplicaRouter(
+    settings.database_replica_url,
+    async_url=settings.resolved_async_database_replica_url,
+    sticky_seconds=settings.replica_sticky_seconds,
+    max_lag_seconds=settings.replica_max_lag_seconds,
+    check_interval_seconds=settings.replica_health_check_interval_seconds,
+)
+metrics.register("db_replica", replica_router.stats)
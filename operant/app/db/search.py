@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import re
+
+# 'simple' = lowercase + no stemming: titles mix Portuguese, English and identifiers, and a
+# language-specific stemmer would mangle the latter. Generated columns and queries must agree.
+SEARCH_CONFIG = "simple"
+
+MAX_QUERY_TERMS = 8
+
+_TERM = re.compile(r"\w+")
+
+
+def weighted_tsvector(title_column: str, body_column: str) -> str:
+    """SQL for the generated search column: title words weigh A, body words B."""
+    return (
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({title_column}, '')), 'A') || "
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({body_column}, '')), 'B')"
+    )
+
+
+def prefix_query(text: str) -> str | None:
+    """
+    Turn free text into a to_tsquery() string where every word is a prefix match (`'proj':* & ...`).
+
+    Only word characters survive, so user input can never inject tsquery operators. Returns None
+    when nothing searchable is left.
+    """
+    terms = _TERM.findall(text.lower())[:MAX_QUERY_TERMS]
+    if not terms:
+        return None
+    return " & ".join(f"'{term}':*" for term in terms)
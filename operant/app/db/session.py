@@ -1,20 +1,64 @@
 from __future__ import annotations
 
-from collections.abc import Generator
+import threading
+from collections.abc import AsyncGenerator, AsyncIterator, Callable, Generator, Iterator
+from typing import Any, TypeVar
 
-from sqlalchemy import create_engine
+from anyio import from_thread, to_thread
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.util import await_
 
 from operant.app import models  # noqa: F401  (garante que todos os modelos sejam registados)
 from operant.app.core.config import settings
-from operant.app.db.base import Base
+from operant.app.db.engine import build_async_engine, build_engine
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
-SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
+T = TypeVar("T")
 
-# Para facilitar o primeiro arranque em desenvolvimento/docker-compose,
-# garantimos que o schema mínimo existe. Em produção real, usar apenas Alembic.
-Base.metadata.create_all(bind=engine)
+# Sessão aceite pelos handlers: síncrona (psycopg2) ou assíncrona (asyncpg), conforme a configuração.
+DbSession = Session | AsyncSession
+
+# Chaves em Session.info partilhadas com a UnitOfWork (ver services/unit_of_work.py).
+DEFERRED_COMMIT_KEY = "operant.deferred_commit"
+AFTER_COMMIT_KEY = "operant.after_commit"
+
+_engine: Engine | None = None
+_sessionmaker: sessionmaker[Session] | None = None
+_async_sessionmaker: async_sessionmaker[AsyncSession] | None = None
+_lock = threading.Lock()
+
+
+def get_engine() -> Engine:
+    # Criado no primeiro uso: importar este módulo não abre ligações nem carrega o driver.
+    global _engine
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                _engine = build_engine(settings.database_url)
+    return _engine
+
+
+def get_sessionmaker() -> sessionmaker[Session]:
+    global _sessionmaker
+    if _sessionmaker is None:
+        # expire_on_commit=False: as respostas são serializadas depois do commit, fora da thread da
+        # sessão, e não devem disparar um SELECT de refresh por cada objeto devolvido.
+        _sessionmaker = sessionmaker(
+            bind=get_engine(), autoflush=False, autocommit=False, expire_on_commit=False, future=True
+        )
+    return _sessionmaker
+
+
+def SessionLocal() -> Session:  # mantém o nome do antigo sessionmaker global
+    return get_sessionmaker()()
+
+
+def __getattr__(name: str) -> Any:
+    # Compatibilidade: `from operant.app.db.session import engine` continua a funcionar.
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_db() -> Generator[Session, None, None]:
@@ -25,3 +69,63 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    # Criado apenas quando o modo assíncrono está ativo: importa o asyncpg.
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        async_engine = build_async_engine(settings.resolved_async_database_url)
+        _async_sessionmaker = async_sessionmaker(
+            bind=async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_sessionmaker
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+async def run_db(db: DbSession, fn: Callable[[Session], T]) -> T:
+    """
+    Run synchronous repository/service code against either session flavour.
+
+    With an AsyncSession the code runs through `run_sync` (asyncpg I/O, no thread); with a sync
+    Session it runs in the worker threadpool. Either way the event loop is never blocked, and
+    repositories and services keep a single implementation.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn)
+    return await to_thread.run_sync(fn, db)
+
+
+def iterate_blocking(db: DbSession, source: AsyncIterator[T]) -> Iterator[T]:
+    """
+    Consume an async iterator (e.g. a request body) from the synchronous code `run_db` runs.
+
+    Each item is awaited back on the event loop: from the worker thread with a sync Session, or on
+    the session's greenlet (as SQLAlchemy's own I/O) with an AsyncSession.
+    """
+    while True:
+        try:
+            if isinstance(db, AsyncSession):
+                item = await_(source.__anext__())
+            else:
+                item = from_thread.run(source.__anext__)
+        except StopAsyncIteration:
+            return
+        yield item
+
+
+def commit_or_defer(db: Session) -> None:
+    """Commit now, or leave it to the enclosing unit of work, which commits once at the end."""
+    if db.info.get(DEFERRED_COMMIT_KEY):
+        return
+    db.commit()
+
+
+def after_commit(db: Session, fn: Callable[[], None]) -> None:
+    """Run `fn` once the current work is committed (immediately when no unit of work is open)."""
+    if db.info.get(DEFERRED_COMMIT_KEY):
+        db.info.setdefault(AFTER_COMMIT_KEY, []).append(fn)
+        return
+    fn()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from dataclasses import dataclass, field
+
+from sqlalchemy.orm import Session
+
+from operant.app.core.config import settings
+from operant.app.core.security import now_utc
+from operant.app.models.purge_job import PurgeStatus
+from operant.app.repositories.purge_repository import PurgeRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PurgeRunProgress:
+    tasks_deleted: int = 0
+    jobs_finished: int = 0
+    batches: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.monotonic() - self.started_at
+
+
+def run_purges(
+    session_factory: Callable[[], AbstractContextManager[Session]],
+    *,
+    batch_size: int | None = None,
+    pause_ms: int | None = None,
+    max_batches: int | None = None,
+    on_progress: Callable[[PurgeRunProgress], None] | None = None,
+) -> PurgeRunProgress:
+    """
+    Work through the pending purge jobs (tombstoned projects and organizations).
+
+    Each batch deletes up to `batch_size` of the target's tasks in its own short transaction,
+    with the job row locked (FOR UPDATE SKIP LOCKED, so several workers share the queue) and its
+    progress updated. The batch that finds the last tasks also deletes the target row, which takes
+    the rest with it through ON DELETE CASCADE.
+    """
+    batch_size = batch_size or settings.purge_batch_size
+    pause = (settings.purge_pause_ms if pause_ms is None else pause_ms) / 1000
+    progress = PurgeRunProgress()
+
+    while max_batches is None or progress.batches < max_batches:
+        with session_factory() as db:
+            repo = PurgeRepository(db)
+            job = repo.claim_next()
+            if job is None:
+                break
+            job.status = PurgeStatus.RUNNING.value
+            deleted = repo.delete_tasks_batch(job, limit=batch_size)
+            job.deleted_tasks += deleted
+            finished = deleted < batch_size
+            if finished:
+                repo.delete_target(job)
+                job.status = PurgeStatus.DONE.value
+                job.finished_at = now_utc()
+                logger.info(
+                    "Remoção de %s %s concluída (%d tarefas)",
+                    job.kind,
+                    job.target_id,
+                    job.deleted_tasks,
+                )
+            db.commit()
+
+        progress.batches += 1
+        progress.tasks_deleted += deleted
+        progress.jobs_finished += finished
+        if on_progress is not None:
+            on_progress(progress)
+        if not finished:
+            time.sleep(pause)
+
+    return progress
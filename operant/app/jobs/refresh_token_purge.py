@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from sqlalchemy.orm import Session
+
+from operant.app.core.config import settings
+from operant.app.core.security import now_utc
+from operant.app.repositories.refresh_token_repository import RefreshTokenRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PurgeProgress:
+    expired_deleted: int = 0
+    revoked_deleted: int = 0
+    batches: int = 0
+    skipped: bool = False
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.monotonic() - self.started_at
+
+
+def purge_refresh_tokens(
+    session_factory: Callable[[], AbstractContextManager[Session]],
+    *,
+    batch_size: int | None = None,
+    pause_ms: int | None = None,
+    revoked_retention_seconds: int | None = None,
+    max_batches: int | None = None,
+    on_progress: Callable[[PurgeProgress], None] | None = None,
+) -> PurgeProgress:
+    """
+    Delete expired and long-revoked refresh tokens in bounded chunks.
+
+    Every chunk is its own short transaction (locks are held for one batch only) followed by a
+    pause, so the janitor never competes with login traffic for long.
+    """
+    batch_size = batch_size or settings.refresh_token_purge_batch_size
+    pause = (settings.refresh_token_purge_pause_ms if pause_ms is None else pause_ms) / 1000
+    retention = (
+        settings.refresh_token_revoked_retention_seconds
+        if revoked_retention_seconds is None
+        else revoked_retention_seconds
+    )
+    progress = PurgeProgress()
+
+    for phase in ("expired", "revoked"):
+        while max_batches is None or progress.batches < max_batches:
+            with session_factory() as db:
+                repo = RefreshTokenRepository(db)
+                if not repo.try_lock_purge():
+                    logger.info("Outro processo já está a limpar refresh tokens; a saltar")
+                    progress.skipped = True
+                    return progress
+                now = now_utc()
+                if phase == "expired":
+                    deleted = repo.purge_expired_batch(now=now, limit=batch_size)
+                    progress.expired_deleted += deleted
+                else:
+                    deleted = repo.purge_revoked_batch(
+                        revoked_before=now - timedelta(seconds=retention), limit=batch_size
+                    )
+                    progress.revoked_deleted += deleted
+                db.commit()
+
+            progress.batches += 1
+            if on_progress is not None:
+                on_progress(progress)
+            if deleted < batch_size:
+                break
+            time.sleep(pause)
+
+    logger.info(
+        "Refresh tokens removidos: %d expirados, %d revogados em %d lotes (%.1fs)",
+        progress.expired_deleted,
+        progress.revoked_deleted,
+        progress.batches,
+        progress.elapsed_seconds,
+    )
+    return progress
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from operant.app.services.entitlement_service import EntitlementService
+
+logger = logging.getLogger(__name__)
+
+
+def reconcile_usage(
+    session_factory: Callable[[], AbstractContextManager[Session]],
+    *,
+    organization_id: UUID | None = None,
+) -> int:
+    """
+    Rebuild `org_usage` from the projects and memberships it counts (one org, or all), for rows
+    written behind the services' back. Claims wait on the table lock for the statement's duration.
+    """
+    with session_factory() as db:
+        written = EntitlementService(db).reconcile_usage(organization_id=organization_id)
+    logger.info("Uso dos planos recalculado (%d linhas)", written)
+    return written
@@ -1,20 +1,111 @@
 from __future__ import annotations
 
-from fastapi import FastAPI, Request
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Header, Request
 from fastapi.responses import JSONResponse
 
-from operant.app.api.v1 import auth, organizations, projects, tasks, users
+from operant.app.api.middleware import QueryStatsMiddleware
+from operant.app.api.v1 import auth, organizations, projects, purges, search, tasks, users
+from operant.app.core import metrics
 from operant.app.core.config import settings
-from operant.app.core.errors import DomainError
+from operant.app.core.errors import DomainError, NotFoundError, UnauthorizedError
+from operant.app.core.passwords import calibrate_bcrypt_rounds, password_hasher
+from operant.app.core.security import constant_time_equals
+from operant.app.jobs.scheduler import PeriodicJob
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    if settings.auto_create_schema:
+        from anyio import to_thread
+
+        from operant.app.db.bootstrap import create_schema
+        from operant.app.db.session import get_engine
+
+        await to_thread.run_sync(create_schema, get_engine())
+
+    if settings.password_bcrypt_target_ms > 0:
+        password_hasher.rounds = calibrate_bcrypt_rounds(
+            settings.password_bcrypt_target_ms,
+            min_rounds=settings.password_bcrypt_min_rounds,
+            max_rounds=settings.password_bcrypt_max_rounds,
+        )
+
+    jobs: list[PeriodicJob] = []
+    if settings.refresh_token_purge_interval_seconds > 0:
+        from operant.app.db.session import SessionLocal
+        from operant.app.jobs.refresh_token_purge import purge_refresh_tokens
+
+        jobs.append(
+            PeriodicJob(
+                "refresh-token-purge",
+                settings.refresh_token_purge_interval_seconds,
+                lambda: purge_refresh_tokens(SessionLocal),
+            )
+        )
+    if settings.purge_interval_seconds > 0:
+        from operant.app.db.session import SessionLocal
+        from operant.app.jobs.purge import run_purges
+
+        jobs.append(
+            PeriodicJob("purge", settings.purge_interval_seconds, lambda: run_purges(SessionLocal))
+        )
+    if settings.usage_reconcile_interval_seconds > 0:
+        from operant.app.db.session import SessionLocal
+        from operant.app.jobs.usage_reconcile import reconcile_usage
+
+        jobs.append(
+            PeriodicJob(
+                "usage-reconcile",
+                settings.usage_reconcile_interval_seconds,
+                lambda: reconcile_usage(SessionLocal),
+            )
+        )
+    for job in jobs:
+        job.start()
+
+    transport = None
+    if settings.invalidation_pg_notify:
+        from operant.app.core.cache import invalidation_bus
+        from operant.app.db.notify import PgNotifyTransport
+        from operant.app.db.session import get_engine
+
+        transport = PgNotifyTransport(invalidation_bus, get_engine())
+        transport.start()
+        invalidation_bus.transport = transport
+
+    yield
+
+    if transport is not None:
+        transport.bus.transport = None
+        transport.stop()
+    for job in jobs:
+        job.stop()
+    password_hasher.shutdown()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="Operant API", version="0.1.0")
+    app = FastAPI(title="Operant API", version="0.1.0", lifespan=lifespan)
 
     @app.get("/health")
     def health():
         return {"status": "ok", "env": settings.env}
 
+    @app.get("/metrics")
+    def get_metrics(authorization: str | None = Header(default=None)):
+        # Internal counters: hidden unless a token is configured, and then only for its bearer.
+        if not settings.metrics_token:
+            raise NotFoundError("Não encontrado")
+        expected = f"Bearer {settings.metrics_token}"
+        if authorization is None or not constant_time_equals(authorization, expected):
+            raise UnauthorizedError("Token de métricas inválido")
+        return metrics.snapshot()
+
+    if settings.query_stats_enabled:
+        app.add_middleware(QueryStatsMiddleware)
+
     @app.exception_handler(DomainError)
     async def domain_error_handler(_request: Request, exc: DomainError):
         return JSONResponse(
@@ -28,9 +119,9 @@ def create_app() -> FastAPI:
     app.include_router(organizations.router, prefix="/api/v1")
     app.include_router(projects.router, prefix="/api/v1")
     app.include_router(tasks.router, prefix="/api/v1")
+    app.include_router(search.router, prefix="/api/v1")
+    app.include_router(purges.router, prefix="/api/v1")
     return app
 
 
 app = create_app()
-
-
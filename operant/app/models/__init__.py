@@ -1,6 +1,10 @@
 from operant.app.models.membership import Membership
+from operant.app.models.org_usage import OrgUsage
 from operant.app.models.organization import Organization
+from operant.app.models.plan_limit import PlanLimit
 from operant.app.models.project import Project
+from operant.app.models.project_task_count import ProjectTaskCount
+from operant.app.models.purge_job import PurgeJob
 from operant.app.models.refresh_token import RefreshToken
 from operant.app.models.subscription import Subscription
 from operant.app.models.task import Task
@@ -8,8 +12,12 @@ from operant.app.models.user import User
 
 __all__ = [
     "Membership",
+    "OrgUsage",
     "Organization",
+    "PlanLimit",
     "Project",
+    "ProjectTaskCount",
+    "PurgeJob",
     "RefreshToken",
     "Subscription",
     "Task",
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from enum import StrEnum
+
+from sqlalchemy import ForeignKey, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from operant.app.db.base import Base
+
+
+class UsageResource(StrEnum):
+    PROJECTS = "projects"
+    USERS = "users"
+
+
+class OrgUsage(Base):
+    """How much of a plan limit an org uses, claimed and released by EntitlementService."""
+
+    __tablename__ = "org_usage"
+
+    organization_id: Mapped[UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True
+    )
+    resource: Mapped[str] = mapped_column(String(30), primary_key=True)
+    used: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from sqlalchemy import String
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from operant.app.db.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
@@ -12,8 +14,25 @@ class Organization(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     slug: Mapped[str] = mapped_column(String(80), unique=True, index=True, nullable=False)
 
-    memberships = relationship("Membership", back_populates="organization", cascade="all, delete-orphan")
-    subscription = relationship("Subscription", back_populates="organization", uselist=False, cascade="all, delete-orphan")
-    projects = relationship("Project", back_populates="organization", cascade="all, delete-orphan")
+    # Tombstone: set when offboarding is handed to the purge job (see jobs/purge.py).
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # passive_deletes: the FKs cascade in Postgres; deleting an org never loads its children.
+    memberships = relationship(
+        "Membership",
+        back_populates="organization",
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    subscription = relationship(
+        "Subscription",
+        back_populates="organization",
+        uselist=False,
+        cascade="all, delete-orphan",
+        passive_deletes=True,
+    )
+    projects = relationship(
+        "Project", back_populates="organization", cascade="all, delete-orphan", passive_deletes=True
+    )
 
 
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Integer, String, event, insert
+from sqlalchemy.orm import Mapped, mapped_column
+
+from operant.app.db.base import Base, TimestampMixin, utcnow
+from operant.app.models.subscription import Plan
+
+# The rows migration 0006 seeds, and that create_all() writes for development and tests.
+DEFAULT_PLAN_LIMITS: dict[str, dict[str, int]] = {
+    Plan.FREE.value: {"max_users": 3, "max_projects": 5, "max_import_rows": 10_000},
+    Plan.PRO.value: {"max_users": 50, "max_projects": 100, "max_import_rows": 1_000_000},
+}
+
+
+class PlanLimit(TimestampMixin, Base):
+    """What one plan allows. Edited in the database; workers pick changes up (core/entitlements.py)."""
+
+    __tablename__ = "plan_limits"
+
+    plan: Mapped[str] = mapped_column(String(20), primary_key=True)
+    max_users: Mapped[int] = mapped_column(Integer, nullable=False)
+    max_projects: Mapped[int] = mapped_column(Integer, nullable=False)
+    max_import_rows: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+
+@event.listens_for(PlanLimit.__table__, "after_create")
+def _seed_plan_limits(target, connection, **_kw) -> None:
+    now = utcnow()
+    connection.execute(
+        insert(target),
+        [
+            {"plan": plan, **limits, "created_at": now, "updated_at": now}
+            for plan, limits in DEFAULT_PLAN_LIMITS.items()
+        ],
+    )
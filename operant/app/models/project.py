@@ -1,22 +1,42 @@
 from __future__ import annotations
 
-from sqlalchemy import ForeignKey, String
-from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+
+from sqlalchemy import Computed, DateTime, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from operant.app.db.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
+from operant.app.db.base import Base, TimestampMixin, UUIDPrimaryKeyMixin, VersionMixin
+from operant.app.db.search import weighted_tsvector
 
 
-class Project(UUIDPrimaryKeyMixin, TimestampMixin, Base):
+class Project(UUIDPrimaryKeyMixin, TimestampMixin, VersionMixin, Base):
     __tablename__ = "projects"
+    # The pg_trgm GIN index on name (ILIKE search) exists only in migration 0002: it needs the
+    # extension, which bootstrap/test databases may not have.
+    __table_args__ = (
+        Index("ix_projects_org_created", "organization_id", "created_at", "id"),
+        Index("ix_projects_org_name", "organization_id", "name", "id"),
+        Index("ix_projects_search", "search_vector", postgresql_using="gin"),
+    )
 
     organization_id: Mapped[UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False, index=True
+        UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False
     )
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     description: Mapped[str | None] = mapped_column(String(2000), nullable=True)
+    # Maintained by Postgres; deferred so ordinary SELECTs do not carry it.
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR, Computed(weighted_tsvector("name", "description"), persisted=True), deferred=True
+    )
+    # Tombstone: the project is gone for the API while the purge job deletes its tasks.
+    deleted_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
 
     organization = relationship("Organization", back_populates="projects")
-    tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
+    # passive_deletes: tasks.project_id is ON DELETE CASCADE, so deleting a project is one DELETE
+    # instead of loading every task and deleting them one by one.
+    tasks = relationship(
+        "Task", back_populates="project", cascade="all, delete-orphan", passive_deletes=True
+    )
 
 
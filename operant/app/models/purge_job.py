@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from datetime import datetime
+from enum import StrEnum
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from operant.app.db.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
+
+
+class PurgeKind(StrEnum):
+    PROJECT = "project"
+    ORGANIZATION = "organization"
+
+
+class PurgeStatus(StrEnum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+
+
+class PurgeJob(UUIDPrimaryKeyMixin, TimestampMixin, Base):
+    """A project or organization being deleted in chunks by jobs/purge.py."""
+
+    __tablename__ = "purge_jobs"
+    __table_args__ = (
+        Index("ix_purge_jobs_open", "created_at", postgresql_where="status <> 'done'"),
+    )
+
+    kind: Mapped[str] = mapped_column(String(20), nullable=False)
+    # No FK: the target row is deleted by the job itself, the job row stays as the record.
+    target_id: Mapped[UUID] = mapped_column(UUID(as_uuid=True), nullable=False)
+    requested_by: Mapped[UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
+    status: Mapped[str] = mapped_column(
+        String(20), default=PurgeStatus.PENDING.value, nullable=False
+    )
+    # Tasks to delete (from the counters when the job was created) and deleted so far.
+    total_tasks: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    deleted_tasks: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -14,12 +14,6 @@ class Plan(StrEnum):
     PRO = "PRO"
 
 
-PLAN_LIMITS: dict[Plan, dict[str, int]] = {
-    Plan.FREE: {"max_users": 3, "max_projects": 5},
-    Plan.PRO: {"max_users": 50, "max_projects": 100},
-}
-
-
 class Subscription(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     __tablename__ = "subscriptions"
     __table_args__ = (UniqueConstraint("organization_id", name="uq_subscriptions_org"),)
@@ -2,11 +2,12 @@ from __future__ import annotations
 
 from enum import StrEnum
 
-from sqlalchemy import ForeignKey, String
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Computed, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
-from operant.app.db.base import Base, TimestampMixin, UUIDPrimaryKeyMixin
+from operant.app.db.base import Base, TimestampMixin, UUIDPrimaryKeyMixin, VersionMixin
+from operant.app.db.search import weighted_tsvector
 
 
 class TaskStatus(StrEnum):
@@ -15,15 +16,26 @@ class TaskStatus(StrEnum):
     DONE = "DONE"
 
 
-class Task(UUIDPrimaryKeyMixin, TimestampMixin, Base):
+class Task(UUIDPrimaryKeyMixin, TimestampMixin, VersionMixin, Base):
     __tablename__ = "tasks"
+    # One index per list shape (filter + sort); `id` last so keyset pagination can use them too.
+    __table_args__ = (
+        Index("ix_tasks_project_created", "project_id", "created_at", "id"),
+        Index("ix_tasks_project_title", "project_id", "title", "id"),
+        Index("ix_tasks_project_status_created", "project_id", "status", "created_at", "id"),
+        Index("ix_tasks_project_status_title", "project_id", "status", "title", "id"),
+        Index("ix_tasks_search", "search_vector", postgresql_using="gin"),
+    )
 
     project_id: Mapped[UUID] = mapped_column(
-        UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True
+        UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), nullable=False
     )
     title: Mapped[str] = mapped_column(String(200), nullable=False)
     description: Mapped[str | None] = mapped_column(String(2000), nullable=True)
     status: Mapped[str] = mapped_column(String(30), default=TaskStatus.TODO.value, nullable=False)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR, Computed(weighted_tsvector("title", "description"), persisted=True), deferred=True
+    )
 
     project = relationship("Project", back_populates="tasks")
 
@@ -14,7 +14,12 @@ class User(UUIDPrimaryKeyMixin, TimestampMixin, Base):
     full_name: Mapped[str | None] = mapped_column(String(200), nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
 
-    memberships = relationship("Membership", back_populates="user", cascade="all, delete-orphan")
-    refresh_tokens = relationship("RefreshToken", back_populates="user", cascade="all, delete-orphan")
+    # passive_deletes: the FKs cascade in Postgres, so deleting a user is one DELETE.
+    memberships = relationship(
+        "Membership", back_populates="user", cascade="all, delete-orphan", passive_deletes=True
+    )
+    refresh_tokens = relationship(
+        "RefreshToken", back_populates="user", cascade="all, delete-orphan", passive_deletes=True
+    )
 
 
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from sqlalchemy import func, select
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
+from operant.app.core.cursors import Keyset
 from operant.app.models.membership import Membership
+from operant.app.repositories.pagination import PageResult, TotalMode, paginate
 
 
 class MembershipRepository:
@@ -18,21 +20,42 @@ class MembershipRepository:
         )
         return self.db.execute(stmt).scalars().first()
 
-    def count_users(self, organization_id: UUID) -> int:
-        stmt = select(func.count()).select_from(Membership).where(Membership.organization_id == organization_id)
-        return int(self.db.execute(stmt).scalar_one())
-
-    def list_members(self, organization_id: UUID, *, limit: int, offset: int) -> tuple[list[Membership], int]:
-        base = select(Membership).where(Membership.organization_id == organization_id)
-        total = int(self.db.execute(select(func.count()).select_from(base.subquery())).scalar_one())
-        stmt = base.order_by(Membership.created_at.desc()).limit(limit).offset(offset)
-        items = self.db.execute(stmt).scalars().all()
-        return items, total
+    def list_members(
+        self,
+        organization_id: UUID,
+        *,
+        limit: int,
+        offset: int,
+        after: Keyset | None = None,
+        include_total: TotalMode = TotalMode.EXACT,
+    ) -> PageResult[Membership]:
+        stmt = select(Membership).where(Membership.organization_id == organization_id)
+        return paginate(
+            self.db,
+            stmt,
+            sort_col=Membership.created_at,
+            id_col=Membership.id,
+            order="desc",
+            limit=limit,
+            offset=offset,
+            after=after,
+            include_total=include_total,
+        )
 
     def create(self, *, user_id: UUID, organization_id: UUID, role: str) -> Membership:
-        membership = Membership(user_id=user_id, organization_id=organization_id, role=role)
+        membership = Membership(id=uuid4(), user_id=user_id, organization_id=organization_id, role=role)
         self.db.add(membership)
-        self.db.flush()
         return membership
 
+    def user_ids(self, organization_id: UUID) -> list[UUID]:
+        stmt = select(Membership.user_id).where(Membership.organization_id == organization_id)
+        return list(self.db.scalars(stmt))
+
+    def delete_for_org(self, organization_id: UUID) -> list[UUID]:
+        """Remove every membership of the org in one statement; returns the former members."""
+        stmt = delete(Membership).where(Membership.organization_id == organization_id).returning(
+            Membership.user_id
+        )
+        return list(self.db.scalars(stmt, execution_options={"synchronize_session": False}))
+
 
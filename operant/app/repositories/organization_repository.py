@@ -1,12 +1,15 @@
 from __future__ import annotations
 
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from operant.app.core.cursors import Keyset
+from operant.app.db.base import utcnow
 from operant.app.models.membership import Membership
 from operant.app.models.organization import Organization
+from operant.app.repositories.pagination import PageResult, TotalMode, paginate
 
 
 class OrganizationRepository:
@@ -14,27 +17,51 @@ class OrganizationRepository:
         self.db = db
 
     def get(self, org_id: UUID) -> Organization | None:
-        return self.db.get(Organization, org_id)
+        """The organization, or None when it does not exist or is being offboarded."""
+        org = self.db.get(Organization, org_id)
+        return org if org is not None and org.deleted_at is None else None
 
     def get_by_slug(self, slug: str) -> Organization | None:
         stmt = select(Organization).where(Organization.slug == slug)
         return self.db.execute(stmt).scalars().first()
 
-    def list_for_user(self, user_id: UUID, *, limit: int, offset: int) -> tuple[list[Organization], int]:
-        base = (
+    def list_for_user(
+        self,
+        user_id: UUID,
+        *,
+        limit: int,
+        offset: int,
+        after: Keyset | None = None,
+        include_total: TotalMode = TotalMode.EXACT,
+    ) -> PageResult[Organization]:
+        stmt = (
             select(Organization)
             .join(Membership, Membership.organization_id == Organization.id)
             .where(Membership.user_id == user_id)
         )
-        total = int(self.db.execute(select(func.count()).select_from(base.subquery())).scalar_one())
-        stmt = base.order_by(Organization.created_at.desc()).limit(limit).offset(offset)
-        items = self.db.execute(stmt).scalars().all()
-        return items, total
+        return paginate(
+            self.db,
+            stmt,
+            sort_col=Organization.created_at,
+            id_col=Organization.id,
+            order="desc",
+            limit=limit,
+            offset=offset,
+            after=after,
+            include_total=include_total,
+        )
 
     def create(self, *, name: str, slug: str) -> Organization:
-        org = Organization(name=name, slug=slug)
+        org = Organization(id=uuid4(), name=name, slug=slug)
         self.db.add(org)
-        self.db.flush()
+        return org
+
+    def delete(self, org: Organization) -> None:
+        # One DELETE: memberships, subscription, projects and their tasks cascade in Postgres.
+        self.db.delete(org)
+
+    def tombstone(self, org: Organization) -> Organization:
+        org.deleted_at = utcnow()
         return org
 
 
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any, Generic, TypeVar
+
+from sqlalchemy import Select, func, literal, select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+from operant.app.core.config import settings
+from operant.app.core.cursors import Keyset
+
+T = TypeVar("T")
+
+
+class TotalMode(StrEnum):
+    EXACT = "exact"  # count(*) OVER () in the page query itself
+    ESTIMATE = "estimate"  # count capped at settings.list_count_cap ("10000+")
+    NONE = "none"  # no count at all; clients use next_cursor / has_more
+
+
+@dataclass(frozen=True)
+class PageResult(Generic[T]):
+    items: list[T]
+    total: int | None
+    # Position of the last item when more rows follow; None on the last page.
+    next_key: Keyset | None
+    # True when `total` is the cap of an ESTIMATE count and more rows exist.
+    total_capped: bool = False
+    # (max(version_col), count) over the whole filtered set, when the page query could work it out
+    # (exact totals on offset pages); list ETags are derived from it.
+    version: tuple[Any, int] | None = None
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_key is not None
+
+
+def paginate(
+    db: Session,
+    stmt: Select[Any],
+    *,
+    sort_col: InstrumentedAttribute[Any],
+    id_col: InstrumentedAttribute[Any],
+    order: str,
+    limit: int,
+    offset: int = 0,
+    after: Keyset | None = None,
+    include_total: TotalMode = TotalMode.EXACT,
+    version_col: InstrumentedAttribute[Any] | None = None,
+) -> PageResult[Any]:
+    """
+    Sort `stmt` by (`sort_col`, `id_col`) and fetch one page.
+
+    With `after`, the page starts right past that key with `WHERE (sort_col, id) < / > (:v, :id)`,
+    which an index on (filter..., sort_col, id) answers by seeking, so page 10,000 costs the same
+    as page 1. Without it, plain LIMIT/OFFSET (kept for existing clients).
+
+    With `version_col`, windowed pages also carry max(version_col) over the filtered set.
+    """
+    filtered = stmt
+    total: int | None = None
+    total_capped = False
+    if include_total is TotalMode.ESTIMATE:
+        cap = settings.list_count_cap
+        total = _count(db, filtered.limit(cap + 1))
+        total_capped = total > cap
+        total = min(total, cap)
+
+    descending = order.lower() == "desc"
+    if after is not None:
+        key = tuple_(sort_col, id_col)
+        bound = tuple_(literal(after.value, sort_col.type), literal(after.id, id_col.type))
+        stmt = stmt.where(key < bound if descending else key > bound)
+    elif offset:
+        stmt = stmt.offset(offset)
+    ordering = (sort_col.desc(), id_col.desc()) if descending else (sort_col.asc(), id_col.asc())
+    stmt = stmt.order_by(*ordering).limit(limit + 1)  # one extra row tells whether a next page exists
+
+    # The window runs before LIMIT but after the keyset predicate, so it only gives the full total
+    # on offset pages; cursor pages (or an offset past the end) count separately.
+    windowed = include_total is TotalMode.EXACT and after is None
+    version = None
+    if windowed:
+        windows = [func.count().over().label("total")]
+        if version_col is not None:
+            windows.append(func.max(version_col).over().label("version"))
+        result = db.execute(stmt.add_columns(*windows)).all()
+        rows = [row[0] for row in result]
+        if result:
+            total = int(result[0].total)
+            version = (result[0].version, total) if version_col is not None else None
+        elif not offset:
+            total = 0
+            version = (None, 0) if version_col is not None else None
+    else:
+        rows = list(db.execute(stmt).scalars().all())
+    if include_total is TotalMode.EXACT and total is None:
+        total = _count(db, filtered)
+
+    next_key = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_key = Keyset(value=getattr(last, sort_col.key), id=getattr(last, id_col.key))
+    return PageResult(
+        items=rows, total=total, next_key=next_key, total_capped=total_capped, version=version
+    )
+
+
+def _count(db: Session, stmt: Select[Any]) -> int:
+    return int(db.execute(select(func.count()).select_from(stmt.subquery())).scalar_one())
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from operant.app.models.plan_limit import PlanLimit
+
+
+class PlanLimitRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def list_all(self) -> Sequence[PlanLimit]:
+        return self.db.execute(select(PlanLimit)).scalars().all()
+
+
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-from uuid import UUID
+from datetime import datetime
+from typing import Any
+from uuid import UUID, uuid4
 
-from sqlalchemy import func, select
+from sqlalchemy import Select, delete, func, select, update
 from sqlalchemy.orm import Session
 
+from operant.app.core.cursors import Keyset
+from operant.app.db.base import utcnow
 from operant.app.models.project import Project
+from operant.app.repositories.pagination import PageResult, TotalMode, paginate
 
 
 class ProjectRepository:
@@ -13,11 +18,17 @@ class ProjectRepository:
         self.db = db
 
     def get(self, project_id: UUID) -> Project | None:
-        return self.db.get(Project, project_id)
+        """The project, or None when it does not exist or is tombstoned for purging."""
+        project = self.db.get(Project, project_id)
+        return project if project is not None and project.deleted_at is None else None
 
-    def count_for_org(self, organization_id: UUID) -> int:
-        stmt = select(func.count()).select_from(Project).where(Project.organization_id == organization_id)
-        return int(self.db.execute(stmt).scalar_one())
+    def version(self, project_id: UUID) -> tuple[UUID, int, datetime] | None:
+        """(organization_id, version, updated_at) of a live project, without loading the row."""
+        stmt = select(Project.organization_id, Project.version, Project.updated_at).where(
+            Project.id == project_id, Project.deleted_at.is_(None)
+        )
+        row = self.db.execute(stmt).first()
+        return (row.organization_id, row.version, row.updated_at) if row else None
 
     def list_for_org(
         self,
@@ -28,35 +39,81 @@ class ProjectRepository:
         order: str,
         limit: int,
         offset: int,
-    ) -> tuple[list[Project], int]:
-        stmt = select(Project).where(Project.organization_id == organization_id)
+        after: Keyset | None = None,
+        include_total: TotalMode = TotalMode.EXACT,
+    ) -> PageResult[Project]:
+        sort_col = Project.created_at if sort == "created_at" else Project.name
+        return paginate(
+            self.db,
+            self._filtered(organization_id, q),
+            sort_col=sort_col,
+            id_col=Project.id,
+            order=order,
+            limit=limit,
+            offset=offset,
+            after=after,
+            include_total=include_total,
+            version_col=Project.updated_at,
+        )
+
+    @staticmethod
+    def _filtered(organization_id: UUID, q: str | None) -> Select[Any]:
+        stmt = select(Project).where(
+            Project.organization_id == organization_id, Project.deleted_at.is_(None)
+        )
         if q:
             stmt = stmt.where(Project.name.ilike(f"%{q}%"))
+        return stmt
 
-        total = int(self.db.execute(select(func.count()).select_from(stmt.subquery())).scalar_one())
+    def list_version(self, organization_id: UUID, *, q: str | None) -> tuple[datetime | None, int]:
+        """(max(updated_at), count) of the projects a list would page through."""
+        filtered = self._filtered(organization_id, q).subquery()
+        latest, count = self.db.execute(select(func.max(filtered.c.updated_at), func.count())).one()
+        return latest, int(count)
 
-        sort_col = Project.created_at if sort == "created_at" else Project.name
-        sort_col = sort_col.desc() if order.lower() == "desc" else sort_col.asc()
-        stmt = stmt.order_by(sort_col).limit(limit).offset(offset)
-        items = self.db.execute(stmt).scalars().all()
-        return items, total
+    def export_query(self, organization_id: UUID) -> Select[Any]:
+        return (
+            select(Project.id, Project.name, Project.description, Project.created_at, Project.updated_at)
+            .where(Project.organization_id == organization_id, Project.deleted_at.is_(None))
+            .order_by(Project.created_at, Project.id)
+        )
 
     def create(self, *, organization_id: UUID, name: str, description: str | None) -> Project:
-        project = Project(organization_id=organization_id, name=name, description=description)
+        project = Project(id=uuid4(), organization_id=organization_id, name=name, description=description)
         self.db.add(project)
-        self.db.flush()
         return project
 
-    def update(self, project: Project, *, name: str | None, description: str | None) -> Project:
-        if name is not None:
-            project.name = name
-        if description is not None:
-            project.description = description
-        self.db.flush()
-        return project
+    def update(
+        self, project_id: UUID, *, changes: dict[str, Any], versions: frozenset[int] | None = None
+    ) -> Project | None:
+        """
+        Apply `changes` to a live project, only while its version is one of `versions` when given:
+        the conditional UPDATE is the If-Match check. None when nothing matched.
+        """
+        stmt = update(Project).where(Project.id == project_id, Project.deleted_at.is_(None))
+        if versions is not None:
+            stmt = stmt.where(Project.version.in_(versions))
+        stmt = stmt.values(**changes, version=Project.version + 1, updated_at=utcnow())
+        return self.db.execute(
+            stmt.returning(Project),
+            execution_options={"synchronize_session": False, "populate_existing": True},
+        ).scalar_one_or_none()
+
+    def delete(self, project: Project) -> bool:
+        """
+        One DELETE: tasks and counters go with it through ON DELETE CASCADE. False when a
+        concurrent request deleted or tombstoned the project first.
+        """
+        stmt = delete(Project).where(Project.id == project.id, Project.deleted_at.is_(None))
+        return self.db.execute(stmt).rowcount == 1
 
-    def delete(self, project: Project) -> None:
-        self.db.delete(project)
-        self.db.flush()
+    def tombstone(self, project: Project) -> bool:
+        """Hide the project from the API until its purge job deletes it; False as for `delete`."""
+        stmt = (
+            update(Project)
+            .where(Project.id == project.id, Project.deleted_at.is_(None))
+            .values(deleted_at=utcnow())
+        )
+        return self.db.execute(stmt).rowcount == 1
 
 
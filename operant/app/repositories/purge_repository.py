@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from uuid import UUID, uuid4
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from operant.app.models.organization import Organization
+from operant.app.models.project import Project
+from operant.app.models.purge_job import PurgeJob, PurgeKind, PurgeStatus
+from operant.app.models.task import Task
+
+
+class PurgeRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, job_id: UUID) -> PurgeJob | None:
+        return self.db.get(PurgeJob, job_id)
+
+    def create(
+        self, *, kind: PurgeKind, target_id: UUID, requested_by: UUID | None, total_tasks: int
+    ) -> PurgeJob:
+        job = PurgeJob(
+            id=uuid4(),
+            kind=kind.value,
+            target_id=target_id,
+            requested_by=requested_by,
+            status=PurgeStatus.PENDING.value,
+            total_tasks=total_tasks,
+            deleted_tasks=0,
+        )
+        self.db.add(job)
+        return job
+
+    def claim_next(self) -> PurgeJob | None:
+        """Oldest unfinished job, row-locked; jobs locked by another worker are skipped."""
+        stmt = (
+            select(PurgeJob)
+            .where(PurgeJob.status != PurgeStatus.DONE.value)
+            .order_by(PurgeJob.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        return self.db.execute(stmt).scalars().first()
+
+    def delete_tasks_batch(self, job: PurgeJob, *, limit: int) -> int:
+        """Delete up to `limit` of the target's tasks; returns how many went."""
+        if job.kind == PurgeKind.PROJECT.value:
+            scope = Task.project_id == job.target_id
+        else:
+            org_projects = select(Project.id).where(Project.organization_id == job.target_id)
+            scope = Task.project_id.in_(org_projects)
+        # Counters are left alone: they belong to tombstoned projects and cascade with them.
+        victims = select(Task.id).where(scope).limit(limit).scalar_subquery()
+        result = self.db.execute(
+            delete(Task).where(Task.id.in_(victims)),
+            execution_options={"synchronize_session": False},
+        )
+        return result.rowcount
+
+    def delete_target(self, job: PurgeJob) -> None:
+        # Whatever is left (counters; or memberships, subscription and now empty projects)
+        # goes through ON DELETE CASCADE.
+        model = Project if job.kind == PurgeKind.PROJECT.value else Organization
+        self.db.execute(
+            delete(model).where(model.id == job.target_id),
+            execution_options={"synchronize_session": False},
+        )
@@ -3,11 +3,13 @@ from __future__ import annotations
 from datetime import datetime
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import delete, func, select, text, update
 from sqlalchemy.orm import Session
 
 from operant.app.models.refresh_token import RefreshToken
 
+PURGE_ADVISORY_LOCK_ID = 0x0F_5A_70_01
+
 
 class RefreshTokenRepository:
     def __init__(self, db: Session):
@@ -26,22 +28,79 @@ class RefreshTokenRepository:
     ) -> RefreshToken:
         rt = RefreshToken(id=token_id, user_id=user_id, fingerprint_hash=fingerprint_hash, expires_at=expires_at)
         self.db.add(rt)
-        self.db.flush()
         return rt
 
     def revoke(self, token: RefreshToken, *, revoked_at: datetime, replaced_by: UUID | None) -> RefreshToken:
         token.revoked_at = revoked_at
         token.replaced_by = replaced_by
-        self.db.flush()
         return token
 
+    def revoke_active(
+        self,
+        token_id: UUID,
+        *,
+        user_id: UUID,
+        fingerprint_hash: str,
+        revoked_at: datetime,
+        replaced_by: UUID | None,
+    ) -> UUID | None:
+        """
+        Atomically revoke a live token in a single conditional UPDATE.
+
+        Returns the token id, or None when no row matched (unknown, foreign, already revoked or
+        expired). Concurrent callers serialize on the row lock, so only one of them can win.
+        """
+        stmt = (
+            update(RefreshToken)
+            .where(
+                RefreshToken.id == token_id,
+                RefreshToken.user_id == user_id,
+                RefreshToken.fingerprint_hash == fingerprint_hash,
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at > revoked_at,
+            )
+            .values(revoked_at=revoked_at, replaced_by=replaced_by)
+            .returning(RefreshToken.id)
+            .execution_options(synchronize_session=False)
+        )
+        return self.db.execute(stmt).scalar_one_or_none()
+
     def revoke_all_for_user(self, user_id: UUID, *, revoked_at: datetime) -> int:
-        # Conservative: load and update (keeps it simple/portable)
-        stmt = select(RefreshToken).where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
-        tokens = self.db.execute(stmt).scalars().all()
-        for t in tokens:
-            t.revoked_at = revoked_at
-        self.db.flush()
-        return len(tokens)
+        stmt = (
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=revoked_at)
+        )
+        return self.db.execute(stmt).rowcount
+
+    def try_lock_purge(self) -> bool:
+        # Transaction-scoped advisory lock: one janitor at a time across all workers.
+        stmt = select(func.pg_try_advisory_xact_lock(text(str(PURGE_ADVISORY_LOCK_ID))))
+        return bool(self.db.execute(stmt).scalar_one())
+
+    def purge_expired_batch(self, *, now: datetime, limit: int) -> int:
+        # Walks ix_refresh_tokens_expires_at from the oldest entry.
+        doomed = (
+            select(RefreshToken.id)
+            .where(RefreshToken.expires_at < now)
+            .order_by(RefreshToken.expires_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return self._delete_ids(doomed)
 
+    def purge_revoked_batch(self, *, revoked_before: datetime, limit: int) -> int:
+        doomed = (
+            select(RefreshToken.id)
+            .where(RefreshToken.revoked_at < revoked_before)
+            .order_by(RefreshToken.expires_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return self._delete_ids(doomed)
 
+    def _delete_ids(self, ids_stmt) -> int:
+        stmt = delete(RefreshToken).where(RefreshToken.id.in_(ids_stmt)).execution_options(
+            synchronize_session=False
+        )
+        return self.db.execute(stmt).rowcount
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import html
+from dataclasses import dataclass
+from uuid import UUID
+
+from sqlalchemy import REAL, cast, func, literal, select, tuple_, union_all
+from sqlalchemy.orm import Session
+
+from operant.app.core.cursors import Keyset
+from operant.app.db.search import SEARCH_CONFIG
+from operant.app.models.project import Project
+from operant.app.models.task import Task
+from operant.app.repositories.pagination import PageResult
+
+# ts_headline marks matches with these; the text around them is HTML-escaped before <mark> goes in.
+_START_SEL, _STOP_SEL = "\x02", "\x03"
+
+
+def _html_headline(headline: str) -> str:
+    return html.escape(headline).replace(_START_SEL, "<mark>").replace(_STOP_SEL, "</mark>")
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    kind: str  # "project" | "task"
+    id: UUID
+    project_id: UUID
+    title: str
+    headline: str
+    rank: float
+
+
+class SearchRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def search(
+        self, organization_id: UUID, *, tsquery: str, limit: int, after: Keyset | None = None
+    ) -> PageResult[SearchHit]:
+        """
+        Projects and tasks of the org whose search vector matches `tsquery`, best rank first.
+
+        Both sides are answered by the GIN indexes on `search_vector` (tasks further narrowed to
+        the org's projects through ix_tasks_project_*). ts_rank only reads the stored vector;
+        ts_headline, which re-parses the text, runs on the page rows alone.
+        """
+        query = func.to_tsquery(SEARCH_CONFIG, tsquery)
+        org_projects = select(Project.id).where(
+            Project.organization_id == organization_id, Project.deleted_at.is_(None)
+        )
+        projects = select(
+            literal("project").label("kind"),
+            Project.id.label("id"),
+            Project.id.label("project_id"),
+            Project.name.label("title"),
+            Project.description.label("description"),
+            func.ts_rank(Project.search_vector, query).label("rank"),
+        ).where(
+            Project.organization_id == organization_id,
+            Project.deleted_at.is_(None),
+            Project.search_vector.op("@@")(query),
+        )
+        tasks = select(
+            literal("task").label("kind"),
+            Task.id.label("id"),
+            Task.project_id.label("project_id"),
+            Task.title.label("title"),
+            Task.description.label("description"),
+            func.ts_rank(Task.search_vector, query).label("rank"),
+        ).where(Task.project_id.in_(org_projects), Task.search_vector.op("@@")(query))
+        hits = union_all(projects, tasks).subquery("hits")
+
+        page = select(hits)
+        if after is not None:
+            # The bound parameter arrives as float8/numeric; compared that way a real rank equal to
+            # the cursor's is still "less", and the same page would come back forever.
+            bound = tuple_(cast(literal(after.value), REAL), literal(after.id, hits.c.id.type))
+            page = page.where(tuple_(hits.c.rank, hits.c.id) < bound)
+        page = page.order_by(hits.c.rank.desc(), hits.c.id.desc()).limit(limit + 1).subquery("page")
+
+        # Stray marker characters in the text itself are dropped, so only real matches get <mark>.
+        document = func.translate(
+            func.concat_ws(" ", page.c.title, page.c.description), _START_SEL + _STOP_SEL, ""
+        )
+        options = f"StartSel={_START_SEL}, StopSel={_STOP_SEL}, MaxFragments=2"
+        stmt = select(
+            page.c.kind,
+            page.c.id,
+            page.c.project_id,
+            page.c.title,
+            func.ts_headline(SEARCH_CONFIG, document, query, options).label("headline"),
+            page.c.rank,
+        ).order_by(page.c.rank.desc(), page.c.id.desc())
+        rows = [
+            SearchHit(**{**row._mapping, "headline": _html_headline(row.headline)})
+            for row in self.db.execute(stmt)
+        ]
+
+        next_key = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_key = Keyset(value=rows[-1].rank, id=rows[-1].id)
+        return PageResult(items=rows, total=None, next_key=next_key)
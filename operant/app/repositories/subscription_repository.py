@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
@@ -17,9 +17,8 @@ class SubscriptionRepository:
         return self.db.execute(stmt).scalars().first()
 
     def create(self, *, organization_id: UUID, plan: str) -> Subscription:
-        sub = Subscription(organization_id=organization_id, plan=plan)
+        sub = Subscription(id=uuid4(), organization_id=organization_id, plan=plan)
         self.db.add(sub)
-        self.db.flush()
         return sub
 
     def set_plan(self, organization_id: UUID, plan: str) -> Subscription:
@@ -28,7 +27,6 @@ class SubscriptionRepository:
             sub = self.create(organization_id=organization_id, plan=plan)
         else:
             sub.plan = plan
-            self.db.flush()
         return sub
 
 
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from operant.app.models.project import Project
+from operant.app.models.project_task_count import ProjectTaskCount
+from operant.app.models.task import Task
+
+
+class TaskCountRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply_delta(self, project_id: UUID, status: str, delta: int) -> None:
+        # Single upsert: the row lock serialises concurrent writers on the same (project, status)
+        # without a read-modify-write race, and it commits or rolls back with the task change.
+        stmt = insert(ProjectTaskCount).values(project_id=project_id, status=status, count=delta)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProjectTaskCount.project_id, ProjectTaskCount.status],
+            set_={"count": ProjectTaskCount.count + stmt.excluded.count},
+        )
+        self.db.execute(stmt)
+
+    def for_project(self, project_id: UUID) -> dict[str, int]:
+        stmt = select(ProjectTaskCount.status, ProjectTaskCount.count).where(
+            ProjectTaskCount.project_id == project_id
+        )
+        return {status: int(count) for status, count in self.db.execute(stmt)}
+
+    def for_org(self, organization_id: UUID) -> tuple[dict[str, int], int]:
+        """Counts summed over the org's projects, plus the number of projects."""
+        stmt = (
+            select(ProjectTaskCount.status, func.sum(ProjectTaskCount.count))
+            .join(Project, Project.id == ProjectTaskCount.project_id)
+            .where(Project.organization_id == organization_id, Project.deleted_at.is_(None))
+            .group_by(ProjectTaskCount.status)
+        )
+        counts = {status: int(total) for status, total in self.db.execute(stmt)}
+        projects = self.db.execute(
+            select(func.count())
+            .select_from(Project)
+            .where(Project.organization_id == organization_id, Project.deleted_at.is_(None))
+        ).scalar_one()
+        return counts, int(projects)
+
+    def total_for_project(self, project_id: UUID) -> int:
+        stmt = select(func.coalesce(func.sum(ProjectTaskCount.count), 0)).where(
+            ProjectTaskCount.project_id == project_id
+        )
+        return int(self.db.execute(stmt).scalar_one())
+
+    def total_for_org(self, organization_id: UUID) -> int:
+        """Tasks across every project of the org, tombstoned ones included."""
+        stmt = (
+            select(func.coalesce(func.sum(ProjectTaskCount.count), 0))
+            .join(Project, Project.id == ProjectTaskCount.project_id)
+            .where(Project.organization_id == organization_id)
+        )
+        return int(self.db.execute(stmt).scalar_one())
+
+    def recompute(self, project_id: UUID | None = None) -> int:
+        """Rebuild counters from `tasks` (one project, or all); returns the number of rows written."""
+        # A writer's delta either got in before this lock (its transaction then has to commit
+        # before we get the lock, and the SELECT below sees its task change) or waits for our
+        # commit (its change was invisible to the SELECT, and it lands on the rebuilt row). No
+        # delta lands between the DELETE and the INSERT.
+        self.db.execute(text("LOCK TABLE project_task_counts IN SHARE ROW EXCLUSIVE MODE"))
+        target = delete(ProjectTaskCount)
+        source = select(Task.project_id, Task.status, func.count()).group_by(Task.project_id, Task.status)
+        if project_id is not None:
+            target = target.where(ProjectTaskCount.project_id == project_id)
+            source = source.where(Task.project_id == project_id)
+        self.db.execute(target)
+        result = self.db.execute(
+            insert(ProjectTaskCount).from_select(
+                [ProjectTaskCount.project_id, ProjectTaskCount.status, ProjectTaskCount.count], source
+            )
+        )
+        return result.rowcount
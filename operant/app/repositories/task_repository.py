@@ -1,11 +1,43 @@
 from __future__ import annotations
 
-from uuid import UUID
+import io
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+from uuid import UUID, uuid4
 
-from sqlalchemy import func, select
+from sqlalchemy import Select, func, insert, select, text, tuple_, update
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import Session
+from sqlalchemy.util import await_
 
+from operant.app.core.cursors import Keyset
+from operant.app.db.base import utcnow
+from operant.app.models.project import Project
 from operant.app.models.task import Task
+from operant.app.repositories.pagination import PageResult, TotalMode, paginate
+
+IMPORT_STAGING_TABLE = "task_import_staging"
+IMPORT_STAGING_COLUMNS = ("line", "title", "description", "status")
+
+
+def _copy_csv(rows: Sequence[Sequence[Any]]) -> io.StringIO:
+    # COPY's CSV dialect: NULL is an unquoted empty field, so every value is quoted and None is not.
+    def field(value: Any) -> str:
+        if value is None:
+            return ""
+        return '"' + str(value).replace('"', '""') + '"'
+
+    return io.StringIO("".join(",".join(map(field, row)) + "\n" for row in rows))
+
+
+@dataclass(frozen=True)
+class UpdatedTask:
+    project_id: UUID
+    previous_status: str
+    status: str
+    task: Task | None = None
 
 
 class TaskRepository:
@@ -15,6 +47,12 @@ class TaskRepository:
     def get(self, task_id: UUID) -> Task | None:
         return self.db.get(Task, task_id)
 
+    def version(self, task_id: UUID) -> tuple[UUID, int, datetime] | None:
+        """(project_id, version, updated_at) of a task: what a conditional GET needs, without the row."""
+        stmt = select(Task.project_id, Task.version, Task.updated_at).where(Task.id == task_id)
+        row = self.db.execute(stmt).first()
+        return (row.project_id, row.version, row.updated_at) if row else None
+
     def list_for_project(
         self,
         project_id: UUID,
@@ -24,37 +62,180 @@ class TaskRepository:
         order: str,
         limit: int,
         offset: int,
-    ) -> tuple[list[Task], int]:
+        after: Keyset | None = None,
+        include_total: TotalMode = TotalMode.EXACT,
+    ) -> PageResult[Task]:
+        sort_col = Task.created_at if sort == "created_at" else Task.title
+        return paginate(
+            self.db,
+            self._filtered(project_id, status),
+            sort_col=sort_col,
+            id_col=Task.id,
+            order=order,
+            limit=limit,
+            offset=offset,
+            after=after,
+            include_total=include_total,
+            version_col=Task.updated_at,
+        )
+
+    @staticmethod
+    def _filtered(project_id: UUID, status: str | None) -> Select[Any]:
         stmt = select(Task).where(Task.project_id == project_id)
         if status:
             stmt = stmt.where(Task.status == status)
+        return stmt
 
-        total = int(self.db.execute(select(func.count()).select_from(stmt.subquery())).scalar_one())
+    def list_version(self, project_id: UUID, *, status: str | None) -> tuple[datetime | None, int]:
+        """(max(updated_at), count) of the tasks a list would page through."""
+        filtered = self._filtered(project_id, status).subquery()
+        stmt = select(func.max(filtered.c.updated_at), func.count())
+        latest, count = self.db.execute(stmt).one()
+        return latest, int(count)
 
-        sort_col = Task.created_at if sort == "created_at" else Task.title
-        sort_col = sort_col.desc() if order.lower() == "desc" else sort_col.asc()
-        stmt = stmt.order_by(sort_col).limit(limit).offset(offset)
-        items = self.db.execute(stmt).scalars().all()
-        return items, total
+    def export_query(self, project_id: UUID) -> Select[Any]:
+        # Plain columns, not the entity: the export streams tuples without building Task objects.
+        return (
+            select(Task.id, Task.title, Task.description, Task.status, Task.created_at, Task.updated_at)
+            .where(Task.project_id == project_id)
+            .order_by(Task.created_at, Task.id)
+        )
 
     def create(self, *, project_id: UUID, title: str, description: str | None, status: str) -> Task:
-        task = Task(project_id=project_id, title=title, description=description, status=status)
+        task = Task(id=uuid4(), project_id=project_id, title=title, description=description, status=status)
         self.db.add(task)
-        self.db.flush()
         return task
 
-    def update(self, task: Task, *, title: str | None, description: str | None, status: str | None) -> Task:
-        if title is not None:
-            task.title = title
-        if description is not None:
-            task.description = description
+    def create_many(self, *, project_id: UUID, rows: list[dict[str, Any]]) -> list[Task]:
+        """One multi-row INSERT ... RETURNING (split by insertmanyvalues past ~1000 rows), in input order."""
+        stmt = insert(Task).returning(Task, sort_by_parameter_order=True)
+        params = [{"id": uuid4(), "project_id": project_id, **row} for row in rows]
+        return list(self.db.scalars(stmt, params))
+
+    def update(
+        self, task_id: UUID, *, changes: dict[str, Any], versions: frozenset[int] | None = None
+    ) -> UpdatedTask | None:
+        """
+        Apply `changes` to one task, only while its version is one of `versions` when given: the
+        conditional UPDATE is the If-Match check. None when nothing matched.
+        """
+        target = select(Task.id, Task.status).where(Task.id == task_id)
+        if versions is not None:
+            target = target.where(Task.version.in_(versions))
+        rows = self._update_locked(target, changes, return_rows=True)
+        return rows[0] if rows else None
+
+    def update_many(
+        self,
+        *,
+        organization_id: UUID,
+        ids: list[UUID] | None,
+        project_id: UUID | None,
+        status: str | None,
+        changes: dict[str, Any],
+        versions: dict[UUID, int] | None = None,
+        return_rows: bool = False,
+    ) -> list[UpdatedTask]:
+        """
+        One `UPDATE tasks ... FROM (SELECT ... FOR UPDATE)`, restricted to the org's projects and,
+        with `versions`, to the tasks still at the version given for their id.
+
+        The CTE locks the targets in id order, so overlapping batches queue instead of deadlocking,
+        and hands back each task's status from before the update (for the counters).
+        """
+        target = (
+            select(Task.id, Task.status)
+            .join(Project, Project.id == Task.project_id)
+            .where(Project.organization_id == organization_id)
+        )
+        if ids is not None:
+            target = target.where(Task.id.in_(ids))
+        if project_id is not None:
+            target = target.where(Task.project_id == project_id)
         if status is not None:
-            task.status = status
-        self.db.flush()
-        return task
+            target = target.where(Task.status == status)
+        if versions is not None:
+            target = target.where(tuple_(Task.id, Task.version).in_(list(versions.items())))
+        return self._update_locked(target, changes, return_rows=return_rows)
+
+    def _update_locked(
+        self, target: Select[Any], changes: dict[str, Any], *, return_rows: bool
+    ) -> list[UpdatedTask]:
+        # A row a concurrent writer changed is re-checked against `target` once its lock is free
+        # (READ COMMITTED), so a version condition cannot pass on a stale read.
+        locked = target.order_by(Task.id).with_for_update(of=Task).cte("locked")
+        stmt = (
+            update(Task)
+            .where(Task.id == locked.c.id)
+            .values(**changes, version=Task.version + 1, updated_at=utcnow())
+        )
+        # populate_existing: a task already in the session (loaded for the org check) gets the
+        # new values too.
+        options = {"synchronize_session": False, "populate_existing": True}
+        if return_rows:
+            result = self.db.execute(stmt.returning(Task, locked.c.status), execution_options=options)
+            return [UpdatedTask(task.project_id, previous, task.status, task) for task, previous in result]
+        result = self.db.execute(
+            stmt.returning(Task.project_id, locked.c.status, Task.status), execution_options=options
+        )
+        return [UpdatedTask(project, previous, current) for project, previous, current in result]
 
     def delete(self, task: Task) -> None:
         self.db.delete(task)
-        self.db.flush()
+
+    def create_import_staging(self) -> None:
+        # Private to this transaction and dropped at its end: nothing outlives the import, and it
+        # stays correct behind pgbouncer in transaction mode.
+        self.db.execute(
+            text(
+                f"CREATE TEMP TABLE IF NOT EXISTS {IMPORT_STAGING_TABLE} ("
+                "line integer NOT NULL, title text NOT NULL, description text, status text NOT NULL"
+                ") ON COMMIT DROP"
+            )
+        )
+
+    def copy_to_staging(self, rows: Sequence[tuple[int, str, str | None, str]]) -> None:
+        """Send (line, title, description, status) rows to the staging table: COPY FROM STDIN."""
+        driver = self.db.connection().connection.driver_connection
+        if self.db.get_bind().dialect.driver == "asyncpg":
+            from asyncpg import PostgresError
+
+            # Inside run_sync: awaited on the session's greenlet, like SQLAlchemy's own I/O.
+            try:
+                await_(
+                    driver.copy_records_to_table(
+                        IMPORT_STAGING_TABLE, records=rows, columns=IMPORT_STAGING_COLUMNS
+                    )
+                )
+            except PostgresError as e:  # raw driver errors are wrapped as SQLAlchemy would
+                raise DBAPIError(f"COPY {IMPORT_STAGING_TABLE}", None, e) from e
+            return
+
+        from psycopg2 import Error as Psycopg2Error
+
+        columns = ", ".join(IMPORT_STAGING_COLUMNS)
+        copy = f"COPY {IMPORT_STAGING_TABLE} ({columns}) FROM STDIN WITH (FORMAT csv)"
+        try:
+            with driver.cursor() as cursor:
+                cursor.copy_expert(copy, _copy_csv(rows))
+        except Psycopg2Error as e:
+            raise DBAPIError(copy, None, e) from e
+
+    def insert_from_staging(self, project_id: UUID) -> int:
+        """Move the staged rows into `tasks` with one INSERT ... SELECT, then empty the staging."""
+        # clock_timestamp() is read above the sort, row by row: file order is created_at order.
+        result = self.db.execute(
+            text(
+                "INSERT INTO tasks "
+                "(id, project_id, title, description, status, created_at, updated_at) "
+                "SELECT gen_random_uuid(), :project_id, title, description, status, ts, ts FROM ("
+                "  SELECT title, description, status, clock_timestamp() AS ts"
+                f"  FROM (SELECT * FROM {IMPORT_STAGING_TABLE} ORDER BY line) ordered"
+                ") staged"
+            ),
+            {"project_id": project_id},
+        )
+        self.db.execute(text(f"TRUNCATE {IMPORT_STAGING_TABLE}"))
+        return result.rowcount
 
 
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from sqlalchemy import delete, func, literal, select, text, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from operant.app.models.membership import Membership
+from operant.app.models.org_usage import OrgUsage, UsageResource
+from operant.app.models.project import Project
+
+
+class UsageRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def claim(self, organization_id: UUID, resource: str, limit: int) -> bool:
+        """
+        Take one unit of `resource` if the org uses fewer than `limit`; False when it is full.
+
+        A single conditional upsert: concurrent claims on the same row queue on its lock and each
+        re-checks `used < limit` against the committed value, so two requests can never both take
+        the last slot. Other orgs and resources are not blocked.
+        """
+        if limit <= 0:
+            return False
+        stmt = insert(OrgUsage).values(organization_id=organization_id, resource=resource, used=1)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[OrgUsage.organization_id, OrgUsage.resource],
+            set_={"used": OrgUsage.used + 1},
+            where=OrgUsage.used < limit,
+        ).returning(OrgUsage.used)
+        return self.db.execute(stmt).first() is not None
+
+    def add(self, organization_id: UUID, resource: str, delta: int) -> None:
+        """Unconditional change of `used` (a release, or the slot an org's creator holds)."""
+        stmt = insert(OrgUsage).values(
+            organization_id=organization_id, resource=resource, used=max(delta, 0)
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[OrgUsage.organization_id, OrgUsage.resource],
+            set_={"used": func.greatest(OrgUsage.used + delta, 0)},
+        )
+        self.db.execute(stmt)
+
+    def recompute(self, organization_id: UUID | None = None) -> int:
+        """Rebuild usage from `projects` and `memberships` (one org, or all); returns rows written."""
+        # Same reasoning as TaskCountRepository.recompute: a claim either committed before this
+        # lock (and is counted below) or waits for our commit and lands on the rebuilt row.
+        self.db.execute(text("LOCK TABLE org_usage IN SHARE ROW EXCLUSIVE MODE"))
+        projects = (
+            select(Project.organization_id, literal(UsageResource.PROJECTS.value), func.count())
+            .where(Project.deleted_at.is_(None))
+            .group_by(Project.organization_id)
+        )
+        users = select(
+            Membership.organization_id, literal(UsageResource.USERS.value), func.count()
+        ).group_by(Membership.organization_id)
+        target = delete(OrgUsage)
+        if organization_id is not None:
+            target = target.where(OrgUsage.organization_id == organization_id)
+            projects = projects.where(Project.organization_id == organization_id)
+            users = users.where(Membership.organization_id == organization_id)
+        self.db.execute(target)
+        result = self.db.execute(
+            insert(OrgUsage).from_select(
+                [OrgUsage.organization_id, OrgUsage.resource, OrgUsage.used],
+                union_all(projects, users),
+            )
+        )
+        return result.rowcount
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from sqlalchemy import select
 from sqlalchemy.orm import Session
@@ -20,9 +20,14 @@ class UserRepository:
         return self.db.execute(stmt).scalars().first()
 
     def create(self, *, email: str, password_hash: str, full_name: str | None) -> User:
-        user = User(email=email.lower(), password_hash=password_hash, full_name=full_name)
+        user = User(id=uuid4(), email=email.lower(), password_hash=password_hash, full_name=full_name)
         self.db.add(user)
-        self.db.flush()
         return user
 
+    def update_password_hash(self, user: User, password_hash: str) -> User:
+        user.password_hash = password_hash
+        return user
 
+    def set_active(self, user: User, is_active: bool) -> User:
+        user.is_active = is_active
+        return user
@@ -1,16 +1,43 @@
 from __future__ import annotations
 
-from typing import Generic, TypeVar
+from typing import Annotated, Any, Generic, TypeVar
 
-from pydantic import BaseModel, Field
+from pydantic import AfterValidator, BaseModel, Field
 
 T = TypeVar("T")
 
 
+def _reject_nul(value: str) -> str:
+    # Postgres text cannot hold U+0000; the driver would only refuse it after validation passed.
+    if "\x00" in value:
+        raise ValueError("não pode conter o carácter NUL")
+    return value
+
+
+# User-supplied text bound for a text/varchar column.
+DbText = Annotated[str, AfterValidator(_reject_nul)]
+
+
 class Page(BaseModel, Generic[T]):
     items: list[T]
-    total: int
+    # Null with include_total=none; with include_total=estimate, a lower bound when total_capped.
+    total: int | None
+    total_capped: bool = False
+    has_more: bool = False
     limit: int = Field(ge=1, le=100)
     offset: int = Field(ge=0)
+    # Opaque token for the next page (`?cursor=`); null on the last page.
+    next_cursor: str | None = None
 
-
+    @classmethod
+    def from_result(cls, result: Any, *, limit: int, offset: int, sort: str, order: str) -> Page[T]:
+        next_cursor = result.next_key.encode(sort=sort, order=order) if result.next_key else None
+        return cls(
+            items=result.items,
+            total=result.total,
+            total_capped=result.total_capped,
+            has_more=result.has_more,
+            limit=limit,
+            offset=offset,
+            next_cursor=next_cursor,
+        )
@@ -43,6 +43,7 @@ class SubscriptionOut(BaseModel):
 
 
 class ChangePlanRequest(BaseModel):
-    plan: str = Field(pattern=r"^(FREE|PRO)$")
+    # Plans live in the plan_limits table; the service rejects unknown ones.
+    plan: str = Field(min_length=1, max_length=20)
 
 
@@ -24,5 +24,7 @@ class ProjectOut(BaseModel):
     name: str
     description: str | None
     created_at: datetime
+    # Also in the ETag; send it back as If-Match to update only this version.
+    version: int
 
 
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class PurgeJobOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    kind: str
+    target_id: UUID
+    # pending | running | done
+    status: str
+    total_tasks: int
+    deleted_tasks: int
+    created_at: datetime
+    finished_at: datetime | None
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class SearchHitOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    kind: str
+    id: UUID
+    project_id: UUID
+    title: str
+    # HTML: matching fragments, escaped, with the matched terms wrapped in <mark>…</mark>.
+    headline: str
+    rank: float
@@ -1,20 +1,24 @@
 from __future__ import annotations
 
 from datetime import datetime
+from typing import Any, Literal
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from operant.app.core.config import settings
+from operant.app.schemas.common import DbText
 
 
 class TaskCreate(BaseModel):
-    title: str = Field(min_length=1, max_length=200)
-    description: str | None = Field(default=None, max_length=2000)
+    title: DbText = Field(min_length=1, max_length=200)
+    description: DbText | None = Field(default=None, max_length=2000)
     status: str = Field(default="TODO", pattern=r"^(TODO|IN_PROGRESS|DONE)$")
 
 
 class TaskUpdate(BaseModel):
-    title: str | None = Field(default=None, min_length=1, max_length=200)
-    description: str | None = Field(default=None, max_length=2000)
+    title: DbText | None = Field(default=None, min_length=1, max_length=200)
+    description: DbText | None = Field(default=None, max_length=2000)
     status: str | None = Field(default=None, pattern=r"^(TODO|IN_PROGRESS|DONE)$")
 
 
@@ -27,5 +31,80 @@ class TaskOut(BaseModel):
     description: str | None
     status: str
     created_at: datetime
+    # Also in the ETag; send it back as If-Match (or in `versions` of a batch update).
+    version: int
+
+
+class TaskBatchCreate(BaseModel):
+    # Items are validated one by one against TaskCreate, so one bad item does not reject the body.
+    items: list[dict[str, Any]] = Field(min_length=1, max_length=settings.task_batch_max_items)
+    # atomic: nothing is created unless every item is; partial: valid items are created anyway.
+    mode: Literal["atomic", "partial"] = "atomic"
+
+
+class TaskBatchItemOut(BaseModel):
+    index: int
+    task: TaskOut | None = None
+    error: str | None = None
+
+
+class TaskBatchOut(BaseModel):
+    created: int
+    failed: int
+    items: list[TaskBatchItemOut]
+
+
+class TaskBatchFilter(BaseModel):
+    project_id: UUID
+    status: str | None = Field(default=None, pattern=r"^(TODO|IN_PROGRESS|DONE)$")
+
+
+class TaskBatchUpdate(BaseModel):
+    # Exactly one of: explicit ids, or every task of a project (optionally in one status).
+    ids: list[UUID] | None = Field(default=None, min_length=1, max_length=settings.task_batch_max_items)
+    filter: TaskBatchFilter | None = None
+    patch: TaskUpdate
+    # If-Match per task (id -> version), for every id: nothing is updated unless all still match.
+    versions: dict[UUID, int] | None = None
+
+    @model_validator(mode="after")
+    def _one_selector(self) -> TaskBatchUpdate:
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Indique ids ou filter (não ambos)")
+        if self.versions is not None and set(self.versions) != set(self.ids or ()):
+            raise ValueError("versions deve indicar a versão de cada id (e só desses)")
+        return self
+
+
+class TaskBatchUpdateOut(BaseModel):
+    updated: int
+    # Only with ?return_rows=true.
+    items: list[TaskOut] | None = None
+
+
+class TaskImportErrorOut(BaseModel):
+    # 1-based line of the body (the first line of a multi-line CSV record).
+    line: int
+    error: str
+
+
+class TaskImportOut(BaseModel):
+    imported: int
+    failed: int
+    # The first import_max_reported_errors failures; errors_truncated when there were more.
+    errors: list[TaskImportErrorOut]
+    errors_truncated: bool = False
+    # Reading stopped at the plan's row limit.
+    limit_reached: bool = False
+    elapsed_seconds: float
+    rows_per_second: float
+
+
+class TaskSummaryOut(BaseModel):
+    # Every status is present (0 when there are none).
+    counts: dict[str, int]
+    total: int
 
 
+class OrgTaskSummaryOut(TaskSummaryOut):
+    projects: int
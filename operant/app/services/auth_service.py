@@ -7,7 +7,9 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from operant.app.core.config import settings
-from operant.app.core.errors import ConflictError, UnauthorizedError
+from operant.app.core.errors import ConflictError, NotFoundError, UnauthorizedError
+from operant.app.core.passwords import password_hasher
+from operant.app.core.principals import publish_user_deactivated
 from operant.app.core.security import (
     TokenPair,
     constant_time_equals,
@@ -15,11 +17,10 @@ from operant.app.core.security import (
     create_refresh_token,
     decode_refresh_token,
     generate_token_fingerprint,
-    hash_password,
     hash_refresh_fingerprint,
     now_utc,
-    verify_password,
 )
+from operant.app.db.session import DbSession, after_commit, commit_or_defer, run_db
 from operant.app.repositories.refresh_token_repository import RefreshTokenRepository
 from operant.app.repositories.user_repository import UserRepository
 
@@ -31,43 +32,77 @@ class AuthService:
         self.refresh_tokens = RefreshTokenRepository(db)
 
     def register(self, *, email: str, password: str, full_name: str | None):
-        password_hash = hash_password(password)
+        password_hash = password_hasher.hash(password)
+        return self.create_user(email=email, password_hash=password_hash, full_name=full_name)
+
+    def create_user(self, *, email: str, password_hash: str, full_name: str | None):
         try:
             user = self.users.create(email=email, password_hash=password_hash, full_name=full_name)
-            self.db.commit()
+            self.db.flush()
+            commit_or_defer(self.db)
         except IntegrityError as e:
             self.db.rollback()
             raise ConflictError("Email já está em uso") from e
         return user
 
     def login(self, *, email: str, password: str) -> TokenPair:
+        user = self.get_login_user(email=email)
+        if not password_hasher.verify(password, user.password_hash):
+            raise UnauthorizedError("Credenciais inválidas")
+        upgraded_hash = None
+        if password_hasher.needs_rehash(user.password_hash):
+            upgraded_hash = password_hasher.hash(password)
+        return self.complete_login(user, upgraded_password_hash=upgraded_hash)
+
+    def get_login_user(self, *, email: str):
         user = self.users.get_by_email(email)
         if user is None or not user.is_active:
             raise UnauthorizedError("Credenciais inválidas")
-        if not verify_password(password, user.password_hash):
-            raise UnauthorizedError("Credenciais inválidas")
-        return self._issue_pair(user.id)
+        return user
+
+    def complete_login(self, user, *, upgraded_password_hash: str | None = None) -> TokenPair:
+        if upgraded_password_hash is not None:
+            # Upgrade hashes made with an outdated cost while we still held the plaintext;
+            # committed together with the new refresh token.
+            self.users.update_password_hash(user, upgraded_password_hash)
+            password_hasher.record_rehash()
+        pair, _ = self._issue_pair(user.id)
+        commit_or_defer(self.db)
+        return pair
 
     def refresh(self, *, refresh_token: str) -> TokenPair:
         user_id, refresh_jti, fingerprint = decode_refresh_token(refresh_token)
+        fp_hash = hash_refresh_fingerprint(fingerprint)
+
+        # rotate: revoke the old record and insert its replacement in the same transaction
+        new_refresh_jti = uuid4()
+        rotated = self.refresh_tokens.revoke_active(
+            refresh_jti,
+            user_id=user_id,
+            fingerprint_hash=fp_hash,
+            revoked_at=now_utc(),
+            replaced_by=new_refresh_jti,
+        )
+        if rotated is None:
+            self._reject_refresh(user_id=user_id, refresh_jti=refresh_jti, fp_hash=fp_hash)
+        new_pair, _ = self._issue_pair(user_id, refresh_id=new_refresh_jti)
+        commit_or_defer(self.db)
+        return new_pair
+
+    def _reject_refresh(self, *, user_id: UUID, refresh_jti: UUID, fp_hash: str) -> None:
+        # Slow path only: work out why the conditional rotation matched nothing.
         record = self.refresh_tokens.get(refresh_jti)
         if record is None or record.user_id != user_id:
             raise UnauthorizedError("Refresh token inválido")
-        if record.revoked_at is not None:
-            raise UnauthorizedError("Refresh token revogado")
-        if record.expires_at <= now_utc():
-            raise UnauthorizedError("Refresh token expirado")
-
-        fp_hash = hash_refresh_fingerprint(fingerprint)
         if not constant_time_equals(fp_hash, record.fingerprint_hash):
             raise UnauthorizedError("Refresh token inválido")
-
-        new_pair = self._issue_pair(user_id)
-        # rotate: revoke old and link to new jti (decoded from new token)
-        _, new_refresh_jti, _ = decode_refresh_token(new_pair.refresh_token)
-        self.refresh_tokens.revoke(record, revoked_at=now_utc(), replaced_by=new_refresh_jti)
-        self.db.commit()
-        return new_pair
+        if record.revoked_at is not None:
+            # A rotated token presented again (replay or a lost race): revoke the whole family.
+            self.refresh_tokens.revoke_all_for_user(user_id, revoked_at=now_utc())
+            # Committed right away: the revocation must survive the error raised below.
+            self.db.commit()
+            raise UnauthorizedError("Refresh token revogado")
+        raise UnauthorizedError("Refresh token expirado")
 
     def logout(self, *, refresh_token: str) -> None:
         user_id, refresh_jti, fingerprint = decode_refresh_token(refresh_token)
@@ -80,12 +115,24 @@ class AuthService:
             return
         if record.revoked_at is None:
             self.refresh_tokens.revoke(record, revoked_at=now_utc(), replaced_by=None)
-            self.db.commit()
-
-    def _issue_pair(self, user_id: UUID) -> TokenPair:
+            commit_or_defer(self.db)
+
+    def deactivate_user(self, *, user_id: UUID) -> None:
+        user = self.users.get_by_id(user_id)
+        if user is None:
+            raise NotFoundError("Usuário não encontrado")
+        self.users.set_active(user, False)
+        self.refresh_tokens.revoke_all_for_user(user.id, revoked_at=now_utc())
+        commit_or_defer(self.db)
+        # Access tokens stay valid until exp, so cached principals must go right away.
+        user_id = user.id
+        after_commit(self.db, lambda: publish_user_deactivated(user_id))
+
+    def _issue_pair(self, user_id: UUID, *, refresh_id: UUID | None = None) -> tuple[TokenPair, UUID]:
+        """Mint a token pair and stage its refresh record; the caller owns the commit."""
         access = create_access_token(user_id=user_id)
 
-        refresh_id = uuid4()
+        refresh_id = refresh_id or uuid4()
         fingerprint = generate_token_fingerprint()
         refresh = create_refresh_token(user_id=user_id, refresh_jti=refresh_id, fingerprint=fingerprint)
 
@@ -96,7 +143,27 @@ class AuthService:
             fingerprint_hash=hash_refresh_fingerprint(fingerprint),
             expires_at=expires_at,
         )
-        self.db.commit()
-        return TokenPair(access_token=access, refresh_token=refresh)
+        return TokenPair(access_token=access, refresh_token=refresh), refresh_id
+
+
+# Async entry points: bcrypt is awaited on the process pool between DB steps, so neither the
+# event loop nor a threadpool worker is held while a password is being hashed.
+
+
+async def register_async(db: DbSession, *, email: str, password: str, full_name: str | None):
+    password_hash = await password_hasher.hash_async(password)
+    return await run_db(
+        db, lambda s: AuthService(s).create_user(email=email, password_hash=password_hash, full_name=full_name)
+    )
 
 
+async def login_async(db: DbSession, *, email: str, password: str) -> TokenPair:
+    user = await run_db(db, lambda s: AuthService(s).get_login_user(email=email))
+    if not await password_hasher.verify_async(password, user.password_hash):
+        raise UnauthorizedError("Credenciais inválidas")
+    upgraded_hash = None
+    if password_hasher.needs_rehash(user.password_hash):
+        upgraded_hash = await password_hasher.hash_async(password)
+    return await run_db(
+        db, lambda s: AuthService(s).complete_login(user, upgraded_password_hash=upgraded_hash)
+    )
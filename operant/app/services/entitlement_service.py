@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from sqlalchemy.orm import Session
+
+from operant.app.core.entitlements import (
+    CATALOG_KEY,
+    Entitlements,
+    PlanLimits,
+    org_plan_cache,
+    plan_catalog,
+)
+from operant.app.core.errors import ConflictError, ForbiddenError
+from operant.app.db.session import commit_or_defer
+from operant.app.models.org_usage import UsageResource
+from operant.app.models.subscription import Plan
+from operant.app.repositories.plan_limit_repository import PlanLimitRepository
+from operant.app.repositories.subscription_repository import SubscriptionRepository
+from operant.app.repositories.usage_repository import UsageRepository
+
+
+class EntitlementService:
+    """
+    Every plan and limit decision goes through here. The org's plan and the plan limits come from
+    per-worker caches (core/entitlements.py), so once warm a check costs no subscription lookup.
+
+    Project and member slots are counted in `org_usage`: a create claims one with a conditional
+    increment in its own transaction, a delete releases it, so checks are one row update instead
+    of a count(*) and stay exact under concurrent requests.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.subscriptions = SubscriptionRepository(db)
+        self.plan_limits = PlanLimitRepository(db)
+        self.usage = UsageRepository(db)
+
+    def plans(self) -> dict[str, PlanLimits]:
+        plans = plan_catalog.get(CATALOG_KEY)
+        if plans is None:
+            plans = {
+                row.plan: PlanLimits(
+                    max_users=row.max_users,
+                    max_projects=row.max_projects,
+                    max_import_rows=row.max_import_rows,
+                )
+                for row in self.plan_limits.list_all()
+            }
+            plan_catalog.set(CATALOG_KEY, plans)
+        return plans
+
+    def for_org(self, organization_id) -> Entitlements:
+        plan = org_plan_cache.get(organization_id)
+        if plan is None:
+            sub = self.subscriptions.get_by_org(organization_id)
+            plan = sub.plan if sub else Plan.FREE.value
+            org_plan_cache.set(organization_id, plan)
+        limits = self.plans().get(plan)
+        if limits is None:
+            raise ForbiddenError(f"Plano {plan} sem limites configurados")
+        return Entitlements(plan=plan, limits=limits)
+
+    def require_plan(self, plan: str) -> None:
+        if plan not in self.plans():
+            raise ConflictError("Plano inválido")
+
+    def claim_project_slot(self, organization_id) -> None:
+        limits = self.for_org(organization_id).limits
+        if not self.usage.claim(organization_id, UsageResource.PROJECTS, limits.max_projects):
+            raise ForbiddenError("Limite de projetos do plano atingido")
+
+    def release_project_slot(self, organization_id) -> None:
+        self.usage.add(organization_id, UsageResource.PROJECTS, -1)
+
+    def claim_member_slot(self, organization_id) -> None:
+        limits = self.for_org(organization_id).limits
+        if not self.usage.claim(organization_id, UsageResource.USERS, limits.max_users):
+            raise ForbiddenError("Limite de usuários do plano atingido")
+
+    def open_usage(self, organization_id) -> None:
+        """Usage of a new org: its creator holds a member slot whatever the plan allows."""
+        self.usage.add(organization_id, UsageResource.USERS, 1)
+
+    def reconcile_usage(self, *, organization_id=None) -> int:
+        written = self.usage.recompute(organization_id)
+        commit_or_defer(self.db)
+        return written
+
+    def max_import_rows(self, organization_id) -> int:
+        return self.for_org(organization_id).limits.max_import_rows
+
+
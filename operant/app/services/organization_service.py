@@ -3,13 +3,24 @@ from __future__ import annotations
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from operant.app.core.errors import ConflictError, ForbiddenError, NotFoundError
+from operant.app.core.config import settings
+from operant.app.core.cursors import Keyset
+from operant.app.core.entitlements import publish_plan_change
+from operant.app.core.errors import ConflictError, NotFoundError
+from operant.app.core.memberships import publish_membership_change
 from operant.app.core.permissions import OrgRole
-from operant.app.models.subscription import PLAN_LIMITS, Plan
+from operant.app.core.response_cache import invalidate_tags, members_tag, org_tag, user_tag
+from operant.app.db.session import after_commit, commit_or_defer
+from operant.app.models.purge_job import PurgeJob, PurgeKind
+from operant.app.models.subscription import Plan
 from operant.app.repositories.membership_repository import MembershipRepository
 from operant.app.repositories.organization_repository import OrganizationRepository
+from operant.app.repositories.pagination import TotalMode
+from operant.app.repositories.purge_repository import PurgeRepository
 from operant.app.repositories.subscription_repository import SubscriptionRepository
+from operant.app.repositories.task_count_repository import TaskCountRepository
 from operant.app.repositories.user_repository import UserRepository
+from operant.app.services.entitlement_service import EntitlementService
 
 
 class OrganizationService:
@@ -19,6 +30,9 @@ class OrganizationService:
         self.memberships = MembershipRepository(db)
         self.subscriptions = SubscriptionRepository(db)
         self.users = UserRepository(db)
+        self.counts = TaskCountRepository(db)
+        self.purges = PurgeRepository(db)
+        self.entitlements = EntitlementService(db)
 
     def create_org(self, *, creator_user_id, name: str, slug: str):
         if self.orgs.get_by_slug(slug) is not None:
@@ -29,14 +43,28 @@ class OrganizationService:
             self.memberships.create(
                 user_id=creator_user_id, organization_id=org.id, role=OrgRole.OWNER.value
             )
-            self.db.commit()
+            # One flush for the three inserts; it surfaces unique violations inside this try.
+            self.db.flush()
+            self.entitlements.open_usage(org.id)
+            commit_or_defer(self.db)
         except IntegrityError as e:
             self.db.rollback()
             raise ConflictError("Não foi possível criar organização") from e
+        after_commit(self.db, lambda: invalidate_tags(user_tag(creator_user_id)))
         return org
 
-    def list_orgs_for_user(self, *, user_id, limit: int, offset: int):
-        return self.orgs.list_for_user(user_id, limit=limit, offset=offset)
+    def list_orgs_for_user(
+        self,
+        *,
+        user_id,
+        limit: int,
+        offset: int,
+        after: Keyset | None = None,
+        include_total: TotalMode = TotalMode.EXACT,
+    ):
+        return self.orgs.list_for_user(
+            user_id, limit=limit, offset=offset, after=after, include_total=include_total
+        )
 
     def get_org(self, *, org_id):
         org = self.orgs.get(org_id)
@@ -44,8 +72,18 @@ class OrganizationService:
             raise NotFoundError("Organização não encontrada")
         return org
 
-    def list_members(self, *, organization_id, limit: int, offset: int):
-        return self.memberships.list_members(organization_id, limit=limit, offset=offset)
+    def list_members(
+        self,
+        *,
+        organization_id,
+        limit: int,
+        offset: int,
+        after: Keyset | None = None,
+        include_total: TotalMode = TotalMode.EXACT,
+    ):
+        return self.memberships.list_members(
+            organization_id, limit=limit, offset=offset, after=after, include_total=include_total
+        )
 
     def add_member(self, *, organization_id, email: str, role: str):
         user = self.users.get_by_email(email)
@@ -55,28 +93,62 @@ class OrganizationService:
         if self.memberships.get_by_user_org(user.id, organization_id) is not None:
             raise ConflictError("Usuário já é membro desta organização")
 
-        sub = self.subscriptions.get_by_org(organization_id)
-        plan = Plan(sub.plan) if sub else Plan.FREE
-        limits = PLAN_LIMITS[plan]
-        current = self.memberships.count_users(organization_id)
-        if current >= limits["max_users"]:
-            raise ForbiddenError("Limite de usuários do plano atingido")
+        self.entitlements.claim_member_slot(organization_id)
 
         try:
             membership = self.memberships.create(
                 user_id=user.id, organization_id=organization_id, role=role
             )
-            self.db.commit()
+            self.db.flush()
+            commit_or_defer(self.db)
         except IntegrityError as e:
             self.db.rollback()
             raise ConflictError("Não foi possível adicionar membro") from e
+        user_id = user.id
+
+        def _publish() -> None:
+            publish_membership_change(user_id, organization_id)
+            invalidate_tags(members_tag(organization_id), user_tag(user_id))
+
+        after_commit(self.db, _publish)
         return membership
 
     def change_plan(self, *, organization_id, plan: str):
-        if plan not in (Plan.FREE.value, Plan.PRO.value):
-            raise ConflictError("Plano inválido")
+        self.entitlements.require_plan(plan)
         sub = self.subscriptions.set_plan(organization_id, plan)
-        self.db.commit()
+        commit_or_defer(self.db)
+        after_commit(self.db, lambda: publish_plan_change(organization_id))
         return sub
 
+    def offboard_org(self, *, organization_id, requested_by=None) -> PurgeJob | None:
+        """
+        Delete the organization and everything in it. Past `purge_sync_max_tasks` tasks, the
+        members lose access at once (their memberships go now) and the rest is left to a purge job,
+        which is returned.
+        """
+        org = self.get_org(org_id=organization_id)
+        total = self.counts.total_for_org(organization_id)
+        job = None
+        if total <= settings.purge_sync_max_tasks:
+            members = self.memberships.user_ids(organization_id)
+            self.orgs.delete(org)
+        else:
+            members = self.memberships.delete_for_org(organization_id)
+            self.orgs.tombstone(org)
+            job = self.purges.create(
+                kind=PurgeKind.ORGANIZATION,
+                target_id=organization_id,
+                requested_by=requested_by,
+                total_tasks=total,
+            )
+        commit_or_defer(self.db)
+
+        def _publish() -> None:
+            for user_id in members:
+                publish_membership_change(user_id, organization_id)
+            invalidate_tags(org_tag(organization_id), *(user_tag(user_id) for user_id in members))
+
+        after_commit(self.db, _publish)
+        return job
+
 
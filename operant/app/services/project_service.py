@@ -2,17 +2,28 @@ from __future__ import annotations
 
 from sqlalchemy.orm import Session
 
-from operant.app.core.errors import ForbiddenError, NotFoundError
-from operant.app.models.subscription import PLAN_LIMITS, Plan
+from operant.app.core.config import settings
+from operant.app.core.cursors import Keyset
+from operant.app.core.errors import ForbiddenError, NotFoundError, PreconditionFailedError
+from operant.app.core.response_cache import invalidate_tags, project_tag, projects_tag
+from operant.app.db.session import after_commit, commit_or_defer
+from operant.app.models.purge_job import PurgeJob, PurgeKind
+from operant.app.repositories.pagination import TotalMode
 from operant.app.repositories.project_repository import ProjectRepository
-from operant.app.repositories.subscription_repository import SubscriptionRepository
+from operant.app.repositories.purge_repository import PurgeRepository
+from operant.app.repositories.task_count_repository import TaskCountRepository
+from operant.app.services.entitlement_service import EntitlementService
+
+_STALE_PROJECT = "O projeto foi alterado entretanto; obtenha a versão atual"
 
 
 class ProjectService:
     def __init__(self, db: Session):
         self.db = db
         self.projects = ProjectRepository(db)
-        self.subscriptions = SubscriptionRepository(db)
+        self.counts = TaskCountRepository(db)
+        self.purges = PurgeRepository(db)
+        self.entitlements = EntitlementService(db)
 
     def list_projects(
         self,
@@ -23,21 +34,25 @@ class ProjectService:
         order: str,
         limit: int,
         offset: int,
+        after: Keyset | None = None,
+        include_total: TotalMode = TotalMode.EXACT,
     ):
         return self.projects.list_for_org(
-            organization_id, q=q, sort=sort, order=order, limit=limit, offset=offset
+            organization_id,
+            q=q,
+            sort=sort,
+            order=order,
+            limit=limit,
+            offset=offset,
+            after=after,
+            include_total=include_total,
         )
 
     def create_project(self, *, organization_id, name: str, description: str | None):
-        sub = self.subscriptions.get_by_org(organization_id)
-        plan = Plan(sub.plan) if sub else Plan.FREE
-        limits = PLAN_LIMITS[plan]
-        count = self.projects.count_for_org(organization_id)
-        if count >= limits["max_projects"]:
-            raise ForbiddenError("Limite de projetos do plano atingido")
-
+        self.entitlements.claim_project_slot(organization_id)
         project = self.projects.create(organization_id=organization_id, name=name, description=description)
-        self.db.commit()
+        commit_or_defer(self.db)
+        self._changed(organization_id)
         return project
 
     def get_project(self, *, project_id):
@@ -48,19 +63,85 @@ class ProjectService:
 
     def get_project_for_org(self, *, project_id, organization_id):
         project = self.get_project(project_id=project_id)
-        if project.organization_id != organization_id:
-            raise ForbiddenError("Projeto não pertence à organização atual")
+        _check_org(project.organization_id, organization_id)
         return project
 
-    def update_project(self, *, project_id, name: str | None, description: str | None):
+    def get_project_version_for_org(self, *, project_id, organization_id):
+        """(version, updated_at) of the project, with the same checks as get_project_for_org."""
+        version = self.projects.version(project_id)
+        if version is None:
+            raise NotFoundError("Projeto não encontrado")
+        project_org_id, number, updated_at = version
+        _check_org(project_org_id, organization_id)
+        return number, updated_at
+
+    def list_version(self, *, organization_id, q: str | None):
+        return self.projects.list_version(organization_id, q=q)
+
+    def update_project(
+        self,
+        *,
+        project_id,
+        name: str | None,
+        description: str | None,
+        versions: frozenset[int] | None = None,
+    ):
+        """
+        Update the project with one conditional UPDATE. With `versions` (from If-Match) it only
+        applies while the project is at one of them; otherwise PreconditionFailedError.
+        """
         project = self.get_project(project_id=project_id)
-        project = self.projects.update(project, name=name, description=description)
-        self.db.commit()
-        return project
+        changes = {"name": name, "description": description}
+        changes = {column: value for column, value in changes.items() if value is not None}
+        if not changes:
+            if versions is not None and project.version not in versions:
+                raise PreconditionFailedError(_STALE_PROJECT)
+            return project
+        updated = self.projects.update(project_id, changes=changes, versions=versions)
+        if updated is None:
+            if versions is not None:
+                raise PreconditionFailedError(_STALE_PROJECT)
+            raise NotFoundError("Projeto não encontrado")
+        commit_or_defer(self.db)
+        self._changed(updated.organization_id)
+        return updated
 
-    def delete_project(self, *, project_id):
+    def delete_project(self, *, project_id, requested_by=None) -> PurgeJob | None:
+        """
+        Delete the project with one statement, or, when it holds more than `purge_sync_max_tasks`
+        tasks, tombstone it and return the purge job that deletes them in chunks.
+        """
         project = self.get_project(project_id=project_id)
-        self.projects.delete(project)
-        self.db.commit()
+        organization_id = project.organization_id
+        total = self.counts.total_for_project(project.id)
+        purge = total > settings.purge_sync_max_tasks
+        removed = self.projects.tombstone(project) if purge else self.projects.delete(project)
+        if not removed:
+            # A concurrent request deleted it first (and released its slot).
+            raise NotFoundError("Projeto não encontrado")
+        # A tombstoned project no longer counts against the plan either.
+        self.entitlements.release_project_slot(organization_id)
+        job = None
+        if purge:
+            job = self.purges.create(
+                kind=PurgeKind.PROJECT,
+                target_id=project.id,
+                requested_by=requested_by,
+                total_tasks=total,
+            )
+        commit_or_defer(self.db)
+        self._changed(organization_id, project_id)
+        return job
+
+    def _changed(self, organization_id, project_id=None) -> None:
+        tags = [projects_tag(organization_id)]
+        if project_id is not None:
+            tags.append(project_tag(project_id))
+        after_commit(self.db, lambda: invalidate_tags(*tags))
+
+
+def _check_org(project_org_id, organization_id) -> None:
+    if project_org_id != organization_id:
+        raise ForbiddenError("Projeto não pertence à organização atual")
 
 
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from sqlalchemy.orm import Session
+
+from operant.app.core.errors import NotFoundError
+from operant.app.repositories.purge_repository import PurgeRepository
+
+
+class PurgeService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.purges = PurgeRepository(db)
+
+    def get_job(self, *, job_id, user_id):
+        # Only the requester follows a job: after offboarding there is no org left to authorize by.
+        job = self.purges.get(job_id)
+        if job is None or job.requested_by != user_id:
+            raise NotFoundError("Remoção não encontrada")
+        return job
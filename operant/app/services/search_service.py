@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from sqlalchemy.orm import Session
+
+from operant.app.core.cursors import Keyset
+from operant.app.db.search import prefix_query
+from operant.app.repositories.pagination import PageResult
+from operant.app.repositories.search_repository import SearchRepository
+
+
+class SearchService:
+    def __init__(self, db: Session):
+        self.db = db
+        self.search_repo = SearchRepository(db)
+
+    def search(self, *, organization_id, q: str, limit: int, after: Keyset | None = None):
+        tsquery = prefix_query(q)
+        if tsquery is None:
+            return PageResult(items=[], total=None, next_key=None)
+        return self.search_repo.search(organization_id, tsquery=tsquery, limit=limit, after=after)
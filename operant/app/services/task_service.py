@@ -1,15 +1,49 @@
 from __future__ import annotations
 
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import Session
 
-from operant.app.core.errors import NotFoundError
+from operant.app.core.config import settings
+from operant.app.core.cursors import Keyset
+from operant.app.core.errors import BadRequestError, NotFoundError, PreconditionFailedError
+from operant.app.core.response_cache import invalidate_tags, project_tag
+from operant.app.db.session import after_commit, commit_or_defer
+from operant.app.models.task import Task, TaskStatus
+from operant.app.repositories.pagination import TotalMode
+from operant.app.repositories.task_count_repository import TaskCountRepository
 from operant.app.repositories.task_repository import TaskRepository
+from operant.app.services.entitlement_service import EntitlementService
+
+_STALE_TASK = "A tarefa foi alterada entretanto; obtenha a versão atual"
+
+
+@dataclass
+class ImportResult:
+    imported: int = 0
+    failed: int = 0
+    # (line, message) for the first `max_errors` failures.
+    errors: list[tuple[int, str]] = field(default_factory=list)
+    max_errors: int = 100
+    # The plan's row limit stopped the import before the end of the file.
+    limit_reached: bool = False
+
+    def fail(self, line: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((line, message))
 
 
 class TaskService:
     def __init__(self, db: Session):
         self.db = db
         self.tasks = TaskRepository(db)
+        self.counts = TaskCountRepository(db)
+        self.entitlements = EntitlementService(db)
 
     def list_tasks(
         self,
@@ -20,31 +54,262 @@ class TaskService:
         order: str,
         limit: int,
         offset: int,
+        after: Keyset | None = None,
+        include_total: TotalMode = TotalMode.EXACT,
     ):
         return self.tasks.list_for_project(
-            project_id, status=status, sort=sort, order=order, limit=limit, offset=offset
+            project_id,
+            status=status,
+            sort=sort,
+            order=order,
+            limit=limit,
+            offset=offset,
+            after=after,
+            include_total=include_total,
         )
 
     def create_task(self, *, project_id, title: str, description: str | None, status: str):
         task = self.tasks.create(project_id=project_id, title=title, description=description, status=status)
-        self.db.commit()
+        self.counts.apply_delta(project_id, status, +1)
+        commit_or_defer(self.db)
+        self._changed(project_id)
         return task
 
+    def create_tasks(
+        self, *, project_id, rows: list[dict[str, Any]], partial: bool = False
+    ) -> list[Task | str | None]:
+        """
+        Insert `rows` (title/description/status) with one statement; one entry per row comes back.
+
+        A row the database rejects gets its error message in its slot. The batch is only retried row
+        by row (each in a savepoint, to isolate the culprits) when the single INSERT fails. By default
+        it is all-or-nothing: after a rejection everything is rolled back and the other slots are None.
+        With `partial` the accepted rows are kept.
+        """
+        outcomes: list[Task | str | None]
+        if not partial:
+            try:
+                outcomes = list(self.tasks.create_many(project_id=project_id, rows=rows))
+            except (DBAPIError, ValueError):
+                self.db.rollback()
+                outcomes = [self._create_isolated(project_id, row) for row in rows]
+                self.db.rollback()
+                if not any(isinstance(outcome, str) for outcome in outcomes):
+                    raise
+                return [outcome if isinstance(outcome, str) else None for outcome in outcomes]
+        else:
+            try:
+                with self.db.begin_nested():
+                    outcomes = list(self.tasks.create_many(project_id=project_id, rows=rows))
+            except (DBAPIError, ValueError):
+                outcomes = [self._create_isolated(project_id, row) for row in rows]
+
+        self._apply_deltas(Counter((project_id, task.status) for task in outcomes if isinstance(task, Task)))
+        commit_or_defer(self.db)
+        self._changed(project_id)
+        return outcomes
+
+    def _create_isolated(self, project_id, row: dict[str, Any]) -> Task | str:
+        try:
+            with self.db.begin_nested():
+                return self.tasks.create_many(project_id=project_id, rows=[row])[0]
+        except DBAPIError as e:
+            return str(e.orig).strip()
+        except ValueError as e:  # raised by the driver before sending (NUL characters)
+            return str(e)
+
+    def import_tasks(
+        self,
+        *,
+        project_id,
+        organization_id,
+        rows: Iterable[tuple[int, dict[str, Any] | str]],
+        chunk_rows: int | None = None,
+        max_errors: int | None = None,
+    ) -> ImportResult:
+        """
+        Load (line, task fields) rows in chunks: COPY into a staging table, then one INSERT ...
+        SELECT per chunk. A `str` in place of the fields is that line's validation error.
+
+        `rows` is consumed lazily, so a streamed file is never held in memory. A chunk the database
+        rejects is retried row by row, so only the culprits fail. The plan's row limit is looked up
+        once; reading stops at it. Everything commits together.
+        """
+        chunk_rows = chunk_rows or settings.import_chunk_rows
+        result = ImportResult(
+            max_errors=settings.import_max_reported_errors if max_errors is None else max_errors
+        )
+        max_rows = self.entitlements.max_import_rows(organization_id)
+
+        self.tasks.create_import_staging()
+        chunk: list[tuple[int, dict[str, Any]]] = []
+        for seen, (line, row) in enumerate(rows, start=1):
+            if seen > max_rows:
+                result.fail(line, f"Limite de {max_rows} linhas por importação do plano atingido")
+                result.limit_reached = True
+                break
+            if isinstance(row, str):
+                result.fail(line, row)
+                continue
+            chunk.append((line, row))
+            if len(chunk) >= chunk_rows:
+                self._import_chunk(project_id, chunk, result)
+                chunk = []
+        if chunk:
+            self._import_chunk(project_id, chunk, result)
+        commit_or_defer(self.db)
+        self._changed(project_id)
+        return result
+
+    def _import_chunk(
+        self, project_id, chunk: list[tuple[int, dict[str, Any]]], result: ImportResult
+    ) -> None:
+        staged = [
+            (line, row["title"], row.get("description"), row["status"]) for line, row in chunk
+        ]
+        try:
+            with self.db.begin_nested():
+                self.tasks.copy_to_staging(staged)
+                self.tasks.insert_from_staging(project_id)
+            statuses = [row["status"] for _, row in chunk]
+        except (DBAPIError, ValueError):
+            statuses = []
+            for line, row in chunk:
+                outcome = self._create_isolated(project_id, row)
+                if isinstance(outcome, str):
+                    result.fail(line, outcome)
+                else:
+                    statuses.append(outcome.status)
+        self._apply_deltas(Counter((project_id, status) for status in statuses))
+        result.imported += len(statuses)
+
     def get_task(self, *, task_id):
         task = self.tasks.get(task_id)
         if task is None:
             raise NotFoundError("Tarefa não encontrada")
         return task
 
-    def update_task(self, *, task_id, title: str | None, description: str | None, status: str | None):
+    def get_task_version(self, *, task_id):
+        """(project_id, version, updated_at) of the task, for conditional GETs."""
+        version = self.tasks.version(task_id)
+        if version is None:
+            raise NotFoundError("Tarefa não encontrada")
+        return version
+
+    def list_version(self, *, project_id, status: str | None):
+        return self.tasks.list_version(project_id, status=status)
+
+    def update_task(
+        self,
+        *,
+        task_id,
+        title: str | None,
+        description: str | None,
+        status: str | None,
+        versions: frozenset[int] | None = None,
+    ):
+        """
+        Update the task with one conditional UPDATE. With `versions` (from If-Match) it only
+        applies while the task is at one of them; otherwise PreconditionFailedError.
+        """
         task = self.get_task(task_id=task_id)
-        task = self.tasks.update(task, title=title, description=description, status=status)
-        self.db.commit()
-        return task
+        changes = {"title": title, "description": description, "status": status}
+        changes = {column: value for column, value in changes.items() if value is not None}
+        if not changes:
+            if versions is not None and task.version not in versions:
+                raise PreconditionFailedError(_STALE_TASK)
+            return task
+        row = self.tasks.update(task_id, changes=changes, versions=versions)
+        if row is None:
+            if versions is not None:
+                raise PreconditionFailedError(_STALE_TASK)
+            raise NotFoundError("Tarefa não encontrada")
+        if row.status != row.previous_status:
+            # Task row first, then counters: the order update_tasks locks them in.
+            self._apply_deltas(
+                Counter({(row.project_id, row.previous_status): -1, (row.project_id, row.status): +1})
+            )
+        commit_or_defer(self.db)
+        self._changed(row.project_id)
+        return row.task
 
     def delete_task(self, *, task_id):
         task = self.get_task(task_id=task_id)
         self.tasks.delete(task)
-        self.db.commit()
+        self.db.flush()
+        self._apply_deltas(Counter({(task.project_id, task.status): -1}))
+        commit_or_defer(self.db)
+        self._changed(task.project_id)
+
+    def update_tasks(
+        self,
+        *,
+        organization_id,
+        ids: list | None = None,
+        project_id=None,
+        status_filter: str | None = None,
+        changes: dict[str, Any],
+        versions: dict | None = None,
+        return_rows: bool = False,
+    ) -> tuple[int, list[Task] | None]:
+        """
+        Apply `changes` to the org's tasks picked by `ids`, or by `project_id` (+ `status_filter`),
+        with one UPDATE. Returns the number of tasks updated and, with `return_rows`, the tasks.
+
+        With `versions` (id -> version) it is all or nothing: if any task is missing or at another
+        version, nothing is updated and PreconditionFailedError is raised.
+        """
+        if not changes:
+            raise BadRequestError("Nada para atualizar")
+        rows = self.tasks.update_many(
+            organization_id=organization_id,
+            ids=ids,
+            project_id=project_id,
+            status=status_filter,
+            changes=changes,
+            versions=versions,
+            return_rows=return_rows,
+        )
+        if versions is not None and len(rows) < len(versions):
+            self.db.rollback()
+            raise PreconditionFailedError(
+                f"{len(versions) - len(rows)} tarefa(s) alterada(s) entretanto ou inexistente(s)"
+            )
+        deltas: Counter[tuple[Any, str]] = Counter()
+        for row in rows:
+            if row.previous_status != row.status:
+                deltas[(row.project_id, row.previous_status)] -= 1
+                deltas[(row.project_id, row.status)] += 1
+        self._apply_deltas(deltas)
+        commit_or_defer(self.db)
+        self._changed(*{row.project_id for row in rows})
+        return len(rows), [row.task for row in rows] if return_rows else None
+
+    def _changed(self, *project_ids) -> None:
+        tags = [project_tag(project_id) for project_id in project_ids]
+        after_commit(self.db, lambda: invalidate_tags(*tags))
+
+    def _apply_deltas(self, deltas: Counter[tuple[Any, str]]) -> None:
+        # Always in (project, status) order: two transactions moving tasks in opposite directions
+        # then lock the counter rows in the same order and cannot deadlock.
+        for project_id, counted_status in sorted(deltas, key=lambda key: (str(key[0]), key[1])):
+            if deltas[(project_id, counted_status)]:
+                self.counts.apply_delta(project_id, counted_status, deltas[(project_id, counted_status)])
+
+    def project_summary(self, *, project_id) -> dict:
+        counts = self.counts.for_project(project_id)
+        return _summary(counts)
+
+    def org_summary(self, *, organization_id) -> dict:
+        counts, projects = self.counts.for_org(organization_id)
+        return {**_summary(counts), "projects": projects}
+
+    def repair_counts(self, *, project_id=None) -> int:
+        written = self.counts.recompute(project_id)
+        commit_or_defer(self.db)
+        return written
 
 
+def _summary(counts: dict[str, int]) -> dict:
+    by_status = {status.value: counts.get(status.value, 0) for status in TaskStatus}
+    return {"counts": by_status, "total": sum(by_status.values())}
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from functools import cached_property
+from typing import TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from operant.app.db.session import AFTER_COMMIT_KEY, DEFERRED_COMMIT_KEY, DbSession, run_db
+from operant.app.services.auth_service import AuthService
+from operant.app.services.organization_service import OrganizationService
+from operant.app.services.project_service import ProjectService
+from operant.app.services.task_service import TaskService
+
+T = TypeVar("T")
+
+
+class UnitOfWork:
+    """
+    Request-scoped transaction.
+
+    Services are created once per request and share one session. While `run` executes, their
+    `commit_or_defer` calls only mark the work as pending; pending changes are flushed and
+    committed once when `run` returns, or rolled back if it raises (e.g. a DomainError).
+    Callbacks registered with `after_commit` fire only after that commit succeeds.
+    """
+
+    def __init__(self, db: DbSession):
+        self.db = db
+        self.session: Session = db.sync_session if isinstance(db, AsyncSession) else db
+
+    @cached_property
+    def auth(self) -> AuthService:
+        return AuthService(self.session)
+
+    @cached_property
+    def organizations(self) -> OrganizationService:
+        return OrganizationService(self.session)
+
+    @cached_property
+    def projects(self) -> ProjectService:
+        return ProjectService(self.session)
+
+    @cached_property
+    def tasks(self) -> TaskService:
+        return TaskService(self.session)
+
+    async def run(self, fn: Callable[[UnitOfWork], T]) -> T:
+        return await run_db(self.db, lambda _s: self.run_sync(fn))
+
+    def run_sync(self, fn: Callable[[UnitOfWork], T]) -> T:
+        session = self.session
+        session.info[DEFERRED_COMMIT_KEY] = True
+        try:
+            result = fn(self)
+            session.info.pop(DEFERRED_COMMIT_KEY, None)
+            session.commit()
+        except BaseException:
+            session.info.pop(DEFERRED_COMMIT_KEY, None)
+            session.info.pop(AFTER_COMMIT_KEY, None)
+            session.rollback()
+            raise
+        for callback in session.info.pop(AFTER_COMMIT_KEY, []):
+            callback()
+        return result
@@ -2,17 +2,23 @@ from __future__ import annotations
 
 import os
 from collections.abc import Generator
+from contextlib import contextmanager
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, update
 from sqlalchemy.orm import Session, sessionmaker
 
 from operant.app import models  # noqa: F401  (register models)
 from operant.app.api import deps
 from operant.app.core.config import settings
+from operant.app.core.entitlements import publish_plan_limits_change
 from operant.app.db.base import Base
+from operant.app.db.instrumentation import record_queries
 from operant.app.main import create_app
+from operant.app.models.plan_limit import PlanLimit
+from operant.app.services.auth_service import AuthService
+from operant.app.services.organization_service import OrganizationService
 
 
 def _test_database_url() -> str:
@@ -39,7 +45,16 @@ def engine():
 def db(engine) -> Generator[Session, None, None]:
     connection = engine.connect()
     transaction = connection.begin()
-    TestingSessionLocal = sessionmaker(bind=connection, autocommit=False, autoflush=False, future=True)
+    # Session commits/rollbacks act on SAVEPOINTs inside the outer transaction, which is always
+    # rolled back, so a rolled-back unit of work does not discard the whole test's data.
+    TestingSessionLocal = sessionmaker(
+        bind=connection,
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,  # as in db/session.py, so query counts match production
+        future=True,
+        join_transaction_mode="create_savepoint",
+    )
     session = TestingSessionLocal()
     try:
         yield session
@@ -61,3 +76,40 @@ def client(db: Session) -> Generator[TestClient, None, None]:
         yield c
 
 
+@pytest.fixture()
+def make_org(db: Session):
+    """`org, headers = make_org("slug")`: an owner, their org and the headers to act as them in it."""
+    def _make(slug: str):
+        auth = AuthService(db)
+        owner = auth.register(email=f"{slug}@example.com", password="Secret123!", full_name=None)
+        org = OrganizationService(db).create_org(creator_user_id=owner.id, name=slug, slug=slug)
+        access = auth.login(email=f"{slug}@example.com", password="Secret123!").access_token
+        return org, {"Authorization": f"Bearer {access}", "X-Organization-Id": str(org.id)}
+
+    return _make
+
+
+@pytest.fixture()
+def assert_max_queries(engine):
+    """`with assert_max_queries(3): client.get(...)` fails when the block issues more statements."""
+
+    @contextmanager
+    def _assert(limit: int):
+        with record_queries(engine) as stats:
+            yield stats
+        assert stats.count <= limit, f"esperado no máximo {limit} queries, obtido {stats.describe()}"
+
+    return _assert
+
+
+@pytest.fixture()
+def set_plan_limits(db: Session):
+    """`set_plan_limits("FREE", max_projects=1)`: edit a plan_limits row for this test only."""
+
+    def _set(plan: str, **limits: int) -> None:
+        db.execute(update(PlanLimit).where(PlanLimit.plan == plan).values(**limits))
+        publish_plan_limits_change()
+
+    yield _set
+    # The edit is rolled back with the test; the reloaded limits must not outlive it.
+    publish_plan_limits_change()
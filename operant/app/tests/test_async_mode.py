@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import os
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from operant.app.api import deps
+from operant.app.core.config import settings
+from operant.app.main import create_app
+
+pytest.importorskip("asyncpg")
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
+
+
+@pytest.fixture()
+def suffix(engine):
+    suffix = uuid4().hex[:8]
+    yield suffix
+    # The API committed through its own engine, outside the rolled-back test transaction.
+    # Deleting the org and the user cascades to everything created under them.
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM organizations WHERE slug = :slug"), {"slug": f"async-{suffix}"})
+        conn.execute(text("DELETE FROM users WHERE email = :email"), {"email": f"async-{suffix}@example.com"})
+
+
+def test_async_sessions_serve_the_same_api_contract(suffix):
+    # Runs against committed data: asyncpg connections cannot join the sync test transaction.
+    url = os.getenv("OPERANT_DATABASE_URL", settings.database_url).replace("+psycopg2", "+asyncpg", 1)
+    app = create_app()
+
+    async def override_db_session():
+        async_engine = create_async_engine(url, poolclass=NullPool)
+        async with AsyncSession(async_engine, autoflush=False, expire_on_commit=False) as session:
+            yield session
+        await async_engine.dispose()
+
+    app.dependency_overrides[deps.db_session] = override_db_session
+    with TestClient(app) as client:
+        email = f"async-{suffix}@example.com"
+        r = client.post("/api/v1/auth/register", json={"email": email, "password": "Secret123!"})
+        assert r.status_code == 201, r.text
+        r = client.post("/api/v1/auth/login", json={"email": email, "password": "Secret123!"})
+        assert r.status_code == 200, r.text
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+        r = client.post("/api/v1/organizations", headers=headers, json={"name": "Async", "slug": f"async-{suffix}"})
+        assert r.status_code == 201, r.text
+        headers["X-Organization-Id"] = r.json()["id"]
+
+        r = client.post("/api/v1/projects", headers=headers, json={"name": "P"})
+        assert r.status_code == 201, r.text
+        project_id = r.json()["id"]
+        r = client.post("/api/v1/tasks", params={"project_id": project_id}, headers=headers, json={"title": "T"})
+        assert r.status_code == 201, r.text
+        # COPY goes through asyncpg's copy_records_to_table in this mode.
+        body = b'{"title": "I1"}\n{"title": ""}\n{"title": "I2", "status": "DONE"}\n'
+        r = client.post(f"/api/v1/projects/{project_id}/tasks:import", headers=headers, content=body)
+        assert r.status_code == 207, r.text
+        assert (r.json()["imported"], r.json()["failed"]) == (2, 1)
+
+        r = client.get("/api/v1/tasks", params={"project_id": project_id}, headers=headers)
+        assert r.status_code == 200, r.text
+        assert r.json()["total"] == 3
+        assert client.get("/api/v1/users/me", headers=headers).json()["email"] == email
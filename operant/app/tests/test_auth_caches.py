@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import queue
+
+from operant.app.core.cache import InvalidationBus, invalidation_bus
+from operant.app.core.memberships import membership_cache
+from operant.app.core.permissions import OrgRole
+from operant.app.core.principals import PRINCIPAL_CHANNEL, principal_cache
+from operant.app.db.notify import PgNotifyTransport
+from operant.app.services.auth_service import AuthService
+from operant.app.services.organization_service import OrganizationService
+
+
+def test_cached_principal_is_dropped_on_deactivation(client, monkeypatch):
+    relayed: list[tuple[str, str]] = []
+    monkeypatch.setattr(invalidation_bus, "transport", lambda channel, key: relayed.append((channel, key)))
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": "cache@example.com", "password": "Secret123!", "full_name": None},
+    )
+    r = client.post("/api/v1/auth/login", json={"email": "cache@example.com", "password": "Secret123!"})
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+    assert client.get("/api/v1/users/me", headers=headers).status_code == 200
+    hits = principal_cache.stats()["hits"]
+    r = client.get("/api/v1/users/me", headers=headers)
+    assert r.status_code == 200
+    assert principal_cache.stats()["hits"] == hits + 1
+
+    user_id = r.json()["id"]
+    assert client.delete("/api/v1/users/me", headers=headers).status_code == 204
+    # Relayed to the other workers, whose caches subscribe to the same channel.
+    assert relayed == [(PRINCIPAL_CHANNEL, user_id)]
+    assert client.get("/api/v1/organizations", headers=headers).status_code == 401
+    r = client.post("/api/v1/auth/login", json={"email": "cache@example.com", "password": "Secret123!"})
+    assert r.status_code == 401
+
+
+def test_principal_eviction_delivered_by_another_worker(client):
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": "remote@example.com", "password": "Secret123!", "full_name": None},
+    )
+    r = client.post("/api/v1/auth/login", json={"email": "remote@example.com", "password": "Secret123!"})
+    headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+    user_id = client.get("/api/v1/users/me", headers=headers).json()["id"]
+    token = headers["Authorization"].removeprefix("Bearer ")
+    assert principal_cache.get(token) is not None
+
+    invalidation_bus.deliver(PRINCIPAL_CHANNEL, user_id)
+    assert principal_cache.get(token) is None
+
+
+def test_membership_cache_serves_roles_and_is_invalidated_on_add_member(client, db):
+    auth = AuthService(db)
+    owner = auth.register(email="owner-mc@example.com", password="Secret123!", full_name=None)
+    member = auth.register(email="member-mc@example.com", password="Secret123!", full_name=None)
+    org = OrganizationService(db).create_org(creator_user_id=owner.id, name="Org MC", slug="org-mc")
+    access = auth.login(email="owner-mc@example.com", password="Secret123!").access_token
+    headers = {"Authorization": f"Bearer {access}", "X-Organization-Id": str(org.id)}
+
+    assert client.get("/api/v1/projects", headers=headers).status_code == 200
+    assert membership_cache.get((owner.id, org.id)).role == OrgRole.OWNER.value
+
+    membership_cache.set((member.id, org.id), membership_cache.get((owner.id, org.id)))
+    OrganizationService(db).add_member(organization_id=org.id, email=member.email, role=OrgRole.MEMBER.value)
+    assert membership_cache.get((member.id, org.id)) is None
+
+
+def test_pg_notify_transport_relays_between_workers(engine):
+    sender, receiver = InvalidationBus(), InvalidationBus()
+    received: queue.Queue[str] = queue.Queue()
+    resets: list[bool] = []
+    receiver.subscribe("test", received.put)
+    receiver.on_reset(lambda: resets.append(True))
+    sender.transport = PgNotifyTransport(sender, engine)
+    listener = PgNotifyTransport(receiver, engine, poll_seconds=0.1)
+    receiver.transport = listener
+    listener.start()
+    try:
+        assert listener.wait_connected(5)
+        assert resets == [True]  # a fresh listener may have missed messages: caches start cold
+
+        receiver.publish("test", "own")  # delivered locally; its NOTIFY echo is skipped
+        sender.publish("test", "remote")
+        assert [received.get(timeout=5), received.get(timeout=5)] == ["own", "remote"]
+        assert received.empty()
+    finally:
+        listener.stop()
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from email.utils import format_datetime, parsedate_to_datetime
+
+from operant.app.db.instrumentation import record_queries
+
+
+def _project(client, headers, name: str = "P") -> str:
+    return client.post("/api/v1/projects", headers=headers, json={"name": name}).json()["id"]
+
+
+def test_task_304_on_matching_etag_with_a_light_query(client, engine, make_org):
+    _, headers = make_org("cond-task")
+    project_id = _project(client, headers)
+    task_id = client.post(
+        "/api/v1/tasks", params={"project_id": project_id}, headers=headers, json={"title": "T"}
+    ).json()["id"]
+
+    r = client.get(f"/api/v1/tasks/{task_id}", headers=headers)
+    etag = r.headers["etag"]
+    assert etag.startswith('"') and r.headers["last-modified"].endswith("GMT")
+
+    with record_queries(engine) as stats:
+        r = client.get(f"/api/v1/tasks/{task_id}", headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+    assert r.headers["etag"] == etag
+    # Only the task's (project_id, updated_at) is read, not the rest of its row.
+    assert "tasks.description" not in stats.describe()
+
+    client.patch(f"/api/v1/tasks/{task_id}", headers=headers, json={"status": "DONE"})
+    r = client.get(f"/api/v1/tasks/{task_id}", headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+    assert r.json()["status"] == "DONE"
+
+
+def test_project_if_modified_since(client, make_org):
+    _, headers = make_org("cond-project")
+    project_id = _project(client, headers)
+    last_modified = client.get(f"/api/v1/projects/{project_id}", headers=headers).headers["last-modified"]
+
+    r = client.get(f"/api/v1/projects/{project_id}", headers={**headers, "If-Modified-Since": last_modified})
+    assert r.status_code == 304
+
+    earlier = format_datetime(parsedate_to_datetime(last_modified).replace(year=2000), usegmt=True)
+    r = client.get(f"/api/v1/projects/{project_id}", headers={**headers, "If-Modified-Since": earlier})
+    assert r.status_code == 200
+
+    # If-None-Match wins over If-Modified-Since.
+    r = client.get(
+        f"/api/v1/projects/{project_id}",
+        headers={**headers, "If-None-Match": 'W/"stale"', "If-Modified-Since": last_modified},
+    )
+    assert r.status_code == 200
+
+
+def test_conditional_get_keeps_the_org_checks(client, make_org):
+    _, headers = make_org("cond-foreign")
+    _, other_headers = make_org("cond-foreign-other")
+    project_id = _project(client, other_headers)
+
+    r = client.get(f"/api/v1/projects/{project_id}", headers={**headers, "If-None-Match": "*"})
+    assert r.status_code == 403
+
+
+def test_task_list_etag_follows_edits_deletes_and_params(client, make_org, assert_max_queries):
+    _, headers = make_org("cond-task-list")
+    project_id = _project(client, headers)
+    ids = [
+        client.post(
+            "/api/v1/tasks", params={"project_id": project_id}, headers=headers, json={"title": f"T{i}"}
+        ).json()["id"]
+        for i in range(3)
+    ]
+    params = {"project_id": project_id}
+
+    etag = client.get("/api/v1/tasks", params=params, headers=headers).headers["etag"]
+    # Project check plus max(updated_at)/count(*): the page itself is never fetched.
+    with assert_max_queries(2):
+        r = client.get("/api/v1/tasks", params=params, headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 304
+
+    other_page = client.get("/api/v1/tasks", params={**params, "limit": 1}, headers=headers)
+    assert other_page.headers["etag"] != etag
+    # Cursor pages carry no window totals; their ETag comes from the separate version query.
+    cursor = other_page.json()["next_cursor"]
+    r = client.get("/api/v1/tasks", params={**params, "limit": 1, "cursor": cursor}, headers=headers)
+    assert r.headers["etag"] not in (etag, other_page.headers["etag"])
+
+    client.patch(f"/api/v1/tasks/{ids[0]}", headers=headers, json={"title": "edited"})
+    r = client.get("/api/v1/tasks", params=params, headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+
+    # Deleting an older task leaves max(updated_at) alone; the count still moves the ETag.
+    client.delete(f"/api/v1/tasks/{ids[1]}", headers=headers)
+    r = client.get("/api/v1/tasks", params=params, headers={**headers, "If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.json()["total"] == 2
+
+
+def test_project_list_etag(client, make_org):
+    _, headers = make_org("cond-project-list")
+    _project(client, headers, "alpha")
+
+    r = client.get("/api/v1/projects", headers=headers)
+    etag = r.headers["etag"]
+    assert "last-modified" not in r.headers
+    assert client.get("/api/v1/projects", headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    _project(client, headers, "beta")
+    assert client.get("/api/v1/projects", headers={**headers, "If-None-Match": etag}).status_code == 200
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import os
+
+from sqlalchemy import text
+
+from operant.app.core import metrics
+from operant.app.core.config import settings
+from operant.app.db.engine import build_engine
+
+
+def _url() -> str:
+    return os.getenv("OPERANT_DATABASE_URL", settings.database_url)
+
+
+def test_pool_checkouts_are_instrumented_and_timeout_applied(monkeypatch):
+    monkeypatch.setattr(settings, "db_statement_timeout_ms", 1234)
+    eng = build_engine(_url(), name="test_direct")
+    try:
+        with eng.connect() as conn:
+            assert conn.execute(text("SHOW statement_timeout")).scalar_one() == "1234ms"
+            pool = metrics.snapshot()["db_pool_test_direct"]
+            assert pool["checked_out"] == 1
+        pool = metrics.snapshot()["db_pool_test_direct"]
+        assert pool["checkouts"] == 1
+        assert pool["checked_out"] == 0
+    finally:
+        eng.dispose()
+
+
+def test_pgbouncer_mode_sets_timeout_per_transaction(monkeypatch):
+    monkeypatch.setattr(settings, "db_statement_timeout_ms", 4321)
+    monkeypatch.setattr(settings, "db_pgbouncer_transaction_mode", True)
+    eng = build_engine(_url(), name="test_pgbouncer")
+    try:
+        with eng.begin() as conn:
+            assert conn.execute(text("SHOW statement_timeout")).scalar_one() == "4321ms"
+        with eng.connect() as conn:
+            # no session-level SET: outside a transaction the server default applies
+            assert conn.exec_driver_sql("SELECT current_setting('statement_timeout')").scalar_one() != ""
+    finally:
+        eng.dispose()
+
+
+def test_metrics_endpoint_needs_the_configured_token(client, monkeypatch):
+    assert client.get("/metrics").status_code == 404
+
+    monkeypatch.setattr(settings, "metrics_token", "scrape-me")
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+    r = client.get("/metrics", headers={"Authorization": "Bearer scrape-me"})
+    assert r.status_code == 200 and "password_hasher" in r.json()
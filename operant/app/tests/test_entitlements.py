@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from uuid import uuid4
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from operant.app.core.entitlements import org_plan_cache
+from operant.app.db.instrumentation import record_queries
+from operant.app.jobs.usage_reconcile import reconcile_usage
+from operant.app.models.org_usage import UsageResource
+from operant.app.repositories.usage_repository import UsageRepository
+from operant.app.services.entitlement_service import EntitlementService
+
+
+def _create_project(client, headers, name: str):
+    return client.post("/api/v1/projects", headers=headers, json={"name": name})
+
+
+def test_project_creation_skips_the_subscription_lookup_once_warm(client, engine, make_org):
+    _, headers = make_org("ent-warm")
+    _create_project(client, headers, "P0")
+
+    with record_queries(engine) as stats:
+        r = _create_project(client, headers, "P1")
+    assert r.status_code == 201
+    assert "subscriptions" not in stats.describe()
+    assert "plan_limits" not in stats.describe()
+
+
+def test_plan_change_reaches_the_cached_entitlements(client, make_org):
+    org, headers = make_org("ent-upgrade")
+    for i in range(5):
+        assert _create_project(client, headers, f"P{i}").status_code == 201
+    assert _create_project(client, headers, "P5").status_code == 403
+    assert org_plan_cache.get(org.id) == "FREE"
+
+    r = client.patch("/api/v1/organizations/subscription", headers=headers, json={"plan": "PRO"})
+    assert r.status_code == 200
+    assert org_plan_cache.get(org.id) is None
+    assert _create_project(client, headers, "P5").status_code == 201
+
+
+def test_unknown_plan_is_refused(client, make_org):
+    _, headers = make_org("ent-unknown")
+    r = client.patch("/api/v1/organizations/subscription", headers=headers, json={"plan": "GOLD"})
+    assert r.status_code == 409
+
+
+def test_plan_limits_come_from_the_table(db, client, make_org, set_plan_limits):
+    org, headers = make_org("ent-table")
+    assert EntitlementService(db).for_org(org.id).limits.max_projects == 5
+
+    set_plan_limits("FREE", max_projects=1)
+    assert _create_project(client, headers, "P0").status_code == 201
+    r = _create_project(client, headers, "P1")
+    assert r.status_code == 403
+    assert r.json()["error"]["message"] == "Limite de projetos do plano atingido"
+
+
+def _usage(db, org_id) -> dict[str, int]:
+    rows = db.execute(text("SELECT resource, used FROM org_usage WHERE organization_id = :o"), {"o": org_id})
+    return dict(rows.tuples().all())
+
+
+def test_project_slots_are_claimed_and_released_without_counting(client, db, engine, make_org):
+    org, headers = make_org("ent-usage")
+    ids = [_create_project(client, headers, f"P{i}").json()["id"] for i in range(4)]
+    assert _usage(db, org.id) == {"users": 1, "projects": 4}
+
+    with record_queries(engine) as stats:
+        assert _create_project(client, headers, "P4").status_code == 201
+    assert "count(" not in stats.describe()
+    assert _create_project(client, headers, "P5").status_code == 403
+
+    assert client.delete(f"/api/v1/projects/{ids[0]}", headers=headers).status_code == 204
+    assert client.delete(f"/api/v1/projects/{ids[0]}", headers=headers).status_code == 404
+    assert _usage(db, org.id)["projects"] == 4
+    assert _create_project(client, headers, "P5").status_code == 201
+
+
+def test_concurrent_claims_cannot_both_take_the_last_slot(engine):
+    org_id = uuid4()
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO organizations (id, name, slug, created_at, updated_at)"
+                " VALUES (:id, 'U', :slug, now(), now())"
+            ),
+            {"id": org_id, "slug": f"usage-{org_id.hex[:8]}"},
+        )
+    try:
+        with Session(engine) as first, Session(engine) as second:
+            assert UsageRepository(first).claim(org_id, UsageResource.PROJECTS, limit=1)
+            # The second claim waits on the row lock, then sees the first one's committed value.
+            with ThreadPoolExecutor(1) as pool:
+                late = pool.submit(UsageRepository(second).claim, org_id, UsageResource.PROJECTS, 1)
+                time.sleep(0.2)
+                assert not late.done()
+                first.commit()
+                assert late.result(timeout=5) is False
+            second.rollback()
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM organizations WHERE id = :id"), {"id": org_id})
+
+
+def test_reconcile_rebuilds_usage_from_projects_and_members(client, db, make_org):
+    org, headers = make_org("ent-reconcile")
+    _create_project(client, headers, "P0")
+    db.execute(text("UPDATE org_usage SET used = 40 WHERE organization_id = :o"), {"o": org.id})
+
+    reconcile_usage(lambda: nullcontext(db), organization_id=org.id)
+    assert _usage(db, org.id) == {"users": 1, "projects": 1}
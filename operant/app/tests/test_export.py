@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import csv
+import io
+import json
+import os
+
+import anyio
+import pytest
+from sqlalchemy import text
+
+from operant.app.api.export import _accepts_gzip
+
+EXPORT_ROWS = 1_000_000
+RSS_CEILING_BYTES = 80 * 1024 * 1024
+
+
+def _rss_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def _seed(client, db, headers, rows: int) -> str:
+    project_id = client.post("/api/v1/projects", headers=headers, json={"name": "Export"}).json()["id"]
+    db.execute(
+        text(
+            """INSERT INTO tasks (id, created_at, updated_at, project_id, title, description, status)
+               SELECT gen_random_uuid(), now() + g * interval '1 microsecond', now(), :p, 'Task ' || g,
+                      CASE WHEN g % 2 = 0 THEN 'with "quotes", commas' END, 'TODO'
+               FROM generate_series(1, :n) g"""
+        ),
+        {"p": project_id, "n": rows},
+    )
+    return project_id
+
+
+def test_export_formats(client, db, make_org):
+    _, headers = make_org("export-formats")
+    project_id = _seed(client, db, headers, rows=5)
+    url = f"/api/v1/projects/{project_id}/tasks:export"
+
+    r = client.get(url, headers=headers)
+    assert r.headers["content-type"] == "application/x-ndjson"
+    assert r.headers["content-encoding"] == "gzip"  # httpx asks for gzip by default and decodes it
+    lines = [json.loads(line) for line in r.text.splitlines()]
+    assert [line["title"] for line in lines] == [f"Task {i}" for i in range(1, 6)]
+    assert lines[1]["description"] == 'with "quotes", commas'
+
+    r = client.get(url, headers={**headers, "Accept-Encoding": "identity"}, params={"format": "csv"})
+    assert "content-encoding" not in r.headers
+    rows = list(csv.reader(io.StringIO(r.text)))
+    assert rows[0] == ["id", "title", "description", "status", "created_at", "updated_at"]
+    assert len(rows) == 6 and rows[2][2] == 'with "quotes", commas'
+
+    projects = client.get("/api/v1/projects:export", headers=headers, params={"format": "csv"}).text
+    assert projects.splitlines()[0] == "id,name,description,created_at,updated_at"
+    assert client.get(url, headers=headers, params={"format": "xml"}).status_code == 422
+
+
+def test_gzip_is_negotiated_per_token():
+    assert _accepts_gzip("gzip, deflate, br")
+    assert _accepts_gzip("br;q=1.0, GZIP;q=0.5")
+    assert not _accepts_gzip("gzip;q=0")
+    assert not _accepts_gzip("x-gzip, identity")
+    assert not _accepts_gzip("")
+
+
+def _drain(app, path: str, headers: dict[str, str]) -> tuple[int, int]:
+    """Run one GET straight through the ASGI app, counting body lines and sampling RSS as chunks
+    arrive and dropping them (TestClient would buffer the whole body)."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.4"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        "client": ("test", 1),
+        "server": ("test", 80),
+    }
+    lines, peak = 0, _rss_bytes()
+
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if requested:
+            # The client never disconnects; the response ends the exchange.
+            await anyio.sleep_forever()
+        requested = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal lines, peak
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200
+        elif message["type"] == "http.response.body":
+            lines += message.get("body", b"").count(b"\n")
+            peak = max(peak, _rss_bytes())
+
+    anyio.run(app, scope, receive, send)
+    return lines, peak
+
+
+@pytest.mark.skipif(
+    not os.getenv("OPERANT_SLOW_TESTS"), reason="seeds 1M rows; set OPERANT_SLOW_TESTS=1 to run"
+)
+def test_export_streams_a_million_rows_in_constant_memory(client, db, make_org):
+    _, headers = make_org("export-million")
+    project_id = _seed(client, db, headers, rows=EXPORT_ROWS)
+
+    baseline = _rss_bytes()
+    lines, peak = _drain(client.app, f"/api/v1/projects/{project_id}/tasks:export", headers)
+    assert lines == EXPORT_ROWS
+    assert peak - baseline < RSS_CEILING_BYTES, f"RSS cresceu {(peak - baseline) / 2**20:.0f} MiB"
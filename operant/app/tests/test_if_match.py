@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+
+def _project(client, headers, name: str = "P") -> str:
+    return client.post("/api/v1/projects", headers=headers, json={"name": name}).json()["id"]
+
+
+def _task(client, headers, project_id: str, title: str = "T"):
+    return client.post("/api/v1/tasks", params={"project_id": project_id}, headers=headers, json={"title": title})
+
+
+def test_task_patch_with_if_match_prevents_lost_updates(client, make_org):
+    _, headers = make_org("ifm-task")
+    created = _task(client, headers, _project(client, headers))
+    task_id, etag = created.json()["id"], created.headers["etag"]
+    assert created.json()["version"] == 1
+    assert client.get(f"/api/v1/tasks/{task_id}", headers=headers).headers["etag"] == etag
+
+    # Two clients hold the same version: the first write wins, the second is refused.
+    r = client.patch(f"/api/v1/tasks/{task_id}", headers={**headers, "If-Match": etag}, json={"title": "A"})
+    assert r.status_code == 200, r.text
+    assert r.json()["version"] == 2
+    new_etag = r.headers["etag"]
+    assert new_etag != etag
+
+    r = client.patch(f"/api/v1/tasks/{task_id}", headers={**headers, "If-Match": etag}, json={"title": "B"})
+    assert r.status_code == 412
+    assert r.json()["error"]["code"] == "precondition_failed"
+    assert client.get(f"/api/v1/tasks/{task_id}", headers=headers).json()["title"] == "A"
+
+    # Strong comparison: a weak tag never matches; `*` and no header are unconditional.
+    weak = {**headers, "If-Match": f"W/{new_etag}"}
+    assert client.patch(f"/api/v1/tasks/{task_id}", headers=weak, json={"title": "C"}).status_code == 412
+    any_version = {**headers, "If-Match": "*"}
+    assert client.patch(f"/api/v1/tasks/{task_id}", headers=any_version, json={"title": "C"}).status_code == 200
+    r = client.patch(f"/api/v1/tasks/{task_id}", headers=headers, json={"status": "DONE"})
+    assert (r.json()["version"], r.json()["status"]) == (4, "DONE")
+    summary = client.get(f"/api/v1/projects/{r.json()['project_id']}/summary", headers=headers).json()
+    assert summary["counts"]["DONE"] == 1
+
+
+def test_project_patch_with_if_match(client, make_org):
+    _, headers = make_org("ifm-project")
+    created = client.post("/api/v1/projects", headers=headers, json={"name": "P"})
+    project_id, etag = created.json()["id"], created.headers["etag"]
+
+    r = client.patch(f"/api/v1/projects/{project_id}", headers={**headers, "If-Match": etag}, json={"name": "Q"})
+    assert r.status_code == 200
+    assert r.headers["etag"] == client.get(f"/api/v1/projects/{project_id}", headers=headers).headers["etag"]
+
+    r = client.patch(f"/api/v1/projects/{project_id}", headers={**headers, "If-Match": etag}, json={"name": "R"})
+    assert r.status_code == 412
+    # Another resource's ETag does not match either.
+    other = client.post("/api/v1/projects", headers=headers, json={"name": "O"}).headers["etag"]
+    r = client.patch(f"/api/v1/projects/{project_id}", headers={**headers, "If-Match": other}, json={"name": "R"})
+    assert r.status_code == 412
+    assert client.get(f"/api/v1/projects/{project_id}", headers=headers).json()["name"] == "Q"
+
+
+def test_batch_update_with_versions_is_all_or_nothing(client, make_org):
+    _, headers = make_org("ifm-batch")
+    project_id = _project(client, headers)
+    first, second = (_task(client, headers, project_id, f"T{i}").json() for i in range(2))
+    client.patch(f"/api/v1/tasks/{second['id']}", headers=headers, json={"title": "moved on"})
+
+    body = {
+        "ids": [first["id"], second["id"]],
+        "versions": {first["id"]: 1, second["id"]: 1},
+        "patch": {"status": "DONE"},
+    }
+    r = client.patch("/api/v1/tasks:batch", headers=headers, json=body)
+    assert r.status_code == 412
+    assert client.get(f"/api/v1/tasks/{first['id']}", headers=headers).json()["status"] == "TODO"
+
+    body["versions"][second["id"]] = 2
+    r = client.patch("/api/v1/tasks:batch", params={"return_rows": True}, headers=headers, json=body)
+    assert r.status_code == 200, r.text
+    assert sorted(item["version"] for item in r.json()["items"]) == [2, 3]
+
+    body["versions"] = {first["id"]: 2}
+    assert client.patch("/api/v1/tasks:batch", headers=headers, json=body).status_code == 422
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event, text
+
+from operant.app.repositories.membership_repository import MembershipRepository
+from operant.app.repositories.organization_repository import OrganizationRepository
+from operant.app.repositories.project_repository import ProjectRepository
+from operant.app.repositories.task_repository import TaskRepository
+
+BIG_TABLES = {"tasks", "projects", "memberships"}
+
+_SEED = [
+    """INSERT INTO organizations (id, created_at, updated_at, name, slug)
+       SELECT gen_random_uuid(), now(), now(), 'Org ' || g, 'plan-org-' || g FROM generate_series(1, 50) g""",
+    """INSERT INTO projects (id, created_at, updated_at, organization_id, name)
+       SELECT gen_random_uuid(), now() - g * interval '1 minute', now(), o.id, 'Projeto ' || g
+       FROM organizations o CROSS JOIN generate_series(1, 40) g WHERE o.slug LIKE 'plan-org-%'""",
+    """INSERT INTO tasks (id, created_at, updated_at, project_id, title, status)
+       SELECT gen_random_uuid(), now() - g * interval '1 second', now(), p.id, 'Tarefa ' || g,
+              (ARRAY['TODO', 'IN_PROGRESS', 'DONE'])[1 + g % 3]
+       FROM projects p CROSS JOIN generate_series(1, 25) g""",
+    """INSERT INTO users (id, created_at, updated_at, email, password_hash, is_active)
+       SELECT gen_random_uuid(), now(), now(), 'plan-' || g || '@example.com', 'x', true
+       FROM generate_series(1, 2000) g""",
+    """INSERT INTO memberships (id, created_at, updated_at, user_id, organization_id, role)
+       SELECT gen_random_uuid(), now(), now(), u.id, o.id, 'MEMBER'
+       FROM (SELECT id, row_number() OVER (ORDER BY id) AS n FROM users WHERE email LIKE 'plan-%') u
+       JOIN (SELECT id, row_number() OVER (ORDER BY id) AS n FROM organizations
+             WHERE slug LIKE 'plan-org-%') o ON o.n = 1 + u.n % 50""",
+    "ANALYZE organizations, projects, tasks, users, memberships",
+]
+
+
+@pytest.fixture()
+def seeded(db):
+    for statement in _SEED:
+        db.execute(text(statement))
+    org_id = db.execute(text("SELECT id FROM organizations WHERE slug = 'plan-org-7'")).scalar_one()
+    by_org = {"o": org_id}
+    project_id = db.execute(text("SELECT id FROM projects WHERE organization_id = :o LIMIT 1"), by_org).scalar_one()
+    user_id = db.execute(text("SELECT user_id FROM memberships WHERE organization_id = :o LIMIT 1"), by_org).scalar_one()
+    return {"org_id": org_id, "project_id": project_id, "user_id": user_id}
+
+
+@contextmanager
+def _captured(db) -> Iterator[list[tuple[str, object]]]:
+    seen: list[tuple[str, object]] = []
+    conn = db.connection()
+
+    def _capture(_conn, _cursor, statement, parameters, _context, _executemany):
+        seen.append((statement, parameters))
+
+    event.listen(conn, "before_cursor_execute", _capture)
+    try:
+        yield seen
+    finally:
+        event.remove(conn, "before_cursor_execute", _capture)
+
+
+def _scans(plan: dict) -> Iterator[tuple[str, str | None]]:
+    yield plan["Node Type"], plan.get("Relation Name")
+    for child in plan.get("Plans", []):
+        yield from _scans(child)
+
+
+def _assert_indexed(db, statements) -> None:
+    conn = db.connection()
+    for statement, parameters in statements:
+        plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar_one()[0]["Plan"]
+        scans = list(_scans(plan))
+        seq = [rel for node, rel in scans if node == "Seq Scan" and rel in BIG_TABLES]
+        assert not seq, f"seq scan em {seq}:\n{statement}"
+        assert any("Index" in node for node, _ in scans), statement
+
+
+@pytest.mark.parametrize("status", [None, "DONE"])
+@pytest.mark.parametrize("sort", ["created_at", "title"])
+def test_task_list_queries_use_indexes(db, seeded, status, sort):
+    with _captured(db) as statements:
+        TaskRepository(db).list_for_project(
+            seeded["project_id"], status=status, sort=sort, order="desc", limit=20, offset=0
+        )
+    _assert_indexed(db, statements)
+
+
+def test_keyset_page_seeks_the_composite_index(db, seeded):
+    repo = TaskRepository(db)
+    first = repo.list_for_project(
+        seeded["project_id"], status=None, sort="created_at", order="desc", limit=5, offset=0
+    )
+    with _captured(db) as statements:
+        repo.list_for_project(
+            seeded["project_id"],
+            status=None,
+            sort="created_at",
+            order="desc",
+            limit=5,
+            offset=0,
+            after=first.next_key,
+        )
+    _assert_indexed(db, statements)
+
+
+@pytest.mark.parametrize("q", [None, "jeto 1"])
+@pytest.mark.parametrize("sort", ["created_at", "name"])
+def test_project_list_queries_use_indexes(db, seeded, q, sort):
+    with _captured(db) as statements:
+        ProjectRepository(db).list_for_org(seeded["org_id"], q=q, sort=sort, order="asc", limit=20, offset=0)
+    _assert_indexed(db, statements)
+
+
+def test_membership_and_organization_list_queries_use_indexes(db, seeded):
+    with _captured(db) as statements:
+        MembershipRepository(db).list_members(seeded["org_id"], limit=20, offset=0)
+        OrganizationRepository(db).list_for_user(seeded["user_id"], limit=20, offset=0)
+    _assert_indexed(db, statements)
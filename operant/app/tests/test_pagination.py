@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from sqlalchemy import text
+
+
+def _seed(client, db, make_org, slug: str, tasks: int):
+    _, headers = make_org(slug)
+    project_id = client.post("/api/v1/projects", headers=headers, json={"name": "P"}).json()["id"]
+    # Identical created_at values: only the id tie-breaker keeps pages disjoint.
+    db.execute(
+        text(
+            """INSERT INTO tasks (id, created_at, updated_at, project_id, title, status)
+               SELECT gen_random_uuid(), '2026-01-01', now(), :p, 'T' || (g % 4), 'TODO'
+               FROM generate_series(1, :n) g"""
+        ),
+        {"p": project_id, "n": tasks},
+    )
+    return headers, project_id
+
+
+def _walk(client, headers, params):
+    seen, cursor = [], None
+    while True:
+        page = client.get("/api/v1/tasks", headers=headers, params={**params, "cursor": cursor}).json()
+        seen += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return seen
+
+
+def test_cursor_pages_cover_every_row_once_in_offset_order(client, db, make_org):
+    headers, project_id = _seed(client, db, make_org, "keyset-walk", tasks=23)
+    for sort, order in [("created_at", "desc"), ("title", "asc")]:
+        params = {"project_id": project_id, "sort": sort, "order": order, "limit": 5}
+        by_cursor = _walk(client, headers, params)
+        by_offset = client.get("/api/v1/tasks", headers=headers, params={**params, "limit": 100}).json()
+        assert by_cursor == [item["id"] for item in by_offset["items"]]
+        assert len(set(by_cursor)) == 23
+
+
+def test_tampered_or_mismatched_cursor_is_rejected(client, db, make_org):
+    headers, project_id = _seed(client, db, make_org, "keyset-bad", tasks=3)
+    params = {"project_id": project_id, "limit": 1}
+    cursor = client.get("/api/v1/tasks", headers=headers, params=params).json()["next_cursor"]
+
+    body, signature = cursor.split(".")
+    forged = body[:-2] + ("AA" if body[-2:] != "AA" else "BB") + "." + signature
+    r = client.get("/api/v1/tasks", headers=headers, params={**params, "cursor": forged})
+    assert r.status_code == 400
+    assert r.json()["error"]["code"] == "bad_request"
+
+    r = client.get("/api/v1/tasks", headers=headers, params={**params, "cursor": cursor, "sort": "title"})
+    assert r.status_code == 400
+
+
+def test_total_modes(client, db, make_org, monkeypatch):
+    headers, project_id = _seed(client, db, make_org, "keyset-total", tasks=12)
+    params = {"project_id": project_id, "limit": 5}
+
+    exact = client.get("/api/v1/tasks", headers=headers, params=params).json()
+    assert (exact["total"], exact["total_capped"], exact["has_more"]) == (12, False, True)
+    # Past the end the window has no row to ride on; the separate count still answers.
+    beyond = client.get("/api/v1/tasks", headers=headers, params={**params, "offset": 50}).json()
+    assert (beyond["items"], beyond["total"], beyond["has_more"]) == ([], 12, False)
+
+    monkeypatch.setattr("operant.app.repositories.pagination.settings.list_count_cap", 10)
+    estimate = client.get("/api/v1/tasks", headers=headers, params={**params, "include_total": "estimate"}).json()
+    assert (estimate["total"], estimate["total_capped"]) == (10, True)
+
+    none = client.get("/api/v1/tasks", headers=headers, params={**params, "include_total": "none"}).json()
+    assert none["total"] is None and none["has_more"] and len(none["items"]) == 5
+
+    last = client.get(
+        "/api/v1/tasks", headers=headers, params={**params, "include_total": "none", "offset": 10}
+    ).json()
+    assert len(last["items"]) == 2 and not last["has_more"]
+
+    r = client.get("/api/v1/tasks", headers=headers, params={**params, "include_total": "approx"})
+    assert r.status_code == 422
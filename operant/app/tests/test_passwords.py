@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import pytest
+
+from operant.app.core.errors import ServiceUnavailableError
+from operant.app.core.passwords import PasswordHasher, calibrate_bcrypt_rounds, password_hasher
+from operant.app.core.security import bcrypt_cost
+from operant.app.services.auth_service import AuthService
+
+
+def test_calibration_stays_within_bounds():
+    assert calibrate_bcrypt_rounds(0, min_rounds=4, max_rounds=8) == 4
+    assert calibrate_bcrypt_rounds(10**9, min_rounds=4, max_rounds=8) == 8
+
+
+def test_saturated_hasher_rejects_with_503():
+    hasher = PasswordHasher(workers=0, max_pending=0, rounds=4, timeout_seconds=1)
+    with pytest.raises(ServiceUnavailableError):
+        hasher.hash("Secret123!")
+    assert hasher.metrics()["rejected"] == 1
+
+
+def test_login_rehashes_outdated_cost(db, monkeypatch):
+    monkeypatch.setattr(password_hasher, "rounds", 4)
+    auth = AuthService(db)
+    user = auth.register(email="rehash@example.com", password="Secret123!", full_name=None)
+    assert bcrypt_cost(user.password_hash) == 4
+
+    monkeypatch.setattr(password_hasher, "rounds", 5)
+    assert password_hasher.needs_rehash(user.password_hash)
+    auth.login(email="rehash@example.com", password="Secret123!")
+    db.refresh(user)
+    assert bcrypt_cost(user.password_hash) == 5
+    assert not password_hasher.needs_rehash(user.password_hash)
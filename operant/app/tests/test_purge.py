@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import re
+from contextlib import nullcontext
+
+from sqlalchemy import select, text
+
+from operant.app.core.config import settings
+from operant.app.db.instrumentation import record_queries
+from operant.app.jobs.purge import run_purges
+from operant.app.models.organization import Organization
+from operant.app.models.project import Project
+from operant.app.models.subscription import Subscription
+from operant.app.services.auth_service import AuthService
+
+
+def _project_with_tasks(client, db, headers, tasks: int) -> str:
+    project_id = client.post("/api/v1/projects", headers=headers, json={"name": "Big"}).json()["id"]
+    items = [{"title": f"T{i}"} for i in range(tasks)]
+    r = client.post("/api/v1/tasks:batch", params={"project_id": project_id}, headers=headers, json={"items": items})
+    assert r.status_code == 201, r.text
+    return project_id
+
+
+def _task_count(db, project_id) -> int:
+    return db.execute(text("SELECT count(*) FROM tasks WHERE project_id = :p"), {"p": project_id}).scalar_one()
+
+
+def test_small_project_is_deleted_with_one_statement(client, db, engine, make_org):
+    _, headers = make_org("purge-small")
+    project_id = _project_with_tasks(client, db, headers, 3)
+
+    with record_queries(engine) as stats:
+        r = client.delete(f"/api/v1/projects/{project_id}", headers=headers)
+    assert r.status_code == 204
+    # The tasks go through ON DELETE CASCADE: never loaded, never deleted one by one.
+    assert not re.search(r"\btasks\b", stats.describe())
+    assert _task_count(db, project_id) == 0
+
+
+def test_large_project_is_tombstoned_and_purged_in_chunks(client, db, make_org, monkeypatch):
+    monkeypatch.setattr(settings, "purge_sync_max_tasks", 2)
+    _, headers = make_org("purge-large")
+    _, other_headers = make_org("purge-large-other")
+    project_id = _project_with_tasks(client, db, headers, 5)
+
+    r = client.delete(f"/api/v1/projects/{project_id}", headers=headers)
+    assert r.status_code == 202, r.text
+    job = r.json()
+    assert (job["status"], job["total_tasks"], job["deleted_tasks"]) == ("pending", 5, 0)
+    assert r.headers["location"] == f"/api/v1/purges/{job['id']}"
+
+    # Gone for the API at once, while its tasks are still there.
+    assert client.get(f"/api/v1/projects/{project_id}", headers=headers).status_code == 404
+    assert client.get("/api/v1/projects", headers=headers).json()["total"] == 0
+    assert client.get("/api/v1/organizations/current/summary", headers=headers).json()["projects"] == 0
+    assert _task_count(db, project_id) == 5
+    assert client.get(r.headers["location"], headers=other_headers).status_code == 404
+
+    batches: list[int] = []
+    progress = run_purges(
+        lambda: nullcontext(db), batch_size=2, pause_ms=0, on_progress=lambda p: batches.append(p.tasks_deleted)
+    )
+
+    assert batches == [2, 4, 5]
+    assert (progress.jobs_finished, progress.tasks_deleted) == (1, 5)
+    db.expire_all()
+    assert db.get(Project, project_id) is None
+    done = client.get(r.headers["location"], headers=headers).json()
+    assert (done["status"], done["deleted_tasks"]) == ("done", 5)
+    assert done["finished_at"] is not None
+
+
+def test_org_offboarding_revokes_access_then_purges_everything(client, db, make_org, monkeypatch):
+    monkeypatch.setattr(settings, "purge_sync_max_tasks", 2)
+    org, headers = make_org("purge-org")
+    AuthService(db).register(email="purge-org-member@example.com", password="Secret123!", full_name=None)
+    client.post("/api/v1/organizations/members", headers=headers, json={"email": "purge-org-member@example.com"})
+    login = client.post(
+        "/api/v1/auth/login", json={"email": "purge-org-member@example.com", "password": "Secret123!"}
+    ).json()
+    member_headers = {"Authorization": f"Bearer {login['access_token']}", "X-Organization-Id": str(org.id)}
+    assert client.get("/api/v1/projects", headers=member_headers).status_code == 200  # role now cached
+    project_id = _project_with_tasks(client, db, headers, 3)
+
+    r = client.delete("/api/v1/organizations/current", headers=headers)
+    assert r.status_code == 202, r.text
+    assert r.json()["kind"] == "organization"
+
+    assert client.get("/api/v1/projects", headers=member_headers).status_code == 403
+    assert client.get("/api/v1/organizations/current", headers=headers).status_code == 404
+    assert client.get("/api/v1/organizations", headers=headers).json()["total"] == 0
+
+    org_id = org.id
+    run_purges(lambda: nullcontext(db), batch_size=2, pause_ms=0)
+
+    db.expire_all()
+    assert db.get(Organization, org_id) is None
+    assert _task_count(db, project_id) == 0
+    assert db.execute(select(Subscription).where(Subscription.organization_id == org_id)).first() is None
+    assert client.get(r.headers["location"], headers=headers).json()["status"] == "done"
+
+
+def test_small_org_is_offboarded_at_once(client, db, make_org):
+    org, headers = make_org("purge-org-small")
+    _project_with_tasks(client, db, headers, 1)
+
+    org_id = org.id
+    assert client.delete("/api/v1/organizations/current", headers=headers).status_code == 204
+    db.expire_all()
+    assert db.get(Organization, org_id) is None
+
+
+def test_only_owners_offboard(client, make_org):
+    org, headers = make_org("purge-org-admin")
+    client.post("/api/v1/auth/register", json={"email": "purge-admin@example.com", "password": "Secret123!"})
+    client.post(
+        "/api/v1/organizations/members", headers=headers, json={"email": "purge-admin@example.com", "role": "ADMIN"}
+    )
+    login = client.post("/api/v1/auth/login", json={"email": "purge-admin@example.com", "password": "Secret123!"})
+    admin_headers = {"Authorization": f"Bearer {login.json()['access_token']}", "X-Organization-Id": str(org.id)}
+
+    assert client.delete("/api/v1/organizations/current", headers=admin_headers).status_code == 403
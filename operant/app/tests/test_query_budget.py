@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import select
+
+from operant.app.api.middleware import _report
+from operant.app.core.config import settings
+from operant.app.db.instrumentation import track_queries
+from operant.app.models.user import User
+
+
+def test_list_tasks_query_budget(client, make_org, assert_max_queries, monkeypatch):
+    _, headers = make_org("budget-tasks")
+    project_id = client.post("/api/v1/projects", headers=headers, json={"name": "P"}).json()["id"]
+    for i in range(3):
+        client.post("/api/v1/tasks", params={"project_id": project_id}, headers=headers, json={"title": f"T{i}"})
+
+    # Warm principal and membership caches; then: project check, page (total via count(*) OVER ()).
+    client.get("/api/v1/tasks", params={"project_id": project_id}, headers=headers)
+    with assert_max_queries(2):
+        r = client.get("/api/v1/tasks", params={"project_id": project_id}, headers=headers)
+    assert r.status_code == 200
+    assert r.json()["total"] == 3
+    # Debug headers are off unless enabled (dev/test only).
+    assert "X-DB-Query-Count" not in r.headers
+
+    monkeypatch.setattr(settings, "query_stats_headers", True)
+    r = client.get("/api/v1/tasks", params={"project_id": project_id}, headers=headers)
+    assert r.headers["X-DB-Query-Count"] == "2"
+    assert r.headers["Server-Timing"].startswith("db;dur=")
+
+
+def test_repeated_statements_are_reported_as_n_plus_one(db, caplog):
+    with track_queries() as stats:
+        for _ in range(5):
+            db.execute(select(User).where(User.email == "nobody@example.com")).first()
+    assert stats.count == 5
+    assert len(stats.repeated(5)) == 1
+
+    with caplog.at_level(logging.WARNING, logger="operant.app.api.middleware"):
+        _report({"method": "GET", "path": "/x"}, stats)
+    assert "possível N+1, 5x" in caplog.text
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from contextlib import nullcontext
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+
+from operant.app.core.errors import UnauthorizedError
+from operant.app.core.security import decode_refresh_token, now_utc
+from operant.app.jobs.refresh_token_purge import purge_refresh_tokens
+from operant.app.repositories.refresh_token_repository import RefreshTokenRepository
+from operant.app.services.auth_service import AuthService
+
+
+def test_refresh_reuse_revokes_the_whole_family(db):
+    auth = AuthService(db)
+    auth.register(email="rotate@example.com", password="Secret123!", full_name=None)
+    first = auth.login(email="rotate@example.com", password="Secret123!")
+
+    second = auth.refresh(refresh_token=first.refresh_token)
+    _, first_jti, _ = decode_refresh_token(first.refresh_token)
+    _, second_jti, _ = decode_refresh_token(second.refresh_token)
+    assert RefreshTokenRepository(db).get(first_jti).replaced_by == second_jti
+
+    with pytest.raises(UnauthorizedError):
+        auth.refresh(refresh_token=first.refresh_token)
+    db.expire_all()
+    assert RefreshTokenRepository(db).get(second_jti).revoked_at is not None
+    with pytest.raises(UnauthorizedError):
+        auth.refresh(refresh_token=second.refresh_token)
+
+
+def test_purge_removes_expired_and_long_revoked_tokens_in_batches(db):
+    user = AuthService(db).register(email="purge@example.com", password="Secret123!", full_name=None)
+    repo = RefreshTokenRepository(db)
+    now = now_utc()
+    for i in range(5):
+        repo.create(token_id=uuid4(), user_id=user.id, fingerprint_hash=f"{i}", expires_at=now - timedelta(days=1))
+    old_revoked = repo.create(
+        token_id=uuid4(), user_id=user.id, fingerprint_hash="r", expires_at=now + timedelta(days=1)
+    )
+    repo.revoke(old_revoked, revoked_at=now - timedelta(days=30), replaced_by=None)
+    live = repo.create(token_id=uuid4(), user_id=user.id, fingerprint_hash="l", expires_at=now + timedelta(days=1))
+    live_id, old_revoked_id = live.id, old_revoked.id
+    db.commit()
+
+    seen: list[int] = []
+    progress = purge_refresh_tokens(
+        lambda: nullcontext(db),
+        batch_size=2,
+        pause_ms=0,
+        revoked_retention_seconds=24 * 3600,
+        on_progress=lambda p: seen.append(p.batches),
+    )
+
+    assert (progress.expired_deleted, progress.revoked_deleted) == (5, 1)
+    assert seen == list(range(1, progress.batches + 1))
+    db.expire_all()
+    assert repo.get(live_id) is not None
+    assert repo.get(old_revoked_id) is None
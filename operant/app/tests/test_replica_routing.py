@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from operant.app.core.cache import TTLCache
+from operant.app.db.replica import STICKY_COOKIE, replica_router
+
+
+@pytest.fixture()
+def replica(monkeypatch, engine):
+    # The "replica" is a separate connection to the test database: it cannot see the rows the
+    # test transaction has not committed, which makes the routing decision observable.
+    monkeypatch.setattr(replica_router, "url", str(engine.url))
+    monkeypatch.setattr(replica_router, "_sessionmaker", sessionmaker(bind=engine))
+    monkeypatch.setattr(replica_router, "_recent_writers", TTLCache(100, ttl_seconds=60))
+    monkeypatch.setattr(replica_router, "_checked_at", float("-inf"))
+    monkeypatch.setattr(replica_router, "_healthy", False)
+    return replica_router
+
+
+def test_reads_follow_the_writer_then_move_to_the_replica(client, make_org, replica):
+    _, headers = make_org("replica-sticky")
+    assert client.post("/api/v1/projects", headers=headers, json={"name": "P"}).status_code == 201
+
+    # Right after the write the user is pinned to the primary and sees their own project.
+    assert client.get("/api/v1/projects", headers=headers).json()["total"] == 1
+    assert replica.stats()["sticky_reads"] >= 1
+
+    # Another worker has no local mark, but the cookie set by the write still pins the user.
+    replica._recent_writers.clear()
+    assert client.cookies.get(STICKY_COOKIE)
+    assert client.get("/api/v1/projects", headers=headers).json()["total"] == 1
+
+    forged = client.cookies.get(STICKY_COOKIE).replace(":", ":9", 1)
+    client.cookies.clear()
+    client.cookies.set(STICKY_COOKIE, forged)
+    assert client.get("/api/v1/projects", headers=headers).json()["total"] == 0
+    assert replica.stats()["healthy"] is True
+    assert replica.stats()["lag_seconds"] == 0
+
+
+def test_unreachable_replica_falls_back_to_the_primary(client, make_org, replica, monkeypatch):
+    unreachable = create_engine("postgresql+psycopg2://nobody@127.0.0.1:1/nowhere")
+    monkeypatch.setattr(replica, "_sessionmaker", sessionmaker(bind=unreachable))
+    _, headers = make_org("replica-down")
+    assert client.post("/api/v1/projects", headers=headers, json={"name": "P"}).status_code == 201
+    replica._recent_writers.clear()
+    client.cookies.clear()
+
+    before = replica.stats()["primary_reads"]
+    assert client.get("/api/v1/projects", headers=headers).json()["total"] == 1
+    assert replica.stats()["healthy"] is False
+    assert replica.stats()["primary_reads"] == before + 1
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+from operant.app.core.response_cache import (
+    CachedResponse,
+    MemoryBackend,
+    ResponseCache,
+    SharedStoreBackend,
+    set_response_cache,
+)
+from operant.app.db.instrumentation import record_queries
+from operant.app.services.auth_service import AuthService
+
+
+@pytest.fixture()
+def response_cache():
+    cache = ResponseCache(MemoryBackend(max_bytes=1 << 20, max_entries=100), ttl_seconds=60)
+    set_response_cache(cache)
+    yield cache
+    set_response_cache(None)
+
+
+class FakeStore:
+    """The GET/SET/MGET/INCR/EXPIRE/DELETE subset of a redis client, in memory."""
+
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+        self.down = False
+        self._lock = threading.Lock()
+
+    def _check(self):
+        if self.down:
+            raise ConnectionError("store down")
+
+    def get(self, key):
+        self._check()
+        return self.data.get(key)
+
+    def mget(self, keys):
+        self._check()
+        return [self.data.get(key) for key in keys]
+
+    def set(self, key, value, *, nx=False, px=None):
+        self._check()
+        with self._lock:
+            if nx and key in self.data:
+                return None
+            self.data[key] = value
+            return True
+
+    def incr(self, key):
+        self._check()
+        with self._lock:
+            value = int(self.data.get(key, b"0")) + 1
+            self.data[key] = str(value).encode()
+            return value
+
+    def expire(self, key, seconds):
+        self._check()
+        return True
+
+    def delete(self, key):
+        self._check()
+        return int(self.data.pop(key, None) is not None)
+
+
+def _project(client, headers, name: str = "P") -> str:
+    return client.post("/api/v1/projects", headers=headers, json={"name": name}).json()["id"]
+
+
+def _task(client, headers, project_id: str, title: str = "T") -> str:
+    r = client.post("/api/v1/tasks", params={"project_id": project_id}, headers=headers, json={"title": title})
+    return r.json()["id"]
+
+
+def test_task_list_hit_issues_no_queries(client, engine, make_org, response_cache):
+    _, headers = make_org("rc-hit")
+    project_id = _project(client, headers)
+    _task(client, headers, project_id)
+    params = {"project_id": project_id}
+
+    first = client.get("/api/v1/tasks", params=params, headers=headers)
+    with record_queries(engine) as stats:
+        second = client.get("/api/v1/tasks", params=params, headers=headers)
+    assert stats.count == 0, stats.describe()
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+    assert second.headers["content-type"] == "application/json"
+
+    # An explicit default is the same entry.
+    with record_queries(engine) as stats:
+        client.get("/api/v1/tasks", params={**params, "limit": 20}, headers=headers)
+    assert stats.count == 0
+
+    r = client.get("/api/v1/tasks", params=params, headers={**headers, "If-None-Match": first.headers["etag"]})
+    assert r.status_code == 304
+
+
+def test_task_write_drops_only_its_project_lists(client, engine, make_org, response_cache):
+    _, headers = make_org("rc-tasks")
+    first, second = _project(client, headers, "A"), _project(client, headers, "B")
+    task_id = _task(client, headers, first)
+    _task(client, headers, second)
+    for project_id in (first, second):
+        client.get("/api/v1/tasks", params={"project_id": project_id}, headers=headers)
+
+    client.patch(f"/api/v1/tasks/{task_id}", headers=headers, json={"status": "DONE"})
+
+    with record_queries(engine) as stats:
+        client.get("/api/v1/tasks", params={"project_id": second}, headers=headers)
+    assert stats.count == 0
+    r = client.get("/api/v1/tasks", params={"project_id": first}, headers=headers)
+    assert r.json()["items"][0]["status"] == "DONE"
+
+    client.delete(f"/api/v1/tasks/{task_id}", headers=headers)
+    assert client.get("/api/v1/tasks", params={"project_id": first}, headers=headers).json()["total"] == 0
+
+
+def test_project_and_member_lists_follow_writes(client, db, make_org, response_cache):
+    _, headers = make_org("rc-projects")
+    assert client.get("/api/v1/projects", headers=headers).json()["total"] == 0
+    project_id = _project(client, headers)
+    assert client.get("/api/v1/projects", headers=headers).json()["total"] == 1
+    client.patch(f"/api/v1/projects/{project_id}", headers=headers, json={"name": "renamed"})
+    assert client.get("/api/v1/projects", headers=headers).json()["items"][0]["name"] == "renamed"
+
+    assert client.get("/api/v1/organizations/members", headers=headers).json()["total"] == 1
+    AuthService(db).register(email="rc-member@example.com", password="Secret123!", full_name=None)
+    client.post("/api/v1/organizations/members", headers=headers, json={"email": "rc-member@example.com"})
+    assert client.get("/api/v1/organizations/members", headers=headers).json()["total"] == 2
+
+    assert client.get("/api/v1/organizations", headers=headers).json()["total"] == 1
+    client.post("/api/v1/organizations", headers=headers, json={"name": "Second", "slug": "rc-second"})
+    assert client.get("/api/v1/organizations", headers=headers).json()["total"] == 2
+
+
+def test_entries_are_scoped_by_role(client, db, make_org, response_cache):
+    org, headers = make_org("rc-roles")
+    _project(client, headers)
+    AuthService(db).register(email="rc-roles-member@example.com", password="Secret123!", full_name=None)
+    client.post("/api/v1/organizations/members", headers=headers, json={"email": "rc-roles-member@example.com"})
+    login = client.post(
+        "/api/v1/auth/login", json={"email": "rc-roles-member@example.com", "password": "Secret123!"}
+    ).json()
+    member_headers = {"Authorization": f"Bearer {login['access_token']}", "X-Organization-Id": str(org.id)}
+
+    fills = response_cache.stats()["fills"]
+    client.get("/api/v1/projects", headers=headers)
+    client.get("/api/v1/projects", headers=member_headers)
+    assert response_cache.stats()["fills"] == fills + 2
+    # Members were never allowed the member list: no entry serves it to them.
+    client.get("/api/v1/organizations/members", headers=headers)
+    assert client.get("/api/v1/organizations/members", headers=member_headers).status_code == 403
+
+
+def test_memory_backend_is_bounded_and_evicts_least_recently_used():
+    backend = MemoryBackend(max_bytes=10_000, max_entries=2)
+    for key in ("a", "b"):
+        backend.set(key, b"x", tags=("t",), ttl_seconds=60, begun=backend.begin(("t",)))
+    backend.get("a", ("t",))
+    backend.set("c", b"x", tags=("t",), ttl_seconds=60, begun=backend.begin(("t",)))
+    assert backend.get("b", ("t",)) is None
+    assert backend.get("a", ("t",)) == backend.get("c", ("t",)) == b"x"
+
+    backend = MemoryBackend(max_bytes=20, max_entries=100)
+    backend.set("a", b"0123456789", tags=(), ttl_seconds=60, begun=backend.begin(()))
+    backend.set("b", b"0123456789", tags=(), ttl_seconds=60, begun=backend.begin(()))
+    assert backend.get("a", ()) is None
+    assert backend.stats()["bytes"] <= 20
+    backend.set("c", b"x" * 100, tags=(), ttl_seconds=60, begun=backend.begin(()))
+    assert backend.get("c", ()) is None
+
+
+@pytest.mark.parametrize("shared", [False, True])
+def test_fill_that_raced_an_invalidation_is_not_stored(shared):
+    backend = SharedStoreBackend(FakeStore()) if shared else MemoryBackend(max_bytes=1000, max_entries=10)
+    begun = backend.begin(("project:1",))
+    backend.invalidate(["project:1"])
+    backend.set("k", b"stale", tags=("project:1",), ttl_seconds=60, begun=begun)
+    assert backend.get("k", ("project:1",)) is None
+
+    begun = backend.begin(("project:1",))
+    backend.invalidate(["project:2"])
+    backend.set("k", b"fresh", tags=("project:1",), ttl_seconds=60, begun=begun)
+    assert backend.get("k", ("project:1",)) == b"fresh"
+    backend.invalidate(["project:1"])
+    assert backend.get("k", ("project:1",)) is None
+
+
+def test_concurrent_misses_are_filled_once():
+    cache = ResponseCache(MemoryBackend(max_bytes=1000, max_entries=10), ttl_seconds=60)
+    calls = 0
+
+    async def fill():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return CachedResponse(b"[]", 'W/"1"')
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_fill("k", ("t",), fill) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert calls == 1
+    assert {r.body for r in results} == {b"[]"}
+    assert cache.stats()["coalesced"] == 4
+
+
+def test_shared_store_lock_makes_other_workers_wait_for_the_entry():
+    store = FakeStore()
+    leader = ResponseCache(SharedStoreBackend(store), ttl_seconds=60, lock_timeout_seconds=1)
+    follower = ResponseCache(SharedStoreBackend(store), ttl_seconds=60, lock_timeout_seconds=1)
+    calls = 0
+
+    async def fill():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return CachedResponse(b"[1]", 'W/"1"')
+
+    async def main():
+        first = asyncio.create_task(leader.get_or_fill("k", ("t",), fill))
+        await asyncio.sleep(0.01)
+        return await asyncio.gather(first, follower.get_or_fill("k", ("t",), fill))
+
+    results = asyncio.run(main())
+    assert calls == 1
+    assert [r.etag for r in results] == ['W/"1"', 'W/"1"']
+    assert not any(key.startswith("operant:rc:lock:") for key in store.data)
+
+
+def test_shared_store_errors_degrade_to_misses():
+    store = FakeStore()
+    cache = ResponseCache(SharedStoreBackend(store), ttl_seconds=60)
+    calls = 0
+
+    async def fill():
+        nonlocal calls
+        calls += 1
+        return CachedResponse(b"[]")
+
+    store.down = True
+    for _ in range(2):
+        assert asyncio.run(cache.get_or_fill("k", ("t",), fill)).body == b"[]"
+    assert calls == 2
+    assert cache.stats()["errors"] > 0
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from operant.app.db.search import prefix_query
+
+
+def test_prefix_query_strips_tsquery_syntax():
+    assert prefix_query("Deploy  web!") == "'deploy':* & 'web':*"
+    assert prefix_query("a' | !b & (c)") == "'a':* & 'b':* & 'c':*"
+    assert prefix_query("  *&|  ") is None
+
+
+def test_search_is_ranked_highlighted_prefix_matched_and_org_scoped(client, make_org):
+    _, headers = make_org("search-a")
+    _, other = make_org("search-b")
+    project = client.post(
+        "/api/v1/projects", headers=headers, json={"name": "Migration plan", "description": "database work"}
+    ).json()["id"]
+    for title, description in [("Write migration", None), ("Review", "check the migration script"), ("Lunch", None)]:
+        client.post(
+            "/api/v1/tasks",
+            params={"project_id": project},
+            headers=headers,
+            json={"title": title, "description": description},
+        )
+    client.post("/api/v1/projects", headers=other, json={"name": "Migration elsewhere"})
+
+    page = client.get("/api/v1/search", headers=headers, params={"q": "migra"}).json()
+    hits = page["items"]
+    assert {h["title"] for h in hits} == {"Migration plan", "Write migration", "Review"}
+    # Title matches (weight A) outrank description-only matches (weight B).
+    assert hits[-1]["title"] == "Review"
+    assert "<mark>migration</mark>" in hits[-1]["headline"]
+    assert page["total"] is None
+
+    assert client.get("/api/v1/search", headers=headers, params={"q": "migration database"}).json()["items"][0][
+        "kind"
+    ] == "project"
+    assert client.get("/api/v1/search", headers=headers, params={"q": "!!"}).json()["items"] == []
+
+
+def test_search_cursor_walks_every_hit_once(client, make_org):
+    _, headers = make_org("search-walk")
+    project = client.post("/api/v1/projects", headers=headers, json={"name": "P"}).json()["id"]
+    for i in range(7):
+        client.post("/api/v1/tasks", params={"project_id": project}, headers=headers, json={"title": f"alpha {i}"})
+
+    seen, cursor = [], None
+    for _ in range(5):  # 3 pages expected; a cursor that does not advance must fail, not hang
+        params = {"q": "alpha", "limit": 3, "cursor": cursor}
+        page = client.get("/api/v1/search", headers=headers, params=params).json()
+        seen += [h["id"] for h in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert cursor is None
+    assert len(seen) == len(set(seen)) == 7
+
+    first = client.get("/api/v1/search", headers=headers, params={"q": "alpha", "limit": 3}).json()["next_cursor"]
+    r = client.get("/api/v1/search", headers=headers, params={"q": "beta", "cursor": first})
+    assert r.status_code == 400
+
+
+def test_headline_escapes_user_text(client, make_org):
+    _, headers = make_org("search-xss")
+    project = client.post("/api/v1/projects", headers=headers, json={"name": "P"}).json()["id"]
+    title = 'payload <img src=x onerror="alert(1)"> 1 < 2 & \x02stray'
+    client.post("/api/v1/tasks", params={"project_id": project}, headers=headers, json={"title": title})
+
+    [hit] = client.get("/api/v1/search", headers=headers, params={"q": "payload"}).json()["items"]
+    assert hit["title"] == title  # plain JSON text; only the headline is HTML
+    assert hit["headline"].startswith("<mark>payload</mark>")
+    text = hit["headline"].replace("<mark>", "").replace("</mark>", "")
+    assert "<" not in text and ">" not in text and "\x02" not in text
+    assert "1 &lt; 2 &amp;" in text
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+
+from sqlalchemy import inspect
+
+from operant.app.db.bootstrap import create_schema
+
+# Generous default so slow CI machines pass; tighten locally with OPERANT_IMPORT_BUDGET_SECONDS.
+IMPORT_BUDGET_SECONDS = float(os.getenv("OPERANT_IMPORT_BUDGET_SECONDS", "3.0"))
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import operant.app.main
+elapsed = time.perf_counter() - started
+heavy = ("bcrypt", "jose", "cryptography", "psycopg2", "asyncpg")
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in heavy if m in sys.modules]}))
+"""
+
+
+def test_importing_the_app_is_fast_and_does_not_touch_the_database():
+    env = dict(os.environ)
+    # Nothing listens on port 1: any connection attempt at import time would fail the probe.
+    env["OPERANT_DATABASE_URL"] = "postgresql+psycopg2://nobody@127.0.0.1:1/nowhere"
+    env.pop("OPERANT_AUTO_CREATE_SCHEMA", None)
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE], env=env, capture_output=True, text=True, timeout=60, check=True
+    )
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    assert result["loaded"] == []
+    assert result["seconds"] < IMPORT_BUDGET_SECONDS, result
+
+
+def test_create_schema_is_idempotent(engine):
+    create_schema(engine)
+    create_schema(engine)
+    assert {"users", "organizations", "tasks"} <= set(inspect(engine).get_table_names())
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from operant.app.models.task import Task
+from operant.app.services.project_service import ProjectService
+from operant.app.services.task_service import TaskService
+
+
+def _project(client, headers) -> str:
+    return client.post("/api/v1/projects", headers=headers, json={"name": "Batch"}).json()["id"]
+
+
+def test_batch_create_inserts_in_one_statement_and_commits_once(client, make_org, assert_max_queries):
+    _, headers = make_org("batch-ok")
+    project_id = _project(client, headers)
+    items = [{"title": f"T{i}", "status": "DONE" if i % 2 else "TODO"} for i in range(50)]
+
+    client.get("/api/v1/projects", headers=headers)  # warm principal/membership caches
+    # project check, INSERT ... RETURNING, one counter upsert per status
+    with assert_max_queries(4):
+        r = client.post("/api/v1/tasks:batch", params={"project_id": project_id}, headers=headers, json={"items": items})
+    assert r.status_code == 201, r.text
+    body = r.json()
+    assert (body["created"], body["failed"]) == (50, 0)
+    assert [item["task"]["title"] for item in body["items"]] == [f"T{i}" for i in range(50)]
+
+    summary = client.get(f"/api/v1/projects/{project_id}/summary", headers=headers).json()
+    assert summary["counts"] == {"TODO": 25, "IN_PROGRESS": 0, "DONE": 25}
+
+
+def test_atomic_batch_with_an_invalid_item_creates_nothing(client, make_org):
+    _, headers = make_org("batch-atomic")
+    project_id = _project(client, headers)
+    items = [{"title": "ok"}, {"title": ""}, {"title": "ok", "status": "LATER"}]
+
+    r = client.post("/api/v1/tasks:batch", params={"project_id": project_id}, headers=headers, json={"items": items})
+    assert r.status_code == 422
+    body = r.json()
+    assert (body["created"], body["failed"]) == (0, 2)
+    assert body["items"][0] == {"index": 0, "task": None, "error": None}
+    assert body["items"][1]["error"].startswith("title:")
+    assert client.get("/api/v1/tasks", params={"project_id": project_id}, headers=headers).json()["total"] == 0
+
+
+def test_partial_batch_isolates_rows_rejected_by_validation_or_the_database(client, make_org):
+    _, headers = make_org("batch-partial")
+    project_id = _project(client, headers)
+    items = [{"title": "a"}, {"title": "b\x00"}, {"title": ""}, {"title": "c", "status": "DONE"}]
+
+    r = client.post(
+        "/api/v1/tasks:batch",
+        params={"project_id": project_id},
+        headers=headers,
+        json={"items": items, "mode": "partial"},
+    )
+    assert r.status_code == 207
+    body = r.json()
+    assert (body["created"], body["failed"]) == (2, 2)
+    assert [item["task"] is not None for item in body["items"]] == [True, False, False, True]
+    assert "NUL" in body["items"][1]["error"]
+
+    summary = client.get(f"/api/v1/projects/{project_id}/summary", headers=headers).json()
+    assert summary["counts"] == {"TODO": 1, "IN_PROGRESS": 0, "DONE": 1}
+
+
+def test_rows_rejected_by_the_database_are_reported_in_both_modes(db, make_org):
+    org, _ = make_org("batch-db-reject")
+    project = ProjectService(db).create_project(organization_id=org.id, name="P", description=None)
+    # The service skips schema validation: the driver refuses NUL, which exercises the isolation retry.
+    rows = [{"title": "a", "status": "TODO"}, {"title": "b\x00", "status": "TODO"}]
+
+    atomic = TaskService(db).create_tasks(project_id=project.id, rows=rows)
+    assert atomic[0] is None and "NUL" in atomic[1]
+    partial = TaskService(db).create_tasks(project_id=project.id, rows=rows, partial=True)
+    assert isinstance(partial[0], Task) and "NUL" in partial[1]
+    assert TaskService(db).project_summary(project_id=project.id)["total"] == 1
+
+
+def test_foreign_project_is_refused_before_items_are_validated(client, make_org):
+    _, headers = make_org("batch-foreign")
+    _, other_headers = make_org("batch-foreign-other")
+    other_project = _project(client, other_headers)
+
+    for items in ([{"title": ""}], [{"title": "ok"}]):
+        r = client.post("/api/v1/tasks:batch", params={"project_id": other_project}, headers=headers, json={"items": items})
+        assert r.status_code == 403
+
+
+def test_batch_update_by_filter_and_by_ids_in_one_statement(client, make_org, assert_max_queries):
+    _, headers = make_org("batch-update")
+    _, other_headers = make_org("batch-update-other")
+    project_id = _project(client, headers)
+    other_project = _project(client, other_headers)
+    items = [{"title": f"T{i}", "status": "IN_PROGRESS" if i < 6 else "TODO"} for i in range(10)]
+    created = client.post(
+        "/api/v1/tasks:batch", params={"project_id": project_id}, headers=headers, json={"items": items}
+    ).json()["items"]
+    foreign = client.post(
+        "/api/v1/tasks", params={"project_id": other_project}, headers=other_headers, json={"title": "x"}
+    ).json()["id"]
+
+    # locking UPDATE, then -IN_PROGRESS / +DONE counter upserts
+    with assert_max_queries(3):
+        r = client.patch(
+            "/api/v1/tasks:batch",
+            headers=headers,
+            json={"filter": {"project_id": project_id, "status": "IN_PROGRESS"}, "patch": {"status": "DONE"}},
+        )
+    assert r.json() == {"updated": 6, "items": None}
+
+    # Ids from another org are ignored, not updated.
+    ids = [created[6]["task"]["id"], created[7]["task"]["id"], foreign]
+    r = client.patch(
+        "/api/v1/tasks:batch",
+        params={"return_rows": True},
+        headers=headers,
+        json={"ids": ids, "patch": {"status": "DONE", "title": "closed"}},
+    ).json()
+    assert r["updated"] == 2
+    assert {(t["title"], t["status"]) for t in r["items"]} == {("closed", "DONE")}
+    assert client.get(f"/api/v1/tasks/{foreign}", headers=other_headers).json()["status"] == "TODO"
+
+    summary = client.get(f"/api/v1/projects/{project_id}/summary", headers=headers).json()
+    assert summary["counts"] == {"TODO": 2, "IN_PROGRESS": 0, "DONE": 8}
+
+    r = client.patch("/api/v1/tasks:batch", headers=headers, json={"ids": ids, "patch": {}})
+    assert r.status_code == 400
+    r = client.patch("/api/v1/tasks:batch", headers=headers, json={"patch": {"status": "DONE"}})
+    assert r.status_code == 422
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from sqlalchemy import text
+
+from operant.app.services.task_service import TaskService
+
+
+def _project(client, headers, name: str) -> str:
+    return client.post("/api/v1/projects", headers=headers, json={"name": name}).json()["id"]
+
+
+def _task(client, headers, project_id: str, status: str = "TODO") -> str:
+    r = client.post(
+        "/api/v1/tasks", params={"project_id": project_id}, headers=headers, json={"title": "t", "status": status}
+    )
+    return r.json()["id"]
+
+
+def test_counters_follow_create_update_delete(client, make_org):
+    _, headers = make_org("counts-crud")
+    p1, p2 = _project(client, headers, "A"), _project(client, headers, "B")
+    first = _task(client, headers, p1)
+    _task(client, headers, p1)
+    _task(client, headers, p1, status="IN_PROGRESS")
+    _task(client, headers, p2, status="DONE")
+
+    client.patch(f"/api/v1/tasks/{first}", headers=headers, json={"status": "DONE"})
+    client.patch(f"/api/v1/tasks/{first}", headers=headers, json={"title": "renamed"})  # no status change
+
+    summary = client.get(f"/api/v1/projects/{p1}/summary", headers=headers).json()
+    assert summary == {"counts": {"TODO": 1, "IN_PROGRESS": 1, "DONE": 1}, "total": 3}
+
+    client.delete(f"/api/v1/tasks/{first}", headers=headers)
+    rollup = client.get("/api/v1/organizations/current/summary", headers=headers).json()
+    assert rollup == {"counts": {"TODO": 1, "IN_PROGRESS": 1, "DONE": 1}, "total": 3, "projects": 2}
+
+    empty = _project(client, headers, "C")
+    assert client.get(f"/api/v1/projects/{empty}/summary", headers=headers).json()["total"] == 0
+
+
+def test_repair_recomputes_counters_from_tasks(client, db, make_org):
+    _, headers = make_org("counts-repair")
+    project_id = _project(client, headers, "A")
+    _task(client, headers, project_id)
+    # Rows written behind the service's back (bulk SQL, an old deploy) leave the counters stale.
+    db.execute(
+        text(
+            """INSERT INTO tasks (id, created_at, updated_at, project_id, title, status)
+               SELECT gen_random_uuid(), now(), now(), :p, 't', 'DONE' FROM generate_series(1, 4)"""
+        ),
+        {"p": project_id},
+    )
+    assert client.get(f"/api/v1/projects/{project_id}/summary", headers=headers).json()["total"] == 1
+
+    TaskService(db).repair_counts(project_id=project_id)
+    summary = client.get(f"/api/v1/projects/{project_id}/summary", headers=headers).json()
+    assert summary["counts"] == {"TODO": 1, "IN_PROGRESS": 0, "DONE": 4}
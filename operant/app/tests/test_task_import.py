@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+
+from operant.app.services.project_service import ProjectService
+from operant.app.services.task_service import TaskService
+
+
+def _project(client, headers, name: str = "Import") -> str:
+    return client.post("/api/v1/projects", headers=headers, json={"name": name}).json()["id"]
+
+
+def _titles(client, headers, project_id) -> list[str]:
+    r = client.get(
+        "/api/v1/tasks", params={"project_id": project_id, "order": "asc", "limit": 100}, headers=headers
+    )
+    return [task["title"] for task in r.json()["items"]]
+
+
+def test_ndjson_import_loads_valid_rows_and_reports_the_others_by_line(client, make_org):
+    _, headers = make_org("import-ndjson")
+    project_id = _project(client, headers)
+    lines = [
+        json.dumps({"title": "first"}),
+        "{not json",
+        json.dumps({"title": ""}),
+        "",
+        json.dumps({"title": "second", "status": "DONE", "description": "d"}),
+        json.dumps(["not", "an", "object"]),
+    ]
+
+    r = client.post(
+        f"/api/v1/projects/{project_id}/tasks:import", headers=headers, content="\n".join(lines).encode()
+    )
+    assert r.status_code == 207, r.text
+    body = r.json()
+    assert (body["imported"], body["failed"]) == (2, 3)
+    assert [error["line"] for error in body["errors"]] == [2, 3, 6]
+    assert body["errors"][1]["error"].startswith("title:")
+    assert body["rows_per_second"] >= 0 and not body["errors_truncated"]
+
+    assert _titles(client, headers, project_id) == ["first", "second"]  # file order kept
+    summary = client.get(f"/api/v1/projects/{project_id}/summary", headers=headers).json()
+    assert summary["counts"] == {"TODO": 1, "IN_PROGRESS": 0, "DONE": 1}
+
+
+def test_csv_export_imports_back_from_a_chunked_stream(client, make_org):
+    _, headers = make_org("import-csv")
+    source = _project(client, headers, "Source")
+    for title, description in [("a, \"quoted\"", "line one\nline two"), ("ção", None), ("c", "")]:
+        client.post(
+            "/api/v1/tasks",
+            params={"project_id": source},
+            headers=headers,
+            json={"title": title, "description": description, "status": "IN_PROGRESS"},
+        )
+    exported = client.get(f"/api/v1/projects/{source}/tasks:export", params={"format": "csv"}, headers=headers)
+    target = _project(client, headers, "Target")
+
+    def body():
+        # Small pieces: records, quoted newlines and a multi-byte character all straddle chunks.
+        data = exported.content
+        for i in range(0, len(data), 7):
+            yield data[i : i + 7]
+
+    r = client.post(
+        f"/api/v1/projects/{target}/tasks:import", params={"format": "csv"}, headers=headers, content=body()
+    )
+    assert r.status_code == 201, r.text
+    assert (r.json()["imported"], r.json()["failed"]) == (3, 0)
+
+    def tasks(project_id):
+        r = client.get("/api/v1/tasks", params={"project_id": project_id, "order": "asc"}, headers=headers)
+        return [(t["title"], t["description"], t["status"]) for t in r.json()["items"]]
+
+    # The export writes an empty description and a missing one alike; both come back as null.
+    assert tasks(target) == [
+        ("a, \"quoted\"", "line one\nline two", "IN_PROGRESS"),
+        ("ção", None, "IN_PROGRESS"),
+        ("c", None, "IN_PROGRESS"),
+    ]
+
+
+def test_csv_without_a_title_column_is_refused(client, make_org):
+    _, headers = make_org("import-csv-header")
+    project_id = _project(client, headers)
+    r = client.post(
+        f"/api/v1/projects/{project_id}/tasks:import",
+        params={"format": "csv"},
+        headers=headers,
+        content=b"name,status\nx,TODO\n",
+    )
+    assert r.status_code == 400
+    assert _titles(client, headers, project_id) == []
+
+
+def test_foreign_project_is_refused(client, make_org):
+    _, headers = make_org("import-foreign")
+    _, other_headers = make_org("import-foreign-other")
+    project_id = _project(client, other_headers)
+    r = client.post(f"/api/v1/projects/{project_id}/tasks:import", headers=headers, content=b'{"title": "x"}')
+    assert r.status_code == 403
+
+
+def test_import_stops_at_the_plan_row_limit(db, make_org, set_plan_limits):
+    org, _ = make_org("import-limit")
+    project = ProjectService(db).create_project(organization_id=org.id, name="P", description=None)
+    set_plan_limits("FREE", max_import_rows=3)
+    read: list[int] = []
+
+    def rows():
+        for line in range(1, 10):
+            read.append(line)
+            yield line, {"title": f"T{line}", "description": None, "status": "TODO"}
+
+    result = TaskService(db).import_tasks(project_id=project.id, organization_id=org.id, rows=rows(), chunk_rows=2)
+
+    assert (result.imported, result.failed, result.limit_reached) == (3, 1, True)
+    assert result.errors[0][0] == 4
+    assert read == [1, 2, 3, 4]  # nothing past the limit is read
+    assert TaskService(db).project_summary(project_id=project.id)["total"] == 3
+
+
+def test_chunk_rejected_by_the_database_is_retried_row_by_row(db, make_org):
+    org, _ = make_org("import-db-reject")
+    project = ProjectService(db).create_project(organization_id=org.id, name="P", description=None)
+    # The service skips schema validation: Postgres refuses NUL, which fails the COPY chunk.
+    rows = [
+        (1, {"title": "a", "description": None, "status": "TODO"}),
+        (2, {"title": "b\x00", "description": None, "status": "TODO"}),
+        (3, {"title": "c", "description": None, "status": "DONE"}),
+    ]
+
+    result = TaskService(db).import_tasks(
+        project_id=project.id, organization_id=org.id, rows=rows, chunk_rows=10, max_errors=0
+    )
+
+    assert (result.imported, result.failed, result.errors) == (2, 1, [])
+    counts = TaskService(db).project_summary(project_id=project.id)["counts"]
+    assert (counts["TODO"], counts["DONE"]) == (1, 1)
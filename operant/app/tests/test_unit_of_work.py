@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import event
+
+from operant.app.core.errors import ForbiddenError
+from operant.app.db.session import after_commit
+from operant.app.models.project import Project
+from operant.app.services.unit_of_work import UnitOfWork
+
+
+def test_write_endpoint_flushes_and_commits_once(client, db, make_org):
+    _, headers = make_org("uow-once")
+    r = client.post("/api/v1/projects", headers=headers, json={"name": "P"})
+    project_id = r.json()["id"]
+    r = client.post("/api/v1/tasks", params={"project_id": project_id}, headers=headers, json={"title": "T"})
+    task_id = r.json()["id"]
+
+    counts = {"flush": 0, "commit": 0}
+    event.listen(db, "after_flush", lambda *_: counts.__setitem__("flush", counts["flush"] + 1))
+    event.listen(db, "after_commit", lambda *_: counts.__setitem__("commit", counts["commit"] + 1))
+    r = client.patch(f"/api/v1/tasks/{task_id}", headers=headers, json={"title": "T2", "status": "DONE"})
+    assert r.status_code == 200, r.text
+    assert r.json()["status"] == "DONE"
+    # The update and the counter deltas are statements of their own: nothing is left to flush.
+    assert counts == {"flush": 0, "commit": 1}
+
+
+def test_domain_error_rolls_back_the_whole_unit(db, make_org):
+    org, _ = make_org("uow-rollback")
+    fired: list[str] = []
+
+    def _work(u: UnitOfWork):
+        u.projects.create_project(organization_id=org.id, name="Staged", description=None)
+        after_commit(u.session, lambda: fired.append("committed"))
+        raise ForbiddenError("não")
+
+    with pytest.raises(ForbiddenError):
+        UnitOfWork(db).run_sync(_work)
+    assert fired == []
+    assert db.query(Project).filter_by(organization_id=org.id).count() == 0
+
+    uow = UnitOfWork(db)
+    uow.run_sync(lambda u: u.projects.create_project(organization_id=org.id, name="Kept", description=None))
+    assert uow.projects is uow.projects
+    assert db.query(Project).filter_by(organization_id=org.id).count() == 1